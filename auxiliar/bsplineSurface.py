@@ -0,0 +1,209 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+from scipy.spatial import ConvexHull, QhullError
+from scipy.interpolate import BSpline
+from scipy.sparse import coo_matrix, diags, kron, identity
+from scipy.sparse.linalg import spsolve
+import numpy as np
+
+# Weight of the second differences of the control points in the least squares
+# fit, relative to the data: it fixes the control points of the regions of the
+# parametric rectangle without vertices and damps the oscillations
+SMOOTHING = 1.0e-6
+
+def boundaryLoops(triangles):
+    """
+    Return the closed loops of vertices of the boundary of a triangulation
+    (edges used by a single triangle). The triangles need not be oriented
+    consistently, so the direction of the loops is arbitrary.
+    """
+    triangles = np.asarray(triangles, dtype=np.int64).reshape((-1,3))
+    edges     = np.sort(triangles[:, [0,1,1,2,2,0]].reshape((-1,2)), axis=1)
+    edges, counts = np.unique(edges, axis=0, return_counts=True)
+    incident = {}
+    for edge, (first, second) in enumerate(edges[counts == 1].tolist()):
+        incident.setdefault(first, []).append((edge, second))
+        incident.setdefault(second, []).append((edge, first))
+
+    loops, used = [], set()
+    for start in list(incident):
+        while any(edge not in used for edge, _ in incident[start]):
+            loop = [start]
+            while True:
+                edge, end = next((edge, end) for edge, end in incident[loop[-1]] if edge not in used)
+                used.add(edge)
+                if end == start:
+                    break
+                if all(other in used for other, _ in incident[end]):
+                    raise Exception("The boundary of the triangulation is not closed")
+                loop.append(end)
+            loops.append(loop)
+    return loops
+
+class bsplineSurface:
+    """
+    Tensor product B-spline surface fitted by least squares to a cloud of
+    points (the vertices of a triangulated patch). The points are projected on
+    their mean plane and the parametric rectangle [0,1] x [0,1] is the
+    rectangle of minimum area around the projections. The knots are uniform:
+    the number of knot spans is doubled until the largest distance between
+    the points and the surface at their parameters is within the tolerance
+    or the maximum number of control points is reached. When the triangles
+    are given, the surface added to gmsh is trimmed by the boundary of the
+    patch; otherwise it covers the whole parametric rectangle.
+
+    Parameters:
+    - _points:           (nPoints, 3) coordinates of the vertices
+    - _tolerance:        largest distance allowed between a vertex and the surface
+    - _maxControlPoints: maximum number of control points in each direction
+    - _degree:           degree of the B-spline in each direction
+    - _triangles:        (nTriangles, 3) triangles of the patch (indices of the points)
+
+    Usage:
+        surface = bsplineSurface(patch.nodes, 1.0)
+        surface.controlPoints    # (nV, nU, 3), u varying fastest
+    """
+
+    def __init__(self, _points, _tolerance, _maxControlPoints = 64, _degree = 3, _triangles = None):
+        self.points           = np.asarray(_points, dtype=float).reshape((-1,3))
+        self.triangles        = _triangles
+        self.tolerance        = _tolerance
+        self.maxControlPoints = max(_maxControlPoints, _degree + 1)
+        self.degree           = _degree
+        self.parameters       = self.computeParameters()
+        self.spans            = 1
+        while True:
+            self.fit()
+            if self.error <= self.tolerance or 2 * self.spans + self.degree > self.maxControlPoints:
+                break
+            self.spans *= 2
+
+    # ---------------------------------------------------------------------
+    def computeParameters(self):
+        """
+        Return the (u, v) parameters of the points in the minimum area
+        rectangle around their projections on the mean plane
+        """
+        center = self.points.mean(axis=0)
+        axes   = np.linalg.svd(self.points - center, full_matrices=False)[2]
+        local  = (self.points - center) @ axes[:2].T
+
+        # The minimum area rectangle has a side along an edge of the convex hull
+        try:
+            hull  = local[ConvexHull(local).vertices]
+            edges = np.roll(hull, -1, axis=0) - hull
+            angles = np.arctan2(edges[:,1], edges[:,0])
+        except QhullError:
+            angles = np.zeros(1)
+        best, bestArea = None, np.inf
+        for angle in angles:
+            rotation = np.array([[np.cos(angle), np.sin(angle)], [-np.sin(angle), np.cos(angle)]])
+            uv   = local @ rotation.T
+            area = np.prod(np.ptp(uv, axis=0))
+            if area < bestArea:
+                best, bestArea = uv, area
+
+        extent = np.ptp(best, axis=0)
+        return (best - best.min(axis=0)) / np.where(extent > 0.0, extent, 1.0)
+
+    # ---------------------------------------------------------------------
+    def getKnots(self):
+        """
+        Return the distinct knots and their multiplicities (clamped ends)
+        """
+        knots = np.linspace(0.0, 1.0, self.spans + 1)
+        multiplicities = np.ones(self.spans + 1, dtype=int)
+        multiplicities[[0, -1]] = self.degree + 1
+        return knots, multiplicities
+
+    # ---------------------------------------------------------------------
+    def getNumControlPoints(self):
+        return self.spans + self.degree
+
+    # ---------------------------------------------------------------------
+    def designMatrix(self, parameters):
+        """
+        Return the sparse matrix of the values of the basis functions of the
+        control points (u varying fastest) at the given (u, v) parameters
+        """
+        knots, multiplicities = self.getKnots()
+        t  = np.repeat(knots, multiplicities)
+        n  = self.getNumControlPoints()
+        nb = self.degree + 1
+        Bu = BSpline.design_matrix(parameters[:,0], t, self.degree)
+        Bv = BSpline.design_matrix(parameters[:,1], t, self.degree)
+
+        # Row by row tensor product of the nb non-zero values of Bu and Bv
+        numRows = len(parameters)
+        values  = Bv.data.reshape((numRows, nb, 1)) * Bu.data.reshape((numRows, 1, nb))
+        columns = Bv.indices.reshape((numRows, nb, 1)) * n + Bu.indices.reshape((numRows, 1, nb))
+        rows    = np.repeat(np.arange(numRows), nb * nb)
+        return coo_matrix((values.ravel(), (rows, columns.ravel())), shape=(numRows, n * n)).tocsr()
+
+    # ---------------------------------------------------------------------
+    def fit(self):
+        n = self.getNumControlPoints()
+        B = self.designMatrix(self.parameters)
+
+        # Second differences of the control points along u and v
+        D  = diags([1.0, -2.0, 1.0], [0, 1, 2], shape=(n - 2, n)) if n > 2 else coo_matrix((0, n))
+        Du = kron(identity(n), D)
+        Dv = kron(D, identity(n))
+
+        A  = (B.T @ B).tocsc()
+        weight = SMOOTHING * A.diagonal().sum() / n**2
+        A  = A + weight * (Du.T @ Du + Dv.T @ Dv)
+        controlPoints = spsolve(A.tocsc(), B.T @ self.points)
+
+        self.controlPoints = np.asarray(controlPoints).reshape((n, n, 3))
+        self.error = float(np.max(np.linalg.norm(B @ controlPoints - self.points, axis=1), initial=0.0))
+
+    # ---------------------------------------------------------------------
+    def evaluate(self, parameters):
+        """
+        Return the points of the surface at the given (u, v) parameters
+        """
+        parameters = np.asarray(parameters, dtype=float).reshape((-1,2))
+        return self.designMatrix(parameters) @ self.controlPoints.reshape((-1,3))
+
+    # ---------------------------------------------------------------------
+    def addToGmshModel(self, gmsh):
+        """
+        Add the surface to the OCC model of gmsh and return its tag. With the
+        triangles, the surface is trimmed by the boundary of the patch: the
+        loop with the largest parametric area is the contour, the others are
+        holes. The loops are polylines through the parameters of the boundary
+        vertices.
+        """
+        pointTags = [gmsh.model.occ.addPoint(x, y, z) for x, y, z in self.controlPoints.reshape((-1,3))]
+        knots, multiplicities = self.getKnots()
+        tag = gmsh.model.occ.addBSplineSurface(pointTags, self.getNumControlPoints(), degreeU=self.degree, degreeV=self.degree,
+                                               knotsU=knots.tolist(), knotsV=knots.tolist(),
+                                               multiplicitiesU=multiplicities.tolist(), multiplicitiesV=multiplicities.tolist())
+
+        # The control points are not part of the geometry
+        gmsh.model.occ.remove([(0, pointTag) for pointTag in pointTags])
+        if self.triangles is None:
+            return tag
+
+        # Contour first and counter-clockwise, holes clockwise in the parametric space
+        loops = boundaryLoops(self.triangles)
+        areas = [np.cross(self.parameters[loop], np.roll(self.parameters[loop], -1, axis=0)).sum() for loop in loops]
+        wireTags, curveTags = [], []
+        for index in np.argsort(np.abs(areas))[::-1]:
+            counterClockwise = len(wireTags) == 0
+            loop = loops[index] if (areas[index] > 0.0) == counterClockwise else loops[index][::-1]
+            loopPoints = [gmsh.model.occ.addPoint(u, v, 0.0) for u, v in self.parameters[loop]]
+            loopCurves = [gmsh.model.occ.addLine(loopPoints[i], loopPoints[(i + 1) % len(loopPoints)]) for i in range(len(loopPoints))]
+            wireTags.append(gmsh.model.occ.addWire(loopCurves))
+            curveTags += loopCurves
+        trimmedTag = gmsh.model.occ.addTrimmedSurface(tag, wireTags, wire3D=False)
+
+        # The untrimmed surface and the curves in the parametric space are not part of the geometry
+        gmsh.model.occ.remove([(2, tag)], recursive=True)
+        gmsh.model.occ.remove([(1, curveTag) for curveTag in curveTags], recursive=True)
+        return trimmedTag
@@ -6,14 +6,19 @@
 # ------------------------------------------------------------------------------
 
 import auxiliar.triangulatedSurface as trisurf
+from auxiliar.bsplineSurface import bsplineSurface
+from auxiliar.surfaceReaders import readSurfacePatches
 import numpy as np
 
 class geometry:
 
     def __init__(self):
         self.surf  = []     # List of triangulated surfaces objects
-        self.triangles   = []     # List of all triangles in the geometry
-        self.node = []      # List of all nodes in the geometry
+        self.triangles   = np.empty((0,3), dtype=np.int32)      # (M,3) all triangles in the geometry
+        self.node = np.empty((0,3), dtype=np.float64)           # (N,3) all nodes in the geometry
+        self.nodeBuffer     = self.node         # nodes are the first N rows
+        self.triangleBuffer = self.triangles    # triangles are the first M rows
+        self.cache = {}     # Bounding box and center of the nodes
 
     # ---------------------------------------------------------------------
     def getSurface(self, index):
@@ -41,25 +46,32 @@ class geometry:
     
     # ---------------------------------------------------------------------
     def getCoordinatesVector(self):
-        coordinates = []
-        for node in self.node:
-            coordinates.extend(node)
-        return coordinates
+        return self.node.ravel()
     
     # ---------------------------------------------------------------------
     def getTrianglesVector(self):
-        triangles = []
-        for triangle in self.triangles:
-            triangles.extend(triangle)
-        return triangles
+        return self.triangles.ravel()
     
     # ---------------------------------------------------------------------
     def addNode(self, node):
-        self.node.append(node)
+        self.addNodes([node])
 
     # ---------------------------------------------------------------------
     def addTriangle(self, triangle):
-        self.triangles.append(triangle)
+        self.addTriangles([triangle])
+
+    # ---------------------------------------------------------------------
+    # Append an (n,3) array of node coordinates
+    def addNodes(self, nodes):
+        self.nodeBuffer, numNodes = trisurf.appendRows(self.nodeBuffer, self.getNumNodes(), nodes)
+        self.node  = self.nodeBuffer[:numNodes]
+        self.cache = {}
+
+    # ---------------------------------------------------------------------
+    # Append an (n,3) array of triangles (node indices in the geometry)
+    def addTriangles(self, triangles):
+        self.triangleBuffer, numTriangles = trisurf.appendRows(self.triangleBuffer, self.getNumTriangles(), triangles)
+        self.triangles = self.triangleBuffer[:numTriangles]
     
     # ---------------------------------------------------------------------
     def addSurfaceData(self, surface):
@@ -67,21 +79,20 @@ class geometry:
         # Get the current number of nodes
         numNodes = self.getNumNodes()
 
-        # Update the list of triangles
-        for i in range(surface.getNumTriangles()):
-            triangle = [x + numNodes for x in surface.getTriangle(i)]
-            self.addTriangle(triangle)
-            surface.globalTriangles.append(triangle)
+        # Update the triangles
+        surface.globalTriangles = surface.triangles + np.int32(numNodes)
+        self.addTriangles(surface.globalTriangles)
 
         # Update the list of surfaces
         self.surf.append(surface)
 
-        # Update the list of coordinates
-        for i in range(surface.getNumNodes()):
-            self.addNode(surface.getNode(i))
+        # Update the coordinates
+        self.addNodes(surface.nodes)
 
     # ---------------------------------------------------------------------
-    def loadSurface(self, file_path, surfaceName):
+    # Load a surface from an OFF, STL, OBJ or GOCAD TSurf file (the patch of
+    # index patch of the TSurf files with several patches)
+    def loadSurface(self, file_path, surfaceName, patch = 0):
 
         # Surface tag
         tag = self.getNumSurfaces()
@@ -89,13 +100,25 @@ class geometry:
         # Initialize the triangulated surface object
         surface = trisurf.triangulatedSurface(tag, surfaceName)
 
-        # Read the OFF file
-        surface.readOFFFile(file_path)
+        # Read the surface file
+        surface.readFile(file_path, patch)
 
         # Add the surface to the geometry object
         self.addSurfaceData(surface)
 
         return tag
+
+    # ---------------------------------------------------------------------
+    # Load all the patches of a surface file, named as in the file, and
+    # return their tags
+    def loadSurfaces(self, file_path):
+        tags = []
+        for name, nodes, triangles in readSurfacePatches(file_path):
+            surface = trisurf.triangulatedSurface(self.getNumSurfaces(), name)
+            surface.addData(nodes, triangles)
+            tags.append(surface.getSurfaceTag())
+            self.addSurfaceData(surface)
+        return tags
     
     # ---------------------------------------------------------------------
     def addNodesToGmshModel(self, gmsh):
@@ -114,7 +137,7 @@ class geometry:
         for surface in self.surf:
             for e in surface.globalTriangles:
                 curves = []
-                edgeNodes = e + [e[0]]
+                edgeNodes = e.tolist() + [int(e[0])]
                 for i in range(len(edgeNodes)-1):
                     edge = [edgeNodes[i], edgeNodes[i + 1]]
                     ed = tuple(np.sort(edge))
@@ -129,34 +152,74 @@ class geometry:
                 surface.gmshTag.append(s)
             allsurfaces.append(surface.gmshTag)
 
+    # ---------------------------------------------------------------------
+    # Add each triangulated surface as one discrete surface of the gmsh model,
+    # with its nodes and triangles as the mesh of the surface, instead of one
+    # OCC plane surface per triangle (see addSurfaceToGmshModel). gmsh builds
+    # the boundary curves and points of the discrete surfaces and their
+    # parametrization, so they can be remeshed. The discrete surfaces belong to
+    # the gmsh model, not to the OCC kernel (no occ.fragment or occ.extrude).
+    def addDiscreteSurfacesToGmshModel(self, gmsh):
+
+        # Tag of the node 0 of the geometry
+        firstNodeTag = int(gmsh.model.mesh.getMaxNodeTag()) + 1
+
+        for surface in self.surf:
+            tag = gmsh.model.addDiscreteEntity(2)
+            triangles = surface.globalTriangles.astype(np.int64)
+            surfaceNodes = np.unique(triangles)
+            coordinates = self.node[surfaceNodes]
+            gmsh.model.mesh.addNodes(2, tag, surfaceNodes + firstNodeTag, coordinates.ravel())
+            gmsh.model.mesh.addElementsByType(tag, 2, [], (triangles + firstNodeTag).ravel())
+            surface.gmshTag.append(tag)
+
+        # Create the boundary entities and the geometry of the discrete surfaces
+        gmsh.model.mesh.createTopology()
+        gmsh.model.mesh.createGeometry()
+
+    # ---------------------------------------------------------------------
+    # Add each triangulated surface to the OCC model of gmsh as one B-spline
+    # surface fitted to its nodes within the tolerance and trimmed by the
+    # boundary of its triangles, instead of one plane surface per triangle
+    # (see addSurfaceToGmshModel and bsplineSurface)
+    def addBSplineSurfacesToGmshModel(self, gmsh, tolerance, maxControlPoints = 64):
+        for surface in self.surf:
+            surface.bspline = bsplineSurface(surface.nodes, tolerance, maxControlPoints, _triangles = surface.triangles)
+            if surface.bspline.error > tolerance:
+                print(f"Surface {surface.name}: fitting error {surface.bspline.error:g} above the tolerance with {maxControlPoints} control points")
+            surface.gmshTag.append(surface.bspline.addToGmshModel(gmsh))
+
     # ---------------------------------------------------------------------
     def getGmshSurfaceDimTag(self, index):
         return self.surf[index].getGmshDimTag()
     
+    # ---------------------------------------------------------------------
+    # Lower and upper corners of the box around all the nodes
+    def getBoundingBox(self):
+        if 'boundingBox' not in self.cache:
+            self.cache['boundingBox'] = (self.node.min(axis=0), self.node.max(axis=0))
+        return self.cache['boundingBox']
+
     # ---------------------------------------------------------------------
     def addVolumeBoundingBox(self,gmsh):
-        x = [node[0] for node in self.node]
-        y = [node[1] for node in self.node]
-        z = [node[2] for node in self.node]
-        vol = gmsh.model.occ.addBox(min(x), min(y), min(z), max(x)-min(x), max(y)-min(y), max(z)-min(z))
+        lower, upper = self.getBoundingBox()
+        x, y, z = lower.tolist()
+        dx, dy, dz = (upper - lower).tolist()
+        vol = gmsh.model.occ.addBox(x, y, z, dx, dy, dz)
         return vol
     
     # ---------------------------------------------------------------------
     def getModelDepthRange(self):
-        z = [node[2] for node in self.node]
-        return abs(max(z)-min(z))
+        lower, upper = self.getBoundingBox()
+        return abs(float(upper[2] - lower[2]))
     
     # ---------------------------------------------------------------------
     def getSurfaceCenter(self, surfTag): 
-        x = [node[0] for node in self.surf[surfTag].nodes]
-        y = [node[1] for node in self.surf[surfTag].nodes]
-        z = [node[2] for node in self.surf[surfTag].nodes]
-        return [np.mean(x), np.mean(y), np.mean(z)]
+        return self.surf[surfTag].getCenter().tolist()
     
     # ---------------------------------------------------------------------
     def getVolumeCenter(self): 
-        x = [node[0] for node in self.node]
-        y = [node[1] for node in self.node]
-        z = [node[2] for node in self.node]
-        return [np.mean(x), np.mean(y), np.mean(z)]
+        if 'center' not in self.cache:
+            self.cache['center'] = self.node.mean(axis=0)
+        return self.cache['center'].tolist()
             
\ No newline at end of file
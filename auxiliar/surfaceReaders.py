@@ -0,0 +1,395 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+import os
+import re
+import zipfile
+import hashlib
+import tempfile
+import numpy as np
+
+# Suffix of the cache file written next to each surface file
+CACHE_SUFFIX = '.npz'
+
+# ---------------------------------------------------------------------
+def fanTriangles(faces, sizes):
+    """
+    Split polygonal faces into triangles (v0, vk, vk+1)
+
+    Parameters:
+    - faces: (nFaces, maxSize) node indices of each face, padded after its size
+    - sizes: number of nodes of each face
+    """
+    triangles = [faces[sizes > k + 1][:, [0, k, k + 1]] for k in range(1, faces.shape[1] - 1)]
+    if len(triangles) == 0:
+        return np.empty((0,3), dtype=np.int32)
+    if len(triangles) == 1:
+        return triangles[0].astype(np.int32)
+
+    # Keep the triangles of each face together, in the order of the faces
+    face = np.concatenate([np.flatnonzero(sizes > k + 1) for k in range(1, faces.shape[1] - 1)])
+    return np.concatenate(triangles)[np.argsort(face, kind='stable')].astype(np.int32)
+
+# ---------------------------------------------------------------------
+def paddedRows(values, lengths, fill = -1):
+    """
+    Return the rows of a flat array of values, with the given number of values
+    in each row, as an array padded with the fill value after each row
+    """
+    if len(lengths) > 0 and np.all(lengths == lengths[0]):
+        return values.reshape((len(lengths), -1))
+    padded = np.full((len(lengths), int(lengths.max(initial=0))), fill, dtype=values.dtype)
+    padded[np.arange(padded.shape[1]) < lengths[:, None]] = values
+    return padded
+
+# ---------------------------------------------------------------------
+def tokenCounts(lines):
+    """
+    Return the number of values (separated by blanks) of each line, counting
+    the starts of the values in the text of all the lines
+    """
+    text   = np.frombuffer((' ' + ' '.join(lines)).encode('latin-1', 'replace'), dtype=np.uint8)
+    blank  = text <= ord(' ')
+    starts = np.flatnonzero(blank[:-1] & ~blank[1:])
+    ends   = np.cumsum(np.fromiter(map(len, lines), dtype=np.int64, count=len(lines)) + 1)
+    return np.diff(np.searchsorted(starts, ends - 1), prepend=0)
+
+# ---------------------------------------------------------------------
+def coordinateRows(lines, fileFormat):
+    """
+    Return the (N,3) coordinates of the vertex lines, with one conversion of
+    all the values. The values after the coordinates (colors, w) are ignored
+    and may be missing on some lines.
+    """
+    values  = np.array(' '.join(lines).split(), dtype=np.float64)
+    lengths = tokenCounts(lines)
+    if np.any(lengths < 3):
+        raise ValueError(f"Not a valid {fileFormat} file: vertices with less than three coordinates")
+    return paddedRows(values, lengths, np.nan)[:, :3].reshape((-1,3))
+
+# ---------------------------------------------------------------------
+def parseOFF(text):
+    """
+    Return the (N,3) nodes and the (M,3) triangles of the text of an OFF file
+    in a dictionary.
+    Comments (#) and blank lines are skipped, the values after the coordinates
+    of the vertices (colors) and after the nodes of the faces are ignored, and
+    the faces with more than three nodes are split into triangles.
+    """
+    lines = [line.strip() for line in re.sub(r'#[^\n]*', '', text).splitlines()]
+    lines = [line for line in lines if line]
+    if len(lines) == 0 or not lines[0].startswith('OFF'):
+        raise ValueError("Not a valid OFF file")
+
+    # The counts may follow OFF on the first line
+    header = lines[0][3:].split()
+    start  = 1
+    if len(header) == 0:
+        header, start = lines[1].split(), 2
+    numNodes, numFaces = int(header[0]), int(header[1])
+    nodeLines = lines[start:start + numNodes]
+    faceLines = lines[start + numNodes:start + numNodes + numFaces]
+    if len(nodeLines) < numNodes or len(faceLines) < numFaces:
+        raise ValueError("Not a valid OFF file: missing vertices or faces")
+
+    # Vertex block: one conversion of all the values
+    nodes = coordinateRows(nodeLines, 'OFF')
+
+    # Face block: one conversion of all the values, one row per face padded
+    # with -1 when the faces have different numbers of values
+    values  = np.array(' '.join(faceLines).split(), dtype=np.float64).astype(np.int64)
+    lengths = tokenCounts(faceLines)
+    values  = paddedRows(values, lengths)
+    sizes   = values[:, 0]
+    if np.any(sizes < 3) or np.any(sizes >= lengths):
+        raise ValueError("Not a valid OFF file: inconsistent face sizes")
+    triangles = fanTriangles(values[:, 1:int(sizes.max(initial=3)) + 1], sizes)
+    return {'nodes': np.ascontiguousarray(nodes), 'triangles': triangles}
+
+# ---------------------------------------------------------------------
+def readOFF(file_path):
+    with open(file_path, 'r') as file:
+        return parseOFF(file.read())
+
+# ---------------------------------------------------------------------
+def mergeVertices(vertices):
+    """
+    Return the nodes and the triangles of the (3M,3) coordinates of the
+    vertices of M triangles, merging the vertices with the same coordinates
+    """
+    vertices = vertices.reshape((-1,3))
+    order    = np.lexsort(vertices.T[::-1])
+    sortedVertices = vertices[order]
+    first    = np.concatenate(([True], np.any(sortedVertices[1:] != sortedVertices[:-1], axis=1))) if len(sortedVertices) > 0 else np.empty(0, dtype=bool)
+    inverse  = np.empty(len(vertices), dtype=np.int32)
+    inverse[order] = np.cumsum(first) - 1
+    return {'nodes': sortedVertices[first], 'triangles': inverse.reshape((-1,3))}
+
+# Record of a triangle of a binary STL file
+STL_TRIANGLE = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3,3)), ('attribute', '<u2')])
+
+# ---------------------------------------------------------------------
+def readSTL(file_path):
+    """
+    Return the nodes and the triangles of an STL file. Binary files (80 bytes
+    of header, the number of triangles and one record per triangle) are
+    memory mapped; ASCII files are also accepted.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file:
+        header = file.read(84)
+    count = int(np.frombuffer(header[80:84], dtype='<u4')[0]) if len(header) == 84 else -1
+    if count >= 0 and size == 84 + count * STL_TRIANGLE.itemsize:
+        if count == 0:
+            return {'nodes': np.empty((0,3)), 'triangles': np.empty((0,3), dtype=np.int32)}
+        records = np.memmap(file_path, dtype=STL_TRIANGLE, mode='r', offset=84, shape=(count,))
+        return mergeVertices(records['vertices'].astype(np.float64))
+
+    with open(file_path, 'r') as file:
+        text = file.read()
+    if not text.lstrip().startswith('solid'):
+        raise ValueError("Not a valid STL file")
+    vertices = np.array(re.findall(r'vertex\s+(\S+)\s+(\S+)\s+(\S+)', text), dtype=np.float64)
+    return mergeVertices(vertices.reshape((-1,3)))
+
+# ---------------------------------------------------------------------
+def readOBJ(file_path):
+    """
+    Return the nodes and the triangles of all the faces of an OBJ file (the
+    groups and objects are not kept). The texture and normal indices of the
+    faces are ignored, the negative (relative) indices are resolved, and the
+    faces with more than three nodes are split into triangles.
+    """
+    vertexLines, faceLines, verticesBefore = [], [], []
+    with open(file_path, 'r') as file:
+        for line in file:
+            if line.startswith('v '):
+                vertexLines.append(line[2:].split('#')[0])
+            elif line.startswith('f '):
+                faceLines.append(line[2:].split('#')[0])
+                verticesBefore.append(len(vertexLines))
+
+    # Vertex block: one conversion of all the values (w is ignored)
+    numNodes = len(vertexLines)
+    nodes    = coordinateRows(vertexLines, 'OBJ')
+
+    # Face block: keep the vertex index of each v/vt/vn. Only the slots of each
+    # face (not the -1 padding) are converted to 0-based indices and checked;
+    # the index 0 is not valid
+    values  = np.array(re.sub(r'/\S*', '', ' '.join(faceLines)).split(), dtype=np.int64)
+    lengths = tokenCounts(faceLines)
+    faces   = paddedRows(values, lengths)
+    slots   = np.arange(faces.shape[1]) < lengths[:, None]
+    before  = np.repeat(np.array(verticesBefore, dtype=np.int64), lengths)
+    faces[slots] = np.where(values > 0, values - 1, np.where(values < 0, before + values, -1))
+    if np.any(lengths < 3) or np.any(faces[slots] < 0) or np.any(faces[slots] >= numNodes):
+        raise ValueError("Not a valid OBJ file: inconsistent faces")
+    return {'nodes': np.ascontiguousarray(nodes), 'triangles': fanTriangles(faces, lengths)}
+
+# ---------------------------------------------------------------------
+def tsurfPatches(name, vertexLines, atomLines, faceBlocks, depth):
+    """
+    Return the list of (name, nodes, triangles) of the TFACEs of a GOCAD TSurf
+    object, each one with its own nodes, from its VRTX, ATOM and TRGL lines
+    without the keywords
+    """
+    # Vertex lines (after the keyword): id x y z [properties], one row per
+    # line padded when VRTX and PVRTX lines have different numbers of values
+    values  = np.array(' '.join(vertexLines).split(), dtype=np.float64)
+    lengths = tokenCounts(vertexLines)
+    if np.any(lengths < 4):
+        raise ValueError(f"TSurf {name}: vertices with less than three coordinates")
+    vertices = paddedRows(values, lengths, np.nan)[:, :4].reshape((-1,4))
+    ids      = vertices[:, 0].astype(np.int64)
+    coords   = vertices[:, 1:]
+    if depth:
+        coords[:, 2] = -coords[:, 2]
+
+    # ATOM id vertex: another id of an existing vertex
+    atoms = np.array([line.split()[:2] for line in atomLines], dtype=np.int64).reshape((-1,2))
+    order = np.argsort(ids)
+    def rowsOf(keys, sortedIds, rows):
+        position = np.minimum(np.searchsorted(sortedIds, keys), max(len(sortedIds) - 1, 0))
+        if len(sortedIds) == 0 or np.any(sortedIds[position] != keys):
+            raise ValueError(f"TSurf {name}: triangles or atoms refer to missing vertices")
+        return rows[position]
+    allIds  = np.concatenate((ids, atoms[:, 0]))
+    allRows = np.concatenate((np.arange(len(ids)), rowsOf(atoms[:, 1], ids[order], order) if len(atoms) > 0 else np.empty(0, dtype=np.int64)))
+    allOrder = np.argsort(allIds)
+
+    blocks  = [block for block in faceBlocks if len(block) > 0]
+    patches = []
+    for k, block in enumerate(blocks):
+        triangles = np.array(' '.join(block).split(), dtype=np.int64).reshape((-1,3))
+        rows      = rowsOf(triangles, allIds[allOrder], allRows[allOrder])
+        used, local = np.unique(rows, return_inverse=True)
+        patchName = name if len(blocks) == 1 else f"{name}_{k + 1}"
+        patches.append((patchName, coords[used], local.reshape((-1,3)).astype(np.int32)))
+    return patches
+
+# ---------------------------------------------------------------------
+def readTSurf(file_path):
+    """
+    Return the patches (TFACE) of all the TSurf objects of a GOCAD file,
+    concatenated: the nodes and the triangles (local to each patch) of patch i
+    are the rows nodePointer[i]:nodePointer[i+1] and
+    trianglePointer[i]:trianglePointer[i+1]. The file is read line by line;
+    the vertices and triangles of each object are converted in blocks. The z
+    coordinate is negated when ZPOSITIVE is Depth.
+    """
+    patches = []
+    name, vertexLines, atomLines, faceBlocks, depth = '', [], [], [], False
+    with open(file_path, 'r') as file:
+        for line in file:
+            parts   = line.split(None, 1)
+            keyword = parts[0] if parts else ''
+            if keyword == 'VRTX' or keyword == 'PVRTX':
+                vertexLines.append(parts[1])
+            elif keyword == 'TRGL':
+                if len(faceBlocks) == 0:
+                    faceBlocks.append([])
+                faceBlocks[-1].append(parts[1])
+            elif keyword == 'ATOM' or keyword == 'PATOM':
+                atomLines.append(parts[1])
+            elif keyword == 'TFACE':
+                faceBlocks.append([])
+            elif keyword.startswith('name:'):
+                name = line.split(':', 1)[1].strip()
+            elif keyword == 'ZPOSITIVE':
+                depth = line.split()[1].lower() == 'depth' if len(line.split()) > 1 else False
+            elif keyword == 'GOCAD':
+                name, vertexLines, atomLines, faceBlocks, depth = f"TSurf{len(patches) + 1}", [], [], [], False
+            elif keyword == 'END':
+                patches += tsurfPatches(name, vertexLines, atomLines, faceBlocks, depth)
+                vertexLines, atomLines, faceBlocks = [], [], []
+
+    if len(patches) == 0:
+        raise ValueError("Not a valid TSurf file: no triangles")
+    names, nodes, triangles = zip(*patches)
+    return {'nodes':           np.concatenate(nodes),
+            'triangles':       np.concatenate(triangles),
+            'nodePointer':     np.cumsum([0] + [len(n) for n in nodes]),
+            'trianglePointer': np.cumsum([0] + [len(t) for t in triangles]),
+            'names':           np.array(names)}
+
+# Reader of each extension of surface file
+surfaceFileReaders = {'.off': readOFF, '.stl': readSTL, '.obj': readOBJ, '.ts': readTSurf}
+
+# ---------------------------------------------------------------------
+def readSurfacePatches(file_path, useCache = True):
+    """
+    Return the list of (name, nodes, triangles) of the patches of a surface
+    file, read by its extension (through the cache, see readCached). Only the
+    TSurf files have several patches; the other patches are named after the file.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in surfaceFileReaders:
+        raise ValueError(f"Unknown surface file format {extension}: use one of {list(surfaceFileReaders)}")
+    arrays = readCached(file_path, surfaceFileReaders[extension], useCache)
+    if 'names' not in arrays:
+        return [(os.path.splitext(os.path.basename(file_path))[0], arrays['nodes'], arrays['triangles'])]
+    nodePointer, trianglePointer = arrays['nodePointer'], arrays['trianglePointer']
+    return [(str(name), arrays['nodes'][nodePointer[i]:nodePointer[i+1]], arrays['triangles'][trianglePointer[i]:trianglePointer[i+1]])
+            for i, name in enumerate(arrays['names'])]
+
+# ---------------------------------------------------------------------
+def fileHash(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 24), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# ---------------------------------------------------------------------
+def loadNpzMemoryMapped(cache_path):
+    """
+    Return a dictionary with the arrays of an uncompressed .npz file, memory
+    mapped (np.load does not memory map the arrays of .npz files)
+    """
+    arrays = {}
+    with zipfile.ZipFile(cache_path) as archive, open(cache_path, 'rb') as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Compressed array {info.filename} in {cache_path}")
+
+            # Skip the local header of the member (30 bytes, name and extra field)
+            file.seek(info.header_offset + 26)
+            nameLength, extraLength = np.frombuffer(file.read(4), dtype='<u2')
+            file.seek(info.header_offset + 30 + int(nameLength) + int(extraLength))
+
+            # Header of the .npy member
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(file)
+            name = info.filename[:-len('.npy')]
+            if dtype.hasobject:
+                raise ValueError(f"Array of objects {name} in {cache_path}")
+            if np.prod(shape) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(cache_path, dtype=dtype, mode='r', offset=file.tell(), shape=shape, order='F' if fortran else 'C')
+    return arrays
+
+# ---------------------------------------------------------------------
+def writeCache(cache_path, key, hashValue, arrays):
+    """
+    Write the arrays to a temporary file next to the cache and move it in
+    place: a cache that is still memory mapped is replaced, never overwritten.
+    Nothing is written when the folder is read-only or the cache cannot be
+    replaced (in use on Windows).
+    """
+    try:
+        handle, temporary_path = tempfile.mkstemp(suffix=CACHE_SUFFIX, dir=os.path.dirname(os.path.abspath(cache_path)))
+    except OSError:
+        return
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            np.savez(file, key=key, hash=np.array(hashValue), **arrays)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        os.remove(temporary_path)
+
+# ---------------------------------------------------------------------
+def readCached(file_path, reader, useCache = True):
+    """
+    Return the arrays read from a surface file by the reader, through a .npz
+    cache written next to it. The cache is valid while the modification time
+    and size of the file are the ones it records or, when the file was touched,
+    while its hash is the same (the new time is then recorded). Valid caches
+    are loaded memory mapped.
+
+    Parameters:
+    - file_path: path of the surface file
+    - reader:    function of the path of the file returning a dictionary of arrays
+    - useCache:  False to always parse the file (the cache is not written)
+    """
+    cache_path = file_path + CACHE_SUFFIX
+    status     = os.stat(file_path)
+    key        = np.array([status.st_mtime_ns, status.st_size], dtype=np.int64)
+
+    if not useCache:
+        return reader(file_path)
+
+    hashValue = None
+    if os.path.exists(cache_path):
+        try:
+            arrays     = loadNpzMemoryMapped(cache_path)
+            cachedKey  = arrays.pop('key')
+            cachedHash = str(np.asarray(arrays.pop('hash', '')))
+            if np.array_equal(cachedKey, key):
+                return arrays
+            hashValue = fileHash(file_path)
+            if cachedHash == hashValue:
+                writeCache(cache_path, key, hashValue, arrays)
+                return arrays
+        except (ValueError, KeyError, OSError, zipfile.BadZipFile):
+            pass
+
+    arrays = reader(file_path)
+    writeCache(cache_path, key, hashValue or fileHash(file_path), arrays)
+    return arrays
@@ -5,16 +5,35 @@
 #
 # ------------------------------------------------------------------------------
 from scipy.spatial import ConvexHull
+from auxiliar.surfaceReaders import readCached, readOFF, readSurfacePatches
 import numpy as np
 
+def appendRows(buffer, count, rows):
+    """
+    Copy the rows after the first count rows of the buffer, doubling its size
+    when they do not fit (amortized constant time per row). Return the buffer
+    (a new one when it grows) and the new number of rows in use.
+    """
+    rows = np.asarray(rows, dtype=buffer.dtype).reshape((-1, buffer.shape[1]))
+    if count + len(rows) > len(buffer):
+        grown = np.empty((max(2 * len(buffer), count + len(rows), 16), buffer.shape[1]), dtype=buffer.dtype)
+        grown[:count] = buffer[:count]
+        buffer = grown
+    buffer[count:count + len(rows)] = rows
+    return buffer, count + len(rows)
+
 class triangulatedSurface:
     def __init__(self,tag,name):
         self.tag             = tag
         self.name            = name
-        self.nodes           = []
-        self.triangles       = []
-        self.globalTriangles = []
+        self.nodes           = np.empty((0,3), dtype=np.float64)    # (N,3) coordinates
+        self.triangles       = np.empty((0,3), dtype=np.int32)      # (M,3) local node indices
+        self.globalTriangles = np.empty((0,3), dtype=np.int32)      # (M,3) node indices in the geometry
+        self.nodeBuffer      = self.nodes                           # nodes are the first N rows
+        self.triangleBuffer  = self.triangles                       # triangles are the first M rows
         self.gmshTag         = []
+        self.bspline         = None
+        self.cache           = {}
 
     # --------------------------------------------------------------------- 
     def getSurfaceTag(self):
@@ -38,40 +57,65 @@ class triangulatedSurface:
 
     # ---------------------------------------------------------------------
     def addNode(self, vertex):
-        self.nodes.append(vertex)
+        self.addNodes([vertex])
 
     # ---------------------------------------------------------------------
     def addTriangle(self, triangle):
-        self.triangles.append(triangle)
+        self.addTriangles([triangle])
 
     # ---------------------------------------------------------------------
-    def getGmshDimTag(self):
-        return [(2,tag) for tag in self.gmshTag]
+    # Append an (n,3) array of node coordinates
+    def addNodes(self, nodes):
+        self.nodeBuffer, numNodes = appendRows(self.nodeBuffer, self.getNumNodes(), nodes)
+        self.nodes = self.nodeBuffer[:numNodes]
+        self.cache = {}
 
     # ---------------------------------------------------------------------
-    # Read the OFF file
-    def readOFFFile(self,file_path):
-        
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
+    # Append an (n,3) array of triangles (local node indices)
+    def addTriangles(self, triangles):
+        self.triangleBuffer, numTriangles = appendRows(self.triangleBuffer, self.getNumTriangles(), triangles)
+        self.triangles = self.triangleBuffer[:numTriangles]
 
-            # Skip the first line (OFF)
-            if lines[0].strip() != 'OFF':
-                raise ValueError("Not a valid OFF file")
+    # ---------------------------------------------------------------------
+    # Add the nodes and the triangles read from a file: an empty surface keeps
+    # the arrays as they are (memory mapped from the cache of the file)
+    def addData(self, nodes, triangles):
+        if self.getNumNodes() == 0 and self.getNumTriangles() == 0:
+            self.nodes     = self.nodeBuffer     = nodes
+            self.triangles = self.triangleBuffer = triangles
+            self.cache     = {}
+        else:
+            self.addNodes(nodes)
+            self.addTriangles(triangles)
 
-            # Read the header line containing the number of nodes, faces, and edges
-            header = lines[1].strip().split()
-            num_nodes = int(header[0])
-            num_faces = int(header[1])
+    # ---------------------------------------------------------------------
+    # Lower and upper corners of the box around the nodes
+    def getBoundingBox(self):
+        if 'boundingBox' not in self.cache:
+            self.cache['boundingBox'] = (self.nodes.min(axis=0), self.nodes.max(axis=0))
+        return self.cache['boundingBox']
 
-            # Read nodes
-            for i in range(2, 2 + num_nodes):
-                vertex = list(map(float, lines[i].strip().split()))
-                self.addNode(vertex)
+    # ---------------------------------------------------------------------
+    # Centroid of the nodes
+    def getCenter(self):
+        if 'center' not in self.cache:
+            self.cache['center'] = self.nodes.mean(axis=0)
+        return self.cache['center']
 
-            # Read faces
-            for i in range(2 + num_nodes, 2 + num_nodes + num_faces):
-                face_line = list(map(int, lines[i].strip().split()))
-                face = face_line[1:]  # Skip the first number which is the number of nodes in the face    
-                # self.addTriangle([node + 1 for node in face])
-                self.addTriangle(face)
+    # ---------------------------------------------------------------------
+    def getGmshDimTag(self):
+        return [(2,tag) for tag in self.gmshTag]
+
+    # ---------------------------------------------------------------------
+    # Read the OFF file (through the .npz cache written next to it, unless
+    # useCache is False)
+    def readOFFFile(self, file_path, useCache = True):
+        arrays = readCached(file_path, readOFF, useCache)
+        self.addData(arrays['nodes'], arrays['triangles'])
+
+    # ---------------------------------------------------------------------
+    # Read a surface file by its extension: .off, .stl (binary or ASCII), .obj
+    # or .ts (GOCAD TSurf, with the index of the patch when it has several)
+    def readFile(self, file_path, patch = 0, useCache = True):
+        name, nodes, triangles = readSurfacePatches(file_path, useCache)[patch]
+        self.addData(nodes, triangles)
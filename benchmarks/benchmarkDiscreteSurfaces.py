@@ -0,0 +1,131 @@
+# ------------------------------------------------------------------------------
+#
+# Time of the stages of ruqtvist_exxon_intersection.py on the OFF surfaces of
+# examples/exxon_2 (import, extrusion of the top surface, occ.fragment with
+# the faults and horizons, 3D meshing) with three imports: one OCC plane
+# surface per triangle (addNodesToGmshModel and addSurfaceToGmshModel), one
+# OCC B-spline surface per patch (addBSplineSurfacesToGmshModel) and one
+# discrete surface per patch (addDiscreteSurfacesToGmshModel). The discrete
+# surfaces are not in the OCC kernel, so they cannot be extruded nor
+# fragmented: only their import is timed, and the B-spline surfaces are the
+# import that reaches occ.fragment with one surface per patch. The patches of
+# exxon_2 have two triangles each: each triangle can be split into r x r
+# triangles to reach the size of real horizons.
+#
+# Run from the root folder of the repository:
+#   python -m benchmarks.benchmarkDiscreteSurfaces [r]
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+import os
+import sys
+import time
+import gmsh
+from auxiliar.geometry import geometry
+import auxiliar.triangulatedSurface as trisurf
+
+# Number of divisions of the edges of each triangle
+r = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+def refineSurface(surface, r):
+    """
+    Split each triangle of the surface into r x r triangles, sharing the nodes
+    on the edges of the original triangles
+    """
+    nodes, triangles, nodeIndex = [], [], {}
+    for triangle in surface.triangles:
+        p0, p1, p2 = [surface.getNode(n) for n in triangle]
+        grid = {}
+        for i in range(r + 1):
+            for j in range(r + 1 - i):
+                node = tuple(round(p0[k] + (i * (p1[k] - p0[k]) + j * (p2[k] - p0[k])) / r, 6) for k in range(3))
+                if node not in nodeIndex:
+                    nodeIndex[node] = len(nodes)
+                    nodes.append(node)
+                grid[(i, j)] = nodeIndex[node]
+        for i in range(r):
+            for j in range(r - i):
+                triangles.append([grid[(i, j)], grid[(i + 1, j)], grid[(i, j + 1)]])
+                if j < r - i - 1:
+                    triangles.append([grid[(i, j + 1)], grid[(i + 1, j)], grid[(i + 1, j + 1)]])
+    refined = trisurf.triangulatedSurface(surface.getSurfaceTag(), surface.name)
+    refined.addNodes(nodes)
+    refined.addTriangles(triangles)
+    return refined
+
+def loadGeometry(r):
+    folder = os.path.join("examples", "exxon_2")
+    problemGeometry = geometry()
+    for fileName in sorted(name for name in os.listdir(folder) if name.endswith(".off")):
+        surface = trisurf.triangulatedSurface(problemGeometry.getNumSurfaces(), fileName)
+        surface.readOFFFile(os.path.join(folder, fileName))
+        problemGeometry.addSurfaceData(refineSurface(surface, r) if r > 1 else surface)
+    return problemGeometry
+
+def occImport():
+    problemGeometry.addNodesToGmshModel(gmsh)
+    problemGeometry.addSurfaceToGmshModel(gmsh)
+    gmsh.model.occ.synchronize()
+
+def bsplineImport():
+    problemGeometry.addBSplineSurfacesToGmshModel(gmsh, 1.0)
+    gmsh.model.occ.synchronize()
+
+def discreteImport():
+    problemGeometry.addDiscreteSurfacesToGmshModel(gmsh)
+
+def surfaceTags(prefix, exclude = False):
+    return [dimTag for surface in problemGeometry.surf if surface.name.startswith(prefix) != exclude for dimTag in surface.getGmshDimTag()]
+
+def extrudeVolume():
+    # Stages of ruqtvist_exxon_intersection.py after the import
+    topSurf     = next(i for i, surface in enumerate(problemGeometry.surf) if surface.name.startswith("Top_patch"))
+    topSurfTags = problemGeometry.getGmshSurfaceDimTag(topSurf)
+    Xtop = problemGeometry.getSurfaceCenter(topSurf)
+    gmsh.model.occ.dilate(topSurfTags, Xtop[0], Xtop[1], Xtop[2], 0.975, 0.975, 1.0)
+    volTags = gmsh.model.occ.extrude(topSurfTags, 0, 0, -problemGeometry.getModelDepthRange() * 1.05)
+    gmsh.model.occ.synchronize()
+    return volTags
+
+def fragmentVolume(volTags):
+    faultSurfTags = surfaceTags("Fault")
+    contSurfTags  = surfaceTags("Fault", exclude=True)
+    gmsh.model.occ.fragment(volTags, faultSurfTags + contSurfTags)
+    gmsh.model.occ.synchronize()
+
+def generateMesh():
+    gmsh.model.mesh.setSize(gmsh.model.getEntities(0), 50.0)
+    gmsh.model.mesh.generate(3)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+gmsh.initialize()
+gmsh.option.setNumber("General.Verbosity", 1)
+gmsh.option.setNumber("General.AbortOnError", 0)
+gmsh.option.setNumber("Geometry.Tolerance", 1)
+gmsh.option.setNumber("Geometry.ToleranceBoolean", 1)
+
+print(f"{'':32s}  {'import':>8s}  {'extrude':>8s}  {'fragment':>8s}  {'mesh':>8s}  {'total':>8s}")
+for name, importSurfaces in [('OCC plane surface per triangle', occImport), ('OCC B-spline surface per patch', bsplineImport), ('discrete surface per patch', discreteImport)]:
+    problemGeometry = loadGeometry(r)
+    gmsh.model.add(name)
+    _, importTime = timed(importSurfaces)
+    if importSurfaces is discreteImport:
+        # The discrete surfaces are not in the OCC kernel: they cannot be
+        # extruded nor fragmented, so the pipeline stops after the import
+        print(f"{name:32s}  {importTime:8.3f}  {'-':>8s}  {'-':>8s}  {'-':>8s}  {importTime:8.3f}")
+        continue
+    volTags, extrudeTime = timed(extrudeVolume)
+    _, fragmentTime      = timed(fragmentVolume, volTags)
+    _, meshTime          = timed(generateMesh)
+    total = importTime + extrudeTime + fragmentTime + meshTime
+    print(f"{name:32s}  {importTime:8.3f}  {extrudeTime:8.3f}  {fragmentTime:8.3f}  {meshTime:8.3f}  {total:8.3f}"
+          f"   volumes = {len(gmsh.model.getEntities(3))}, tetrahedra = {len(gmsh.model.mesh.getElementsByType(4)[0])}")
+
+print(f"triangles = {problemGeometry.getNumTriangles()}, nodes = {problemGeometry.getNumNodes()}")
+gmsh.finalize()
@@ -0,0 +1,78 @@
+# ------------------------------------------------------------------------------
+#
+# Time to gather the connectivity of the cell physical groups of a model with
+# many entities (an n x n grid of rectangles, as the models built from OFF
+# patches): the former loop of printElements, with one getElementTypes and
+# one getElementsByType call per entity, against MeshSnapshot.takeCells, with
+# one counting call per entity of the groups and one getElementsByType call
+# per element type. The two groups split the rectangles; when some entities
+# with elements are left out of the groups, they are counted as well (see
+# getElementCounts). Both connectivities are compared.
+#
+# Run from the root folder of the repository:
+#   python -m benchmarks.benchmarkEntityExtraction [n] [elementsPerSide]
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+import sys
+import time
+import gmsh
+import numpy as np
+from gemaModel.mesh.meshSnapshot import MeshSnapshot
+from gemaModel.mesh.gmsh2GeMA_ElementTypes import gmsh2GeMA_elementTypes_NumberOfNodes
+
+# Number of rectangles per direction and of elements per side of each one
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+m = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+def legacyExtraction(cellPhysicalGroups):
+    connectivity = {}
+    for physicalGroupTag in cellPhysicalGroups:
+        entitiesTags = gmsh.model.getEntitiesForPhysicalGroup(2, physicalGroupTag)
+        elemTypes = []
+        for entityTag in entitiesTags:
+            elemTypes.extend(gmsh.model.mesh.getElementTypes(2, entityTag))
+        for elemType in set(elemTypes):
+            nNodes = gmsh2GeMA_elementTypes_NumberOfNodes[elemType]
+            blocks = []
+            for e in entitiesTags:
+                _, elem = gmsh.model.mesh.getElementsByType(elemType, e)
+                blocks.append(elem.reshape((-1,nNodes)))
+            connectivity[(physicalGroupTag, elemType)] = np.concatenate(blocks)
+    return connectivity
+
+gmsh.initialize()
+gmsh.option.setNumber("General.Verbosity", 2)
+gmsh.model.add("grid")
+for i in range(n):
+    for j in range(n):
+        gmsh.model.occ.addRectangle(i, j, 0, 1, 1)
+gmsh.model.occ.removeAllDuplicates()
+gmsh.model.occ.synchronize()
+gmsh.option.setNumber("Mesh.MeshSizeMax", 1.0 / m)
+gmsh.option.setNumber("Mesh.RecombineAll", 1)
+gmsh.model.mesh.setTransfiniteAutomatic()
+gmsh.model.mesh.generate(2)
+
+surfaces = [tag for _, tag in gmsh.model.getEntities(2)]
+nodesGroup  = gmsh.model.addPhysicalGroup(2, surfaces)
+cellGroups  = [gmsh.model.addPhysicalGroup(2, surfaces[:len(surfaces)//2]),
+               gmsh.model.addPhysicalGroup(2, surfaces[len(surfaces)//2:])]
+numElements = sum(len(gmsh.model.mesh.getElementsByType(t)[0]) for t in gmsh.model.mesh.getElementTypes(2))
+print(f"entities = {len(surfaces)}, elements = {numElements}")
+
+start = time.perf_counter()
+legacy = legacyExtraction(cellGroups)
+legacyTime = time.perf_counter() - start
+
+snapshot = MeshSnapshot(gmsh, 2, nodesGroup)
+start = time.perf_counter()
+snapshot.takeCells(cellGroups)
+snapshotTime = time.perf_counter() - start
+
+identical = legacy.keys() == snapshot.connectivity.keys() and all(np.array_equal(legacy[k], snapshot.connectivity[k]) for k in legacy)
+print(f"one call per entity   : {legacyTime:8.3f} s")
+print(f"MeshSnapshot.takeCells: {snapshotTime:8.3f} s   identical = {identical}")
+gmsh.finalize()
@@ -0,0 +1,71 @@
+# ------------------------------------------------------------------------------
+#
+# Size and load time of the nested and flat encodings of the Lua tables of
+# nodes and connectivities of the mesh file. The load time is measured with
+# the Lua runtime of the lupa package (pip install lupa), when it is installed:
+# the flat tables are loaded with and without rebuilding their rows.
+#
+# Run from the root folder of the repository:
+#   python -m benchmarks.benchmarkFlatTables [numberOfElements]
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+import io
+import sys
+import time
+import numpy as np
+from gemaModel.mesh.luaTableWriter import writeNodeRows, writeRows, connectivityRowFormat, flatRowFormat, UNFLATTEN_FUNCTION
+
+def nestedMeshFile(nodeCoords, connectivity):
+    file = io.StringIO()
+    file.write("local meshData = {}\nlocal nodes = {\n")
+    writeNodeRows(file, nodeCoords, 3)
+    file.write("}\nmeshData['nodes'] = nodes\nlocal tet4_domain = {\n")
+    writeRows(file, connectivityRowFormat(4), connectivity)
+    file.write("}\nmeshData['tet4_domain'] = tet4_domain\nreturn meshData")
+    return file.getvalue()
+
+def flatMeshFile(nodeCoords, connectivity, rebuildRows):
+    nodes    = "unflatten(nodes, 3)" if rebuildRows else "nodes"
+    elements = "unflatten(tet4_domain, 4)" if rebuildRows else "tet4_domain"
+    file = io.StringIO()
+    file.write("local meshData = {}\n" + UNFLATTEN_FUNCTION + "local nodes = {\n")
+    writeRows(file, flatRowFormat("%.8e", 3), nodeCoords)
+    file.write(f"}}\nmeshData['nodes'] = {nodes}\nlocal tet4_domain = {{\n")
+    writeRows(file, flatRowFormat("%d", 4), connectivity)
+    file.write(f"}}\nmeshData['tet4_domain'] = {elements}\nreturn meshData")
+    return file.getvalue()
+
+def loadTime(text):
+    try:
+        import lupa
+    except ImportError:
+        return None
+    lua   = lupa.LuaRuntime()
+    start = time.perf_counter()
+    lua.execute(text)
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+
+    # Number of tet4 elements
+    numElements = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    # Synthetic tet mesh: about one node for each five tets
+    rng          = np.random.default_rng(0)
+    numNodes     = max(numElements // 5, 4)
+    nodeCoords   = rng.uniform(-1.0e4, 1.0e4, (numNodes, 3))
+    connectivity = rng.integers(1, numNodes + 1, (numElements, 4))
+
+    files = [('nested rows',                nestedMeshFile(nodeCoords, connectivity)),
+             ('flat, rows rebuilt in Lua',  flatMeshFile(nodeCoords, connectivity, True)),
+             ('flat, handed over as is',    flatMeshFile(nodeCoords, connectivity, False))]
+
+    print(f"nodes = {numNodes}, tet4 elements = {numElements}")
+    for name, text in files:
+        size = len(text) / 2**20
+        load = loadTime(text)
+        load = f"{load:8.3f} s" if load is not None else "   (lupa not installed)"
+        print(f"   {name:28s}: {size:9.1f} MiB, load {load}")
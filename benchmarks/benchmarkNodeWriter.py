@@ -0,0 +1,48 @@
+# ------------------------------------------------------------------------------
+#
+# Benchmark of the bulk writer of the Lua table of nodes against the former
+# row-by-row writer of gemaMesh.printNodes. Both outputs are compared byte by
+# byte.
+#
+# Run from the root folder of the repository:
+#   python -m benchmarks.benchmarkNodeWriter [numberOfNodes]
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+import io
+import sys
+import time
+import numpy as np
+from gemaModel.mesh.luaTableWriter import writeNodeRows
+
+def legacyNodeWriter(file, nodeCoords, dim):
+    for i, coord in enumerate(nodeCoords, start=1):
+        if dim == 2:
+            file.write(f"    {{ {coord[0]:.8e}, {coord[1]:.8e} }}, -- {i}\n")
+        elif dim == 3:
+            file.write(f"    {{ {coord[0]:.8e}, {coord[1]:.8e}, {coord[2]:.8e} }}, -- {i}\n")
+
+def timeWriter(writer, nodeCoords, dim):
+    file = io.StringIO()
+    start = time.perf_counter()
+    writer(file, nodeCoords, dim)
+    return time.perf_counter() - start, file.getvalue()
+
+# Number of nodes
+numNodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+# Random coordinates with mixed signs and magnitudes
+rng = np.random.default_rng(0)
+nodeCoords = rng.uniform(-1.0e4, 1.0e4, (numNodes, 3))
+nodeCoords[::7] = 0.0
+
+for dim in [2, 3]:
+    tLegacy, outLegacy = timeWriter(legacyNodeWriter, nodeCoords, dim)
+    tBulk, outBulk = timeWriter(writeNodeRows, nodeCoords, dim)
+    print(f"dim = {dim}, nodes = {numNodes}")
+    print(f"   row-by-row writer : {tLegacy:8.3f} s")
+    print(f"   bulk writer       : {tBulk:8.3f} s")
+    print(f"   speedup           : {tLegacy/tBulk:8.2f}x")
+    print(f"   identical output  : {outLegacy == outBulk}")
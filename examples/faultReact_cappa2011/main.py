@@ -156,13 +156,6 @@ gmsh.option.setNumber('Mesh.Points', 1)
 gmsh.option.setNumber("Mesh.Algorithm", 1)
 gmsh.model.mesh.generate(2)
 
-# ===  DUPLICATE NODES ALONG THE FAULT ===================================
-
-gmsh.plugin.setNumber("Crack", "Dimension", 1)
-gmsh.plugin.setNumber("Crack", "PhysicalGroup", faultPG)
-# gmsh.plugin.setNumber("Crack", "OpenBoundaryPhysicalGroup", faultPG)
-gmsh.plugin.run("Crack")
-
 # ===  RENUMBER THE NODES  ==============================================
 
 old, new = gmsh.model.mesh.computeRenumbering('RCMK')
@@ -185,8 +178,8 @@ for material in problemMaterials:
 # Initialize the mesh object
 mesh = gemaMesh(problemName,dim,gmsh)
 
-# Create interface elements
-interfaceElements = mesh.createInterfaceElements(faultPG)
+# Duplicate the nodes along the fault and create the interface elements
+interfaceElements = mesh.splitDiscontinuity(faultPG)
 
 # Assign domain physical group to the nodes
 mesh.setNodesPhysicalGroup(meshDomain)
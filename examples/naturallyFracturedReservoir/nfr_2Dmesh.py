@@ -1,22 +1,18 @@
 # ------------------------------------------------------------------------------
 #
-# This script generate the mesh of the fault reactivation problem presented by
-# Cappa and Rutqvist (2011). The mesh is conform to the fault, the nodes along 
-# the fault are duplicated and double-node interface elements are created.
+# This script generate the mesh of a naturally fractured reservoir with a
+# network of random fractures. The mesh is conform to the fractures, the nodes
+# along the fractures are duplicated (also at their X- and T-junctions) and
+# double-node interface elements are created.
 #
 # Author: Danilo Cavalcanti
 # February 2024
 #
-# Reference:
-#   Cappa, F., & Rutqvist, J. (2011). Modeling of coupled deformation and
-#   permeability evolution during fault reactivation induced by deep 
-#   underground injection of CO2. International Journal of Greenhouse Gas
-#   Control, 5(2), 336-346. https://doi.org/10.1016/j.ijggc.2010.08.005
-#
 # ------------------------------------------------------------------------------
 import os
 import numpy as np
 import gmsh
+from gemaModel.mesh.meshGeMA import gemaMesh
 
 def generateRandomLinesGmsh(Lx, Ly, n):
     lines_with_tags = []
@@ -81,6 +77,16 @@ o, m = gmsh.model.occ.fragment([(2, surfReservoir)], lines)
 # Synchronize the model
 gmsh.model.occ.synchronize()
 
+# ===  DEFINITION OF PHYSICAL GROUPS ============================================
+
+# The fractures are the curves that are not on the boundary of the domain
+domainBorder = [tag for _, tag in gmsh.model.getBoundary(gmsh.model.getEntities(2), oriented=False)]
+fractures    = [tag for _, tag in gmsh.model.getEntities(1) if tag not in domainBorder]
+
+meshDomain  = gmsh.model.addPhysicalGroup(dim,   [tag for _, tag in gmsh.model.getEntities(2)], name='ContinuumDomain')
+reservoirPG = gmsh.model.addPhysicalGroup(dim,   [tag for _, tag in gmsh.model.getEntities(2)], name='reservoir')
+fracturesPG = gmsh.model.addPhysicalGroup(dim-1, fractures,                                    name='fractures')
+
 # ===  MESH CONFIGURATION =========================================================
 
 # Set the mesh size
@@ -101,6 +107,31 @@ gmsh.model.mesh.generate(2)
 old, new = gmsh.model.mesh.computeRenumbering('RCMK')
 gmsh.model.mesh.renumberNodes(old, new)
 
+# ===  MESH  =====================================================
+
+# Initialize the mesh object
+mesh = gemaMesh(problemName,dim,gmsh)
+
+# Duplicate the nodes along the fractures and create the interface elements
+interfaceElements = mesh.splitDiscontinuity(fracturesPG)
+
+# Assign domain physical group to the nodes
+mesh.setNodesPhysicalGroup(meshDomain)
+
+# Set the physical groups to the mesh
+mesh.setCellPhysicalGroup([reservoirPG])
+
+# Set the physical group to the interface elements
+mesh.setDiscontinuitySet(interfaceElements,fracturesPG)
+
+# === WRITE FILES TO GEMA ========================================
+
+# Write the mesh file
+mesh.writeMeshFile()
+
+# Write the gmsh mesh file
+gmsh.write(problemName + ".msh")
+
 # Launch the GUI to see the results:
 gmsh.fltk.run()
 gmsh.finalize()
\ No newline at end of file
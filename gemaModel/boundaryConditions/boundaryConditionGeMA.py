@@ -35,35 +35,34 @@ class boundaryConditionsGema:
     def writeBoundaryConditionValues(self, _file):
         pass
 
-    def writeBoundaryCondition(self, _file):
-        with open (_file,'a') as file:
-            file.write('BoundaryCondition {\n')
-            file.write('  id = \'' + self.id + '\',\n')
-            file.write('  type = \'' + self.type + '\',\n')
-            file.write('  mesh = \'mesh\',\n')
-            file.write('\n')
+    def writeBoundaryCondition(self, file):
+        file.write('BoundaryCondition {\n')
+        file.write('  id = \'' + self.id + '\',\n')
+        file.write('  type = \'' + self.type + '\',\n')
+        file.write('  mesh = \'mesh\',\n')
+        file.write('\n')
 
-            file.write('  properties = {\n')
-            for param in self.parametersId:
-                file.write(f"    {{id = \'{param}\'")
-                file.write(f",  description = \'{bcVariables[param]['description']}\'")
-                file.write(f",  unit = \'{bcVariables[param]['unit']}\'")
-                file.write(f",  defVal = \'{bcVariables[param]['defVal']}\'")
-                file.write(f"}},\n")
-            file.write('  },\n')
-            file.write('\n')
+        file.write('  properties = {\n')
+        for param in self.parametersId:
+            file.write(f"    {{id = \'{param}\'")
+            file.write(f",  description = \'{bcVariables[param]['description']}\'")
+            file.write(f",  unit = \'{bcVariables[param]['unit']}\'")
+            file.write(f",  defVal = \'{bcVariables[param]['defVal']}\'")
+            file.write(f"}},\n")
+        file.write('  },\n')
+        file.write('\n')
 
-            file.write('  nodeValues = {\n')
-            for value, nodeSet in self.nodeSetId:
-                file.write('    {')
-                file.write('\'' + nodeSet + '\',')
-                for i in range(self.dim):
-                    file.write('  ' + str(value[i]) + ',')
-                file.write('},\n')
-            file.write('  }\n')
+        file.write('  nodeValues = {\n')
+        for value, nodeSet in self.nodeSetId:
+            file.write('    {')
+            file.write('\'' + nodeSet + '\',')
+            for i in range(self.dim):
+                file.write('  ' + str(value[i]) + ',')
+            file.write('},\n')
+        file.write('  }\n')
 
-            file.write('}\n')
-            file.write('\n')
+        file.write('}\n')
+        file.write('\n')
 
         
 
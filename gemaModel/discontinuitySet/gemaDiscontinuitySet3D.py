@@ -3,6 +3,17 @@ from gemaModel.discontinuitySet.gemaDiscontinuitySet import discontinuitySetGeMA
 class discontinuitySetGeMA3D(discontinuitySetGeMA):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.interfaceElements = []
 
-    def discontinuityData(self):
-        pass
\ No newline at end of file
+    def discontinuityData(self, mesh, physicalGroupTag):
+        """
+        Create the zero-thickness interface elements of the fault surfaces of a
+        physical group split by the Crack plugin and add them to the mesh.
+
+        Parameters:
+        - mesh:             gemaMesh with dimension 3
+        - physicalGroupTag: tag of the physical group of the fault surfaces
+        """
+        self.interfaceElements = mesh.createInterfaceElements(physicalGroupTag)
+        mesh.setDiscontinuitySet(self.interfaceElements, physicalGroupTag)
+        return self.interfaceElements
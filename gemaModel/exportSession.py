@@ -0,0 +1,40 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+# Default size (bytes) of the write buffer of the exported files
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+class exportSession:
+    """
+    Context manager that opens a GeMA file once and hands the same buffered
+    writer to every section writer, instead of reopening the file in append
+    mode for each section.
+
+    Parameters:
+    - _fileName:   name of the file to write
+    - _bufferSize: size (bytes) of the write buffer
+    - _mode:       mode used to open the file ('w' to overwrite, 'a' to append)
+
+    Usage:
+        with exportSession(fileName) as file:
+            file.write(...)
+    """
+
+    def __init__(self, _fileName, _bufferSize = DEFAULT_BUFFER_SIZE, _mode = 'w'):
+        self.fileName   = _fileName
+        self.bufferSize = _bufferSize
+        self.mode       = _mode
+        self.file       = None
+
+    def __enter__(self):
+        self.file = open(self.fileName, self.mode, buffering=self.bufferSize)
+        return self.file
+
+    def __exit__(self, excType, excValue, traceback):
+        self.file.close()
+        self.file = None
+        return False
@@ -20,4 +20,11 @@ gmsh2GeMA_elementTypes_NumberOfNodes = {
     9: 6,
     10: 9,
     16: 8,
-    17: 20,}
\ No newline at end of file
+    17: 20,}
+
+# GeMA type of the zero-thickness interface elements for each (dimension, number
+# of nodes). The types of the 3D and of the triple-node interface elements are
+# given by the user (see gemaMesh.setInterfaceElementType).
+gema_interfaceElementTypes = {
+    (2, 4): 'int2dl4',
+    (2, 6): 'int2dl6',}
@@ -0,0 +1,133 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+from ctypes import POINTER, byref, c_int, c_size_t
+from gemaModel.mesh.gmsh2GeMA_ElementTypes import gmsh2GeMA_elementTypes_NumberOfNodes
+
+def getNumberOfElementsByType(gmsh, elemType, tag = -1):
+    """
+    Get the number of elements of a given type classified on an entity.
+
+    The Python API of gmsh does not expose the preallocate helpers of the C API,
+    which only size the output vectors. Calling it asking only for the element
+    tags vector gives the number of elements without transferring the
+    connectivity.
+
+    Parameters:
+    - gmsh:     Gmsh data structure
+    - elemType: gmsh element type
+    - tag:      tag of the entity (-1 for all the entities)
+    """
+    elementTags, elementTags_n = POINTER(c_size_t)(), c_size_t()
+    nodeTags, nodeTags_n       = POINTER(c_size_t)(), c_size_t()
+    ierr = c_int()
+    gmsh.lib.gmshModelMeshPreallocateElementsByType(
+        c_int(elemType), c_int(1), c_int(0),
+        byref(elementTags), byref(elementTags_n),
+        byref(nodeTags), byref(nodeTags_n),
+        c_int(tag), byref(ierr))
+    gmsh.lib.gmshFree(elementTags)
+    gmsh.lib.gmshFree(nodeTags)
+    if ierr.value != 0:
+        raise Exception(gmsh.logger.getLastError())
+    return elementTags_n.value
+
+def getElementCounts(gmsh, elemType, dim, entitiesTags = None):
+    """
+    Get the number of elements of a given type classified on each entity of a
+    given dimension, in the order of gmsh.model.getEntities(dim).
+
+    When the entities are given (the entities of the cell physical groups),
+    only they are counted, with one call each. The other entities are counted
+    only when the total number of elements of the type shows that some of
+    them have elements of the type.
+
+    Parameters:
+    - gmsh:         Gmsh data structure
+    - elemType:     gmsh element type
+    - dim:          dimension of the element type
+    - entitiesTags: tags of the entities to count (None for all the entities)
+
+    Returns the tags of the entities and the number of elements of each one.
+    """
+    allTags = np.array([tag for _, tag in gmsh.model.getEntities(dim)], dtype=np.int64)
+    counted = np.ones(len(allTags), dtype=bool) if entitiesTags is None else np.isin(allTags, entitiesTags)
+    counts  = np.zeros(len(allTags), dtype=np.int64)
+    counts[counted] = [getNumberOfElementsByType(gmsh, elemType, tag) for tag in allTags[counted]]
+    if not counted.all() and counts.sum() != getNumberOfElementsByType(gmsh, elemType):
+        counts[~counted] = [getNumberOfElementsByType(gmsh, elemType, tag) for tag in allTags[~counted]]
+    return allTags, counts
+
+def getElementsByType(gmsh, elemType, dim, elementCounts = None):
+    """
+    Get all the elements of a given type, together with the tag of the entity
+    where each element is classified.
+
+    gmsh returns the elements of all the entities concatenated in the order of
+    gmsh.model.getEntities(dim), so the entity of each element follows from the
+    number of elements of each entity.
+
+    Parameters:
+    - gmsh:          Gmsh data structure
+    - elemType:      gmsh element type
+    - dim:           dimension of the element type
+    - elementCounts: (entities tags, counts) given by getElementCounts, if already known
+
+    Returns the element tags, the (nElem, nNodes) connectivity and the entity tag
+    of each element.
+    """
+    nNodes = gmsh2GeMA_elementTypes_NumberOfNodes[elemType]
+
+    if elementCounts is None:
+        elementCounts = getElementCounts(gmsh, elemType, dim)
+    entitiesTags, counts = elementCounts
+    elemEntities = np.repeat(entitiesTags, counts)
+
+    elemTags, elemNodes = gmsh.model.mesh.getElementsByType(elemType)
+    elemTags, elemNodes = np.asarray(elemTags), np.asarray(elemNodes).reshape((-1,nNodes))
+
+    return elemTags, elemNodes, elemEntities
+
+def getElementsByEntity(gmsh, elemType, entitiesTags):
+    """
+    Generator over the elements of a given type, one entity at a time, so that
+    only the block of one entity is held in memory.
+
+    Parameters:
+    - gmsh:         Gmsh data structure
+    - elemType:     gmsh element type
+    - entitiesTags: tags of the entities, in the order the blocks are wanted
+
+    Yields the element tags and the (nElem, nNodes) connectivity of each entity.
+    """
+    nNodes = gmsh2GeMA_elementTypes_NumberOfNodes[elemType]
+    for tag in entitiesTags:
+        elemTags, elemNodes = gmsh.model.mesh.getElementsByType(elemType, int(tag))
+        if len(elemTags) > 0:
+            yield np.asarray(elemTags), np.asarray(elemNodes).reshape((-1,nNodes))
+
+def selectEntities(elemEntities, entitiesTags):
+    """
+    Get the indices of the elements classified on the given entities, ordered as
+    the entities are listed and, within each entity, as gmsh returns them.
+
+    Parameters:
+    - elemEntities: entity tag of each element
+    - entitiesTags: tags of the entities to select
+    """
+    entitiesTags = np.asarray(entitiesTags, dtype=np.int64)
+    if len(entitiesTags) == 0 or len(elemEntities) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Position of each entity in the list (-1 if it is not selected)
+    position = np.full(max(elemEntities.max(), entitiesTags.max()) + 1, -1, dtype=np.int64)
+    position[entitiesTags] = np.arange(len(entitiesTags))
+
+    elemPosition = position[elemEntities]
+    selected     = np.flatnonzero(elemPosition >= 0)
+    return selected[np.argsort(elemPosition[selected], kind='stable')]
@@ -0,0 +1,166 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+
+def getCurvesSegments(gmsh, curvesTags):
+    """
+    Get the (nSegments, nNodes) node tags of the line elements of a list of
+    curves, in the order the curves are given: the two corners followed by
+    the mid-side node of quadratic segments.
+    """
+    segments = []
+    for tag in curvesTags:
+        elemTypes, _, nodeTags = gmsh.model.mesh.getElements(1, tag)
+        for elemType, nodes in zip(elemTypes, nodeTags):
+            nNodes = gmsh.model.mesh.getElementProperties(elemType)[3]
+            segments.append(np.asarray(nodes, dtype=np.int64).reshape((-1,nNodes)))
+    if len(segments) == 0:
+        return np.empty((0,2), dtype=np.int64)
+    if len(set(segment.shape[1] for segment in segments)) > 1:
+        raise Exception("Discontinuities with both linear and quadratic segments are not supported")
+    return np.concatenate(segments)
+
+def getSurfacesFaces(gmsh, surfacesTags):
+    """
+    Get the (nFaces, nCorners) node tags of the triangles or quadrangles of a
+    list of surfaces, in the order the surfaces are given.
+    """
+    faces = []
+    for tag in surfacesTags:
+        elemTypes, _, nodeTags = gmsh.model.mesh.getElements(2, tag)
+        for elemType, nodes in zip(elemTypes, nodeTags):
+            _, _, _, nNodes, _, nCorners = gmsh.model.mesh.getElementProperties(elemType)
+            faces.append(np.asarray(nodes, dtype=np.int64).reshape((-1,nNodes))[:, :nCorners])
+    if len(faces) == 0:
+        return np.empty((0,3), dtype=np.int64)
+    if len(set(face.shape[1] for face in faces)) > 1:
+        raise Exception("Discontinuities with both triangular and quadrilateral faces are not supported")
+    return np.concatenate(faces)
+
+def findAdjacentSides(topology, kind, sides1, sides2):
+    """
+    Find the two element sides adjacent to each side of a discontinuity split
+    by the Crack plugin: the element side equal to the side on side 1 and the
+    one equal to its duplicate on side 2 (or both element sides of a side that
+    was not split).
+
+    Parameters:
+    - topology: MeshTopology of the continuum elements
+    - kind:     'edges' or 'faces'
+    - sides1:   node tags of the sides of the discontinuity on side 1
+    - sides2:   node tags of the sides of the discontinuity on side 2
+
+    Returns the (nValid, 2) incidences (see MeshTopology.getElementSides) on
+    side 1 and side 2. If a side does not have exactly two adjacent elements,
+    only the sides before it are returned.
+    """
+    pointer, incidences = topology.getSideElements(kind)
+
+    # Number of element sides equal to each side of the discontinuity
+    side1, side2 = topology.findSides(kind, sides1), topology.findSides(kind, sides2)
+    count1 = np.where(side1 >= 0, pointer[side1 + 1] - pointer[side1], 0)
+    count2 = np.where(side2 >= 0, pointer[side2 + 1] - pointer[side2], 0)
+    count2[side1 == side2] = 0
+
+    # Sides without exactly two adjacent elements
+    invalid = np.flatnonzero(count1 + count2 != 2)
+    nValid  = invalid[0] if len(invalid) > 0 else len(sides1)
+    if nValid < len(sides1):
+        print("Inappropriate number of adjancent elements")
+    first1, count1, first2 = pointer[side1[:nValid]], count1[:nValid], pointer[side2[:nValid]]
+
+    # Position in the side-to-incidence CSR of the two element sides
+    adjacent      = np.empty((nValid,2), dtype=np.int64)
+    adjacent[:,0] = np.where(count1 > 0, first1, first2)
+    adjacent[:,1] = np.where(count1 == 2, first1 + 1, np.where(count1 == 1, first2, first2 + 1))
+    return incidences[adjacent]
+
+def buildInterfaceElements(topology, segments1, segments2):
+    """
+    Build the connectivity of the 2D double-node interface elements of a
+    discontinuity. Both sides of every segment of the discontinuity are looked
+    up in the edge table of the mesh topology in one pass.
+
+    With {a0, a1} the edge of the element on side 1 and {b0, b1} the edge of
+    the element on side 2, both oriented as in their elements, the interface
+    element is {b1, b0, a1, a0}, which is always counterclockwise. In
+    quadratic meshes the mid-side nodes of the edges, taken from the same
+    edge incidences, follow: {b1, b0, a1, a0, bm, am} (int2dl6).
+
+    Parameters:
+    - topology:  MeshTopology of the continuum elements
+    - segments1: (nSegments, 2 or 3) node tags of the segments on side 1
+    - segments2: (nSegments, 2 or 3) node tags of the segments on side 2
+
+    Returns the (nInterface, 4) or (nInterface, 6) connectivity of the
+    interface elements.
+    """
+    edgeNodes, _, _ = topology.getElementSides('edges')
+    adjacent        = findAdjacentSides(topology, 'edges', segments1[:, :2], segments2[:, :2])
+
+    # Edges of the elements on side 1 and side 2, concatenated and reversed
+    interfaceElements = np.hstack((edgeNodes[adjacent[:,0]], edgeNodes[adjacent[:,1]]))[:, ::-1]
+
+    # Mid-side nodes of the edges of quadratic elements
+    midNodes = topology.getEdgeMidNodes()[adjacent]
+    if len(midNodes) > 0 and np.all(midNodes >= 0):
+        interfaceElements = np.hstack((interfaceElements, midNodes[:, ::-1]))
+    return interfaceElements
+
+def buildInterfaceElements3D(topology, faces1, faces2):
+    """
+    Build the connectivity of the 3D double-node interface elements of a
+    discontinuity surface. Both sides of every face of the discontinuity are
+    looked up in the face table of the mesh topology in one pass.
+
+    The bottom face of the interface element is the face of the element on
+    side 1, oriented outwards from it (towards side 2). The top face has the
+    duplicates of the bottom nodes in the same order, so node i + nCorners
+    lies over node i. Nodes on the border of the discontinuity are not
+    duplicated and appear in both faces.
+
+    Parameters:
+    - topology: MeshTopology of the continuum elements
+    - faces1:   (nFaces, nCorners) node tags of the faces on side 1
+    - faces2:   (nFaces, nCorners) node tags of the faces on side 2, node by
+                node duplicates of faces1
+
+    Returns the (nInterface, 2*nCorners) connectivity of the interface elements.
+    """
+    faceNodes, _, _ = topology.getElementSides('faces')
+    adjacent        = findAdjacentSides(topology, 'faces', faces1, faces2)
+    nCorners        = faces1.shape[1]
+
+    # Duplicate of each node of the discontinuity
+    duplicate = np.arange(max(faces1.max(initial=0), faces2.max(initial=0)) + 1)
+    duplicate[faces1.ravel()] = faces2.ravel()
+
+    bottom = faceNodes[adjacent[:,0], :nCorners]
+    return np.hstack((bottom, duplicate[bottom]))
+
+def createMidPlaneNodes(interfaceElements, positionNodes, firstNewTag):
+    """
+    Add the mid-plane nodes of triple-node (hydro-mechanical) interface
+    elements: one node for each distinct position of the discontinuity, shared
+    by all the interface elements that meet there.
+
+    Parameters:
+    - interfaceElements: (nInterface, 2*nCorners) connectivity of the double-node interface elements
+    - positionNodes:     (nInterface, nCorners) tag of a node at the position of each node of the
+                         first face of the interface elements, the same for all the elements that
+                         share the position (the original node of the discontinuity)
+    - firstNewTag:       tag of the first mid-plane node
+
+    Returns the (nInterface, 3*nCorners) connectivity of the triple-node interface elements, with
+    the mid-plane nodes in the order of the first face, and the (nMidPlane, 2) tags of the node at
+    the position of each mid-plane node and of the mid-plane node.
+    """
+    positions, inverse = np.unique(positionNodes, return_inverse=True)
+    midPlaneTags = firstNewTag + np.arange(len(positions))
+    tripleNode   = np.hstack((interfaceElements, midPlaneTags[inverse.reshape(np.shape(positionNodes))]))
+    return tripleNode, np.stack((positions, midPlaneTags), axis=1)
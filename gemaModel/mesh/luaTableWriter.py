@@ -0,0 +1,298 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+
+# Number of rows formatted and written at once
+DEFAULT_BLOCK_ROWS = 16384
+
+# Shortest run of consecutive ids written as a {first, last} range
+MIN_RANGE_LENGTH = 3
+
+# Lua function that expands the {first, last} ranges of a list of ids
+EXPAND_RANGES_FUNCTION = """
+-- Expand the {first, last} ranges of consecutive ids of a list
+
+local function expandRanges(list)
+    local expanded = {}
+    for _, item in ipairs(list) do
+        if type(item) == 'table' then
+            for id = item[1], item[2] do
+                expanded[#expanded + 1] = id
+            end
+        else
+            expanded[#expanded + 1] = item
+        end
+    end
+    return expanded
+end
+"""
+
+# Lua function that rebuilds the rows of a flat table of values
+UNFLATTEN_FUNCTION = """
+-- Rebuild the rows of a flat table with a given number of values per row
+
+local unpack = table.unpack or unpack
+
+local function unflatten(flat, stride)
+    local rows = {}
+    for i = 1, #flat, stride do
+        rows[#rows + 1] = { unpack(flat, i, i + stride - 1) }
+    end
+    return rows
+end
+"""
+
+# Lua function that loads the rows of a table written in shard files, found
+# in the folder of the file that calls it
+LOAD_SHARDS_FUNCTION = """
+-- Load the rows of a table written in shard files next to this file
+
+local shardFolder = debug.getinfo(1, 'S').source:match('^@(.*[/\\\\])') or ''
+
+local function loadShards(shardFiles)
+    local rows = {}
+    local n = 0
+    for _, shardFile in ipairs(shardFiles) do
+        local shard = dofile(shardFolder .. shardFile)
+        for i = 1, #shard do
+            rows[n + i] = shard[i]
+        end
+        n = n + #shard
+    end
+    return rows
+end
+"""
+
+# Start and end of each shard file: a Lua chunk that returns its rows
+SHARD_HEADER = "return {\n"
+SHARD_FOOTER = "}\n"
+
+# Approximate memory (bytes) taken by each value while a block is formatted:
+# the Python object, its reference in the argument tuple and its text
+BYTES_PER_FORMATTED_VALUE = 64
+
+def blockRowsForBudget(memoryBudget, valuesPerRow):
+    """
+    Number of rows of a block so that formatting it stays within a memory budget
+
+    Parameters:
+    - memoryBudget: memory (bytes) available to format a block
+    - valuesPerRow: number of values formatted in each row
+    """
+    return max(1, int(memoryBudget // (BYTES_PER_FORMATTED_VALUE * valuesPerRow)))
+
+class luaTable:
+    """
+    Context manager that writes the constructor of a local Lua table of the
+    mesh file. It gives the file where the rows of the table are written.
+
+    Without a shard size the rows are written in the mesh file itself. With a
+    shard size the rows are spread over numbered shard files of at most that
+    size (unless a single block of rows is larger), each one a Lua chunk that
+    returns its rows, and the mesh file loads them with LOAD_SHARDS_FUNCTION.
+    The shards are written next to the mesh file, named after it and the
+    table. The rows must be written in whole blocks (see writeRows).
+
+    Parameters:
+    - _file:       opened mesh file
+    - _tableName:  name of the local Lua table
+    - _shardSize:  maximum size (bytes) of each shard file (None to not shard)
+    - _bufferSize: size (bytes) of the write buffer of the shard files
+
+    Usage:
+        with luaTable(file, 'nodes', shardSize) as rows:
+            writeNodeRows(rows, nodeCoords, dim)
+    """
+
+    def __init__(self, _file, _tableName, _shardSize = None, _bufferSize = 1 << 20):
+        self.file       = _file
+        self.tableName  = _tableName
+        self.shardSize  = _shardSize
+        self.bufferSize = _bufferSize
+        self.shardFiles = []
+        self.shard      = None
+        self.size       = 0
+
+        # Shards are named after the mesh file (either separator may be used)
+        separator   = max(self.file.name.rfind('/'), self.file.name.rfind('\\'))
+        self.folder = self.file.name[:separator + 1]
+        self.prefix = self.file.name[separator + 1:].removesuffix('.lua') + '_' + self.tableName
+
+    def __enter__(self):
+        if self.shardSize is None:
+            self.file.write(f"local {self.tableName} = {{\n")
+            return self.file
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if self.shardSize is None:
+            self.file.write("}\n")
+            return False
+        self.closeShard()
+        shardFiles = ", ".join(f"'{shardFile}'" for shardFile in self.shardFiles)
+        self.file.write(f"local {self.tableName} = loadShards({{ {shardFiles} }})\n")
+        return False
+
+    def write(self, text):
+        if self.shard is not None and self.size + len(text) + len(SHARD_FOOTER) > self.shardSize:
+            self.closeShard()
+        if self.shard is None:
+            self.shardFiles.append(f"{self.prefix}_{len(self.shardFiles) + 1:03d}.lua")
+            self.shard = open(self.folder + self.shardFiles[-1], 'w', buffering=self.bufferSize)
+            self.shard.write(SHARD_HEADER)
+            self.size = len(SHARD_HEADER)
+        self.shard.write(text)
+        self.size += len(text)
+
+    def closeShard(self):
+        if self.shard is not None:
+            self.shard.write(SHARD_FOOTER)
+            self.shard.close()
+            self.shard = None
+
+def nodeRowFormat(dim):
+    """
+    Format of a row of the Lua table of nodes: { x, y[, z] }, -- i
+    """
+    coords = ", ".join(["%.8e"] * dim)
+    return "    { " + coords + " }, -- %d\n"
+
+def connectivityRowFormat(nNodes):
+    """
+    Format of a row of a Lua table of element connectivities: {n1, n2, ...},
+    """
+    return "    {" + ", ".join(["%d"] * nNodes) + "},\n"
+
+def nodeListRowFormat():
+    """
+    Format of a row of a Lua list of node tags: n,
+    """
+    return "     %d,\n"
+
+def flatRowFormat(valueFormat, stride):
+    """
+    Format of a row of a flat Lua table, without braces nor comments:
+    v1, v2, ..., v<stride>,
+
+    Parameters:
+    - valueFormat: printf-like format of each value ("%.8e", "%d")
+    - stride:      number of values of each row
+    """
+    return "    " + ", ".join([valueFormat] * stride) + ",\n"
+
+def rangeRowFormat():
+    """
+    Format of a range of consecutive ids of a Lua list: { first, last },
+    """
+    return "     { %d, %d },\n"
+
+def interfaceRowFormat(nNodes):
+    """
+    Format of a row of a Lua table of interface elements: { n1, n2, ... }, -- i
+    """
+    return "    { " + ", ".join(["%d"] * nNodes) + " }, -- %d\n"
+
+def formatBlock(rowFormat, block, firstIndex = None):
+    """
+    Format a block of rows with a single string operation.
+
+    Parameters:
+    - rowFormat:  format of a single row
+    - block:      2D numpy array with the values of each row
+    - firstIndex: number of the first row, appended as the last column of each
+                  row (None to not number the rows)
+    """
+    if firstIndex is not None:
+        numbered = np.empty((block.shape[0], block.shape[1] + 1))
+        numbered[:, :-1] = block
+        numbered[:, -1]  = np.arange(firstIndex, firstIndex + block.shape[0])
+        block = numbered
+    return (rowFormat * block.shape[0]) % tuple(block.ravel().tolist())
+
+def writeRows(file, rowFormat, data, blockRows = DEFAULT_BLOCK_ROWS, firstIndex = None):
+    """
+    Write the rows of a 2D array using a printf-like row format, like np.savetxt,
+    but formatting blocks of rows with a single string operation.
+
+    Parameters:
+    - file:       opened text file
+    - rowFormat:  format of a single row, with one field per column of data
+    - data:       2D numpy array with the values of each row
+    - blockRows:  number of rows formatted and written at once
+    - firstIndex: number of the first row, appended as the last column of each
+                  row (None to not number the rows)
+    """
+    for start in range(0, data.shape[0], blockRows):
+        index = None if firstIndex is None else firstIndex + start
+        file.write(formatBlock(rowFormat, data[start:start + blockRows], index))
+
+def writeNodeRows(file, nodeCoords, dim, blockRows = DEFAULT_BLOCK_ROWS):
+    """
+    Write the rows of the Lua table of nodes, numbered from 1.
+
+    Parameters:
+    - file:       opened text file
+    - nodeCoords: (nNodes, 3) numpy array with the node coordinates
+    - dim:        number of coordinates written for each node
+    - blockRows:  number of rows formatted and written at once
+    """
+    writeRows(file, nodeRowFormat(dim), nodeCoords[:, :dim], blockRows, 1)
+
+def listRanges(values, minLength = MIN_RANGE_LENGTH):
+    """
+    Split a sorted list of ids in runs of consecutive values. Runs shorter
+    than minLength are split in single values.
+
+    Parameters:
+    - values:    1D array of ids
+    - minLength: shortest run kept as a range
+
+    Returns the first and last id of each item of the list (equal for single
+    values).
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return values, values
+
+    # Runs of consecutive values
+    breaks = np.flatnonzero(np.diff(values) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    ends   = np.concatenate((breaks, [len(values)]))
+    isRange = ends - starts >= minLength
+
+    # One item per range and one per value of the short runs
+    items   = np.where(isRange, 1, ends - starts)
+    run     = np.repeat(np.arange(len(starts)), items)
+    offset  = np.arange(items.sum()) - np.repeat(np.cumsum(items) - items, items)
+    first   = values[starts[run] + offset]
+    last    = np.where(isRange[run], values[ends[run] - 1], first)
+    return first, last
+
+def formatRangeBlock(first, last):
+    """
+    Format a block of items of a Lua list of ids, the ranges as { first, last }
+    and the single values as in nodeListRowFormat
+    """
+    isRange   = first != last
+    rowFormat = "".join(np.where(isRange, rangeRowFormat(), nodeListRowFormat()).tolist())
+    values    = np.stack((first, last), axis=1)[np.stack((np.ones_like(isRange), isRange), axis=1)]
+    return rowFormat % tuple(values.tolist())
+
+def writeRangeRows(file, values, blockRows = DEFAULT_BLOCK_ROWS):
+    """
+    Write a sorted list of ids with its runs of consecutive values as
+    { first, last } ranges, to be expanded by EXPAND_RANGES_FUNCTION.
+
+    Parameters:
+    - file:      opened text file
+    - values:    1D array of ids
+    - blockRows: number of items formatted and written at once
+    """
+    first, last = listRanges(values)
+    for start in range(0, len(first), blockRows):
+        file.write(formatRangeBlock(first[start:start + blockRows], last[start:start + blockRows]))
@@ -8,6 +8,22 @@
 import numpy as np
 from gemaModel.mesh.gmsh2GeMA_ElementTypes import gmsh2GeMA_elementTypes
 from gemaModel.mesh.gmsh2GeMA_ElementTypes import gmsh2GeMA_elementTypes_NumberOfNodes
+from gemaModel.mesh.gmsh2GeMA_ElementTypes import gema_interfaceElementTypes
+from gemaModel.mesh.meshSnapshot import MeshSnapshot
+from gemaModel.mesh.meshTopology import MeshTopology
+from gemaModel.mesh.gmshExtraction import getElementsByType
+from gemaModel.mesh.nodeDuplication import splitNodes
+from gemaModel.mesh.nodeRenumbering import nodeAdjacency, bandwidthAndProfile, computeNodeOrder, renumberingMethods
+from gemaModel.mesh.interfaceElements import getCurvesSegments, getSurfacesFaces, buildInterfaceElements, buildInterfaceElements3D, createMidPlaneNodes
+from gemaModel.mesh.luaTableWriter import writeNodeRows, writeRows, connectivityRowFormat, interfaceRowFormat, nodeListRowFormat, blockRowsForBudget, \
+    writeRangeRows, flatRowFormat, luaTable, EXPAND_RANGES_FUNCTION, UNFLATTEN_FUNCTION, LOAD_SHARDS_FUNCTION
+from gemaModel.exportSession import exportSession, DEFAULT_BUFFER_SIZE
+
+# Default memory (bytes) used to format each block of rows of the mesh file
+DEFAULT_MEMORY_BUDGET = 64 << 20
+
+# Default estimated size (bytes) of the mesh file above which the elements are streamed
+DEFAULT_STREAMING_THRESHOLD = 1 << 30
 
 class gemaMesh:
     def __init__(self, _problemName, _dim = 2, gmsh = [] , _stateVariables = [],_nodeData = [], _cellData = [], _cellProperties = [], _nodeSetData = []):
@@ -32,6 +48,22 @@ class gemaMesh:
         self.cellGroups                     = []
         self.elementTypes                   = []
         self.integrationRules               = []
+        self.snapshot                       = None
+        self.snapshotState                  = None
+        self.topology                       = None
+        self.nodeSplit                      = None
+        self.copiedNodes                    = []
+        self.tripleNode                     = False
+        self.bufferSize                     = DEFAULT_BUFFER_SIZE
+        self.memoryBudget                   = DEFAULT_MEMORY_BUDGET
+        self.streamingThreshold             = DEFAULT_STREAMING_THRESHOLD
+        self.compactLists                   = False
+        self.flatTables                     = False
+        self.shardSize                      = None
+        self.renumbering                    = 'none'
+        self.renumberingReport              = None
+        self.interfaceElementTypes          = {(dim, numNodes, False): gemaType for (dim, numNodes), gemaType in gema_interfaceElementTypes.items()}
+        self.tripleNodeElements             = False
         self.fileName                       = 'gemaFiles\\' + _problemName + '_mesh.lua'
 
     # ---------------------------------------------------------------------
@@ -41,21 +73,25 @@ class gemaMesh:
     # ---------------------------------------------------------------------
     def setNodesPhysicalGroup(self, _nodesPhysicalGroup):
         self.nodesPhysicalGroup = _nodesPhysicalGroup
+        self.snapshot           = None
 
     # ---------------------------------------------------------------------
     def setCellPhysicalGroup(self, _cellData):
         self.cellPhysicalGroups = _cellData
+        self.snapshot           = None
             
 
     # ---------------------------------------------------------------------
     def setNodeSetData(self, _nodeSetData):
         self.nodeSetData = _nodeSetData
+        self.snapshot    = None
 
     # --------------------------------------------------------------------- 
     def setDiscontinuitySet(self, _discontinuitySet,_discontinuitySetPhysicalGroup):
         self.discontinuitySet              = _discontinuitySet
         self.discontinuitySetPhysicalGroup = _discontinuitySetPhysicalGroup
         self.hasDiscontinuitySet           = True
+        self.snapshot                      = None
 
     # ---------------------------------------------------------------------
     def setDescription(self, _description):
@@ -77,291 +113,441 @@ class gemaMesh:
     def setId(self, _id):
         self.id = _id
 
+    # ---------------------------------------------------------------------
+    def setBufferSize(self, _bufferSize):
+        self.bufferSize = _bufferSize
+
+    # ---------------------------------------------------------------------
+    # Memory (bytes) used to format each block of rows of the mesh file
+    def setMemoryBudget(self, _memoryBudget):
+        self.memoryBudget = _memoryBudget
+
+    # ---------------------------------------------------------------------
+    # Estimated size (bytes) of the mesh file above which the elements are
+    # streamed from gmsh entity by entity (0 to always stream, None to never)
+    def setStreamingThreshold(self, _streamingThreshold):
+        self.streamingThreshold = _streamingThreshold
+        self.snapshot           = None
+
+    # ---------------------------------------------------------------------
+    # Write the runs of consecutive ids of the node lists as {first, last}
+    # ranges, expanded by a Lua function when the mesh file is loaded
+    def setCompactLists(self, _compactLists):
+        self.compactLists = _compactLists
+
+    # ---------------------------------------------------------------------
+    # Write the nodes and the connectivities as flat tables of numbers, without
+    # comments. A Lua function rebuilds the rows when the mesh file is loaded.
+    def setFlatTables(self, _flatTables):
+        self.flatTables = _flatTables
+
+    # ---------------------------------------------------------------------
+    # Maximum size (bytes) of the shard files where the nodes, each element
+    # block and each node list are written (None to write a single file). The
+    # mesh file loads the shards, so the model file still loads only it.
+    def setShardSize(self, _shardSize):
+        self.shardSize = _shardSize
+
+    # ---------------------------------------------------------------------
+    # Ordering of the table of nodes of the mesh file: 'none' (order of the
+    # nodes physical group), 'RCMK' (reverse Cuthill-McKee), 'Hilbert' or
+    # 'Morton' (space-filling curves). The bandwidth and the profile of the
+    # matrix of the mesh before and after are kept in renumberingReport. The
+    # gmsh model is not renumbered.
+    def setRenumbering(self, _renumbering):
+        if _renumbering not in renumberingMethods:
+            raise Exception(f"Unknown node renumbering method {_renumbering}: use one of {renumberingMethods}")
+        self.renumbering = _renumbering
+        self.snapshot    = None
+
+    # ---------------------------------------------------------------------
+    # Number of rows formatted at once: within the memory budget and, when
+    # sharding, small enough to fill the shards evenly
+    def blockRows(self, valuesPerRow):
+        if self.shardSize is None:
+            return blockRowsForBudget(self.memoryBudget, valuesPerRow)
+        return blockRowsForBudget(min(self.memoryBudget, self.shardSize), valuesPerRow)
+
     # ---------------------------------------------------------------------   
     def getElementTypes(self):
+        return self.getSnapshot().elementTypes
+
+    # ---------------------------------------------------------------------
+    # Read the gmsh model once and keep it for all the writers
+    def takeSnapshot(self):
+        self.snapshotState = self.getMeshState()
+        self.snapshot = MeshSnapshot(self.gmsh, self.dim, self.nodesPhysicalGroup, self.cellPhysicalGroups, self.nodeSetData, self.discontinuitySetPhysicalGroup, self.streamingThreshold, self.nodeSplit, self.getCopiedNodes())
+        if self.renumbering != 'none':
+            self.renumberNodes()
+        return self.snapshot
+
+    # ---------------------------------------------------------------------
+    # Reorder the table of nodes of the snapshot with the renumbering method,
+    # from the adjacency of the elements written (with the nodes duplicated)
+    def renumberNodes(self):
+        adjacency = nodeAdjacency(self.iterateCouplingElements(), self.snapshot.nodeTags)
+        order     = computeNodeOrder(self.renumbering, adjacency, self.snapshot.nodeCoords[:, :self.dim])
+        position  = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        before    = bandwidthAndProfile(adjacency, np.arange(len(order)))
+        after     = bandwidthAndProfile(adjacency, position)
+        self.snapshot.reorderNodes(order)
+        self.renumberingReport = {'method': self.renumbering, 'bandwidth': (before[0], after[0]), 'profile': (before[1], after[1])}
 
-        elemTypes = []
+    # ---------------------------------------------------------------------
+    # Connectivity of the exported elements, one chunk at a time (see
+    # MeshSnapshot.getConnectivityChunks), then the interface elements
+    def iterateCouplingElements(self):
         for physicalGroupTag in self.cellPhysicalGroups:
+            for elemType in self.snapshot.cellGroupTypes[physicalGroupTag]:
+                nNodes = gmsh2GeMA_elementTypes_NumberOfNodes[elemType]
+                yield from self.snapshot.getConnectivityChunks(physicalGroupTag, elemType, self.blockRows(nNodes))
+        if self.hasDiscontinuitySet:
+            yield self.discontinuitySet
 
-            # Get the entities tags associated with this physical group
-            entitiesTags = self.gmsh.model.getEntitiesForPhysicalGroup(self.dim,physicalGroupTag)
+    # ---------------------------------------------------------------------
+    # Snapshot of the mesh, taken again only when the settings it depends on,
+    # the discontinuities or the gmsh mesh changed since it was taken
+    def getSnapshot(self):
+        if self.snapshot is None or self.snapshotState != self.getMeshState():
+            self.takeSnapshot()
+        return self.snapshot
 
-            # Get the element types present in the physical group with the specified dimension
-            for entityTag in entitiesTags:
-                entityElemTypes = self.gmsh.model.mesh.getElementTypes(self.dim, entityTag)
-                elemTypes.extend(entityElemTypes)
-        return list(set(elemTypes))
+    # ---------------------------------------------------------------------
+    # Current gmsh model and its largest node and element tags, which change
+    # when the mesh is generated again
+    def getMeshState(self):
+        return (self.gmsh.model.getCurrent(), int(self.gmsh.model.mesh.getMaxNodeTag()), int(self.gmsh.model.mesh.getMaxElementTag()))
+
+    # ---------------------------------------------------------------------
+    # Nodes created for the discontinuities: (tag of the node copied, new tag)
+    def getCopiedNodes(self):
+        if len(self.copiedNodes) == 0:
+            return None
+        copiedNodes = np.concatenate(self.copiedNodes)
+        return copiedNodes[np.argsort(copiedNodes[:,1])]
+
+    # ---------------------------------------------------------------------
+    # Tag of the next node created for the discontinuities (getMaxNodeTag is
+    # not updated by renumberNodes)
+    def getNextNodeTag(self):
+        nextTag = int(np.max(self.gmsh.model.mesh.getNodes()[0], initial=0)) + 1
+        for copiedNodes in self.copiedNodes:
+            nextTag = max(nextTag, int(np.max(copiedNodes[:,1], initial=0)) + 1)
+        return nextTag
+
+    # ---------------------------------------------------------------------
+    # Build the topology of the elements of the mesh as it is now in gmsh
+    def takeTopology(self):
+        blocks, elementTags = [], []
+        for elemType in self.gmsh.model.mesh.getElementTypes(self.dim):
+            elemTags, elemNodes, _ = getElementsByType(self.gmsh, elemType, self.dim)
+            blocks.append((elemType, elemNodes))
+            elementTags.append(elemTags)
+        self.topology = MeshTopology(blocks, np.concatenate(elementTags + [np.empty(0, dtype=np.uint64)]))
+        return self.topology
+
+    # ---------------------------------------------------------------------
+    def getTopology(self):
+        if self.topology is None:
+            self.takeTopology()
+        return self.topology
 
     # ---------------------------------------------------------------------
     def writeMeshFile(self):
-        self.openMeshFile()
-        self.printNodes(self.nodesPhysicalGroup)
-        self.printElements()
         if self.hasDiscontinuitySet:
-            self.printInterfaceElements(self.discontinuitySet,self.discontinuitySetPhysicalGroup)
-        self.printNodeSetDataList()
-        self.closeMeshFile()
+            self.getInterfaceElementType()
+        self.getSnapshot()
+        with exportSession(self.fileName, self.bufferSize) as file:
+            self.openMeshFile(file)
+            self.printNodes(file)
+            self.printElements(file)
+            if self.hasDiscontinuitySet:
+                self.printInterfaceElements(file,self.discontinuitySet,self.discontinuitySetPhysicalGroup)
+            self.printNodeSetDataList(file)
+            self.closeMeshFile(file)
 
     # ---------------------------------------------------------------------
     # Open the file the mesh file
-    def openMeshFile(self):
+    def openMeshFile(self, file):
         
-        with open(self.fileName, 'w') as file:
-            # Write the header
-            file.write("-------------------------------------------------------------\n")
-            file.write("-- Mesh definition\n")
-            file.write("-------------------------------------------------------------\n")
-            
-            # Initialize the Lua table with the mesh data
-            file.write("\n-- Initialize the mesh data table\n")
-            file.write("\nlocal meshData = {}\n")
+        # Write the header
+        file.write("-------------------------------------------------------------\n")
+        file.write("-- Mesh definition\n")
+        file.write("-------------------------------------------------------------\n")
+        
+        # Initialize the Lua table with the mesh data
+        file.write("\n-- Initialize the mesh data table\n")
+        file.write("\nlocal meshData = {}\n")
+
+        # Function that expands the ranges of the compact lists
+        if self.compactLists:
+            file.write(EXPAND_RANGES_FUNCTION)
+
+        # Function that rebuilds the rows of the flat tables
+        if self.flatTables:
+            file.write(UNFLATTEN_FUNCTION)
+
+        # Function that loads the tables written in shard files
+        if self.shardSize is not None:
+            file.write(LOAD_SHARDS_FUNCTION)
 
     # ---------------------------------------------------------------------
     # Close the file the mesh file
-    def closeMeshFile(self):
+    def closeMeshFile(self, file):
         
-        with open(self.fileName, 'a') as file:
-            file.write("\nreturn meshData")
+        file.write("\nreturn meshData")
+
+    # ---------------------------------------------------------------------
+    # Lua expression of the rows of a table written by the mesh file
+    def tableRows(self, tableName, stride):
+        if self.flatTables:
+            return f"unflatten({tableName}, {stride})"
+        return tableName
 
     # ---------------------------------------------------------------------
     # Print nodes associated with a physical group   
-    def printNodes(self,physicalGroupTag):
+    def printNodes(self, file):
         """
-        Print the nodes of the mesh that belongs to the given physical group
+        Print the nodes of the mesh that belongs to the nodes physical group
 
         Parameters:
-        - physicalGroupTag: tag of the physical group which you desire to print the nodes
-
+        - file: opened mesh file
         """
         
-        with open(self.fileName, 'a') as file:
-            file.write("\n")
-            file.write("-- Nodes coordinates\n")
-            file.write("\n")
-            file.write("local nodes = {\n")
-
-            _, nodeCoords = self.gmsh.model.mesh.getNodesForPhysicalGroup(self.dim, physicalGroupTag)
+        file.write("\n")
+        file.write("-- Nodes coordinates\n")
+        file.write("\n")
 
-            # Reshape the node coordinates into a matrix
-            nodeCoords = nodeCoords.reshape((-1,3))
+        # Write the node coordinates in blocks of rows
+        with luaTable(file, 'nodes', self.shardSize, self.bufferSize) as rows:
+            if self.flatTables:
+                writeRows(rows, flatRowFormat("%.8e", self.dim), self.snapshot.nodeCoords[:, :self.dim], self.blockRows(self.dim))
+            else:
+                writeNodeRows(rows, self.snapshot.nodeCoords, self.dim, self.blockRows(self.dim + 1))
 
-            # Iterate over each row of nodeCoords
-            for i, coord in enumerate(nodeCoords, start=1):
-                if self.dim == 2:
-                    file.write(f"    {{ {coord[0]:.8e}, {coord[1]:.8e} }}, -- {i}\n")
-                elif self.dim == 3:
-                    file.write(f"    {{ {coord[0]:.8e}, {coord[1]:.8e}, {coord[2]:.8e} }}, -- {i}\n")
-
-            file.write("}\n")
-
-            # Add the nodes to the meshData
-            file.write("\nmeshData['nodes'] = nodes\n")
+        # Add the nodes to the meshData
+        file.write(f"\nmeshData['nodes'] = {self.tableRows('nodes', self.dim)}\n")
 
     # ---------------------------------------------------------------------
     # Print elements associated with a physical group with specified element type
-    def printElements(self):
+    def printElements(self, file):
         """
         Print the elements of the mesh that belongs to the given physical group
+
+        Parameters:
+        - file: opened mesh file
         """
 
         for physicalGroupTag in self.cellPhysicalGroups:
 
             # Get the name of the physical group
-            physicalGroupName = self.gmsh.model.getPhysicalName(self.dim, physicalGroupTag)
-
-            # Get the entities tags associated with this physical group
-            entitiesTags = self.gmsh.model.getEntitiesForPhysicalGroup(self.dim,physicalGroupTag)
-
-            # Get the element types present in the physical group with the specified dimension
-            elemTypes = []
-            for entityTag in entitiesTags:
-                entityElemTypes = self.gmsh.model.mesh.getElementTypes(self.dim, entityTag)
-                elemTypes.extend(entityElemTypes)
-            elemTypes = list(set(elemTypes))
+            physicalGroupName = self.snapshot.getPhysicalName(self.dim, physicalGroupTag)
 
             # Print the elements of the specified element type 
-            with open(self.fileName, 'a') as file:
-                for elemType in elemTypes:
-                    gemaElement = gmsh2GeMA_elementTypes[elemType]
-                    nNodes = gmsh2GeMA_elementTypes_NumberOfNodes[elemType]
-                    file.write("\n")
-                    file.write(f"-- Mesh {gemaElement} elements of {physicalGroupName}\n")
-                    file.write("\n")
-                    file.write(f"local {gemaElement}_{physicalGroupName} = {{\n")
-                    for e in entitiesTags:
-                        _, elem = self.gmsh.model.mesh.getElementsByType(elemType, e)
-                        elem = elem.reshape((-1,nNodes))
-                        for i, connectivity in enumerate(elem, start=1):
-                            file.write("    {")
-                            file.write(", ".join(str(node) for node in connectivity))
-                            file.write("},\n")
-                    file.write("}\n")
-                    # Add the elements to the meshData
-                    file.write(f"\nmeshData['{gemaElement}_{physicalGroupName}'] = {gemaElement}_{physicalGroupName}\n")
+            for elemType in self.snapshot.cellGroupTypes[physicalGroupTag]:
+                gemaElement = gmsh2GeMA_elementTypes[elemType]
+                nNodes = gmsh2GeMA_elementTypes_NumberOfNodes[elemType]
+                file.write("\n")
+                file.write(f"-- Mesh {gemaElement} elements of {physicalGroupName}\n")
+                file.write("\n")
+                rowFormat = flatRowFormat("%d", nNodes) if self.flatTables else connectivityRowFormat(nNodes)
+                with luaTable(file, f"{gemaElement}_{physicalGroupName}", self.shardSize, self.bufferSize) as rows:
+                    for elem in self.snapshot.getConnectivityChunks(physicalGroupTag, elemType, self.blockRows(nNodes)):
+                        writeRows(rows, rowFormat, self.snapshot.getNodeIds(elem), self.blockRows(nNodes))
+                # Add the elements to the meshData
+                file.write(f"\nmeshData['{gemaElement}_{physicalGroupName}'] = {self.tableRows(f'{gemaElement}_{physicalGroupName}', nNodes)}\n")
 
 
     # ---------------------------------------------------------------------
     # Print nodes associated with a physical group     
-    def printNodeSetDataList(self):
+    def printNodeSetDataList(self, file):
         """
-        Print the list of nodes of the mesh that belongs to the given physical group
+        Print the list of nodes of the mesh that belongs to each node set physical group
 
         Parameters:
-        - dimPhysicalGroup: dimension of the physical group entities (0 = nodes, 1 = lines, 2 = surfaces)
-        - physicalGroupTag: tag of the physical group which you desire to print the nodes
-        - gmsh:             Gmsh data structure
-
+        - file: opened mesh file
         """
 
         for dimPhysicalGroup,physicalGroupTag in self.nodeSetData:
 
             # Get the name of the physical group
-            physicalGroupName = self.gmsh.model.getPhysicalName(dimPhysicalGroup, physicalGroupTag)
+            physicalGroupName = self.snapshot.getPhysicalName(dimPhysicalGroup, physicalGroupTag)
 
-            # Get the entities tags associated with this physical group
-            entitiesTags = self.gmsh.model.getEntitiesForPhysicalGroup(dimPhysicalGroup,physicalGroupTag)
-
-            # Get the nodes of the physical group
-            nodes = []
-            for e in entitiesTags:
-                nodeTags = self.gmsh.model.mesh.getNodes(dimPhysicalGroup,e,True)
-                for node in nodeTags[0]:
-                    nodes.append(node)
-            nodes = list(set(nodes))
+            # Get the ids of the nodes of the physical group
+            nodes = np.sort(self.snapshot.getNodeIds(self.snapshot.getNodeSet(dimPhysicalGroup, physicalGroupTag)))
 
             # Print the elements of the specified element type 
-            with open(self.fileName, 'a') as file:
-                file.write("\n")
-                file.write(f"-- Node list of {physicalGroupName}\n")
-                file.write("\n")
-                file.write(f"local nodeList_{physicalGroupName} = {{\n")
-                for node in nodes:
-                    file.write("    ")
-                    file.write(f" {node},\n")
-                file.write("}\n")
+            file.write("\n")
+            file.write(f"-- Node list of {physicalGroupName}\n")
+            file.write("\n")
+            with luaTable(file, f"nodeList_{physicalGroupName}", self.shardSize, self.bufferSize) as rows:
+                if self.compactLists:
+                    writeRangeRows(rows, nodes, self.blockRows(2))
+                else:
+                    writeRows(rows, nodeListRowFormat(), nodes.reshape((-1,1)), self.blockRows(1))
 
 
-                # Add the node list to the meshData
+            # Add the node list to the meshData
+            if self.compactLists:
+                file.write(f"\nmeshData['nodeList_{physicalGroupName}'] = expandRanges(nodeList_{physicalGroupName})\n")
+            else:
                 file.write(f"\nmeshData['nodeList_{physicalGroupName}'] = nodeList_{physicalGroupName}\n")
 
 
     # ---------------------------------------------------------------------
     # Create 2D zero-thickness double-node interface elements
     def createInterfaceElements(self,discontinuitySet, tripleNode = False):
+        """
+        Create the interface elements of a discontinuity split by the Crack
+        plugin. The last entity of the physical group is the side 2 of the
+        discontinuity and the other entities are the side 1: curves in 2D and
+        surfaces in 3D.
+
+        Parameters:
+        - discontinuitySet: tag of the physical group of the discontinuity
+        - tripleNode:       add a mid-plane node to each node pair (hydro-mechanical
+                            elements), when enabled with setTripleNodeElements
+
+        Returns the (nInterface, nNodes) connectivity of the interface elements.
+        """
+
+        # Get the entities that are associated with the discontinuity
+        discontinuityEntitiesTags = self.gmsh.model.getEntitiesForPhysicalGroup(self.dim-1,discontinuitySet)
+
+        # Topology of the continuum elements after the discontinuity was split
+        topology = self.takeTopology()
+
+        if self.dim == 3:
+            # Get the faces of each side of the discontinuity
+            discontinuity_faces1 = getSurfacesFaces(self.gmsh, discontinuityEntitiesTags[:-1])
+            discontinuity_faces2 = getSurfacesFaces(self.gmsh, discontinuityEntitiesTags[-1:])
+            interfaceElements = buildInterfaceElements3D(topology, discontinuity_faces1, discontinuity_faces2)
+
+            # The bottom face has the nodes of side 1
+            positionNodes = interfaceElements[:, :interfaceElements.shape[1]//2]
+        else:
+            # Get the segments of each side of the discontinuity
+            discontinuity_nodes1 = getCurvesSegments(self.gmsh, discontinuityEntitiesTags[:-1])
+            discontinuity_nodes2 = getCurvesSegments(self.gmsh, discontinuityEntitiesTags[-1:])
+            interfaceElements = buildInterfaceElements(topology, discontinuity_nodes1, discontinuity_nodes2)
+
+            # The nodes of side 1 are {a1, a0} (and am)
+            positionNodes = interfaceElements[:, [3,2,5][:interfaceElements.shape[1]//2]]
+
+        self.tripleNode = tripleNode and self.tripleNodeElements
+        if self.tripleNode:
+            interfaceElements = self.addMidPlaneNodes(interfaceElements, positionNodes)
+
+        return interfaceElements
+
+    # ---------------------------------------------------------------------
+    # Add the mid-plane nodes of triple-node interface elements
+    def addMidPlaneNodes(self, interfaceElements, positionNodes):
+        interfaceElements, midPlaneNodes = createMidPlaneNodes(interfaceElements, positionNodes, self.getNextNodeTag())
+        self.copiedNodes.append(midPlaneNodes)
+        self.snapshot = None
+        return interfaceElements
+
+    # ---------------------------------------------------------------------
+    # Duplicate the nodes of a discontinuity and create its interface elements
+    def splitDiscontinuity(self, discontinuitySet, openBoundaryPhysicalGroup = [], tripleNode = False):
+        """
+        Duplicate the nodes of a discontinuity, in place of the gmsh Crack
+        plugin, and create its zero-thickness interface elements. The gmsh
+        model is not changed: the duplicates are added to the mesh file and
+        replace the original nodes in the elements on side 2 when it is written.
+
+        Parameters:
+        - discontinuitySet:          tag of the physical group of the discontinuity
+                                     (curves in 2D, surfaces in 3D)
+        - openBoundaryPhysicalGroup: tag of the physical group (points in 2D, curves
+                                     in 3D) of the border nodes that are also duplicated
+        - tripleNode:                add a mid-plane node to each node pair (hydro-mechanical
+                                     elements), when enabled with setTripleNodeElements
+
+        Returns the (nInterface, nNodes) connectivity of the interface elements.
+        """
+
+        # Get the elements of the discontinuity
+        sideBlocks = []
+        for entityTag in self.gmsh.model.getEntitiesForPhysicalGroup(self.dim-1,discontinuitySet):
+            elemTypes, _, nodeTags = self.gmsh.model.mesh.getElements(self.dim-1, entityTag)
+            for elemType, nodes in zip(elemTypes, nodeTags):
+                nNodes = self.gmsh.model.mesh.getElementProperties(elemType)[3]
+                sideBlocks.append((elemType, np.asarray(nodes).reshape((-1,nNodes))))
+
+        # Get the border nodes that are duplicated
+        openBoundaryNodes = []
+        if openBoundaryPhysicalGroup != []:
+            openBoundaryNodes = self.gmsh.model.mesh.getNodesForPhysicalGroup(self.dim-2, openBoundaryPhysicalGroup)[0]
+
+        # Duplicate the nodes using the topology of the continuum elements
+        self.nodeSplit = splitNodes(self.takeTopology(), sideBlocks, openBoundaryNodes, self.getNextNodeTag())
+        self.topology  = None
+        self.snapshot  = None
+        self.copiedNodes.append(self.nodeSplit.duplicatedNodes)
+
+        self.tripleNode = tripleNode and self.tripleNodeElements
+        if self.tripleNode:
+            return self.addMidPlaneNodes(self.nodeSplit.interfaceElements, self.nodeSplit.interfaceCorners)
+
+        return self.nodeSplit.interfaceElements
+
+    # ---------------------------------------------------------------------
+    # GeMA type of the interface elements with a given number of nodes, for the
+    # interface elements without a default type (3D, triple-node)
+    def setInterfaceElementType(self, _dim, _numNodes, _gemaType, _tripleNode = False):
+        self.interfaceElementTypes[(_dim, _numNodes, _tripleNode)] = _gemaType
 
-        # Get the nodes of the continuum domain
-        _, nodeCoords,_ = self.gmsh.model.mesh.getNodes()
-
-        # Reshape the node coordinates into a matrix
-        nodeCoords = nodeCoords.reshape((-1,3))
-
-        # Get the curves that are associated with the discontinuity
-        discontinuityEntitiesTags = self.gmsh.model.getEntitiesForPhysicalGroup(1,discontinuitySet)
-
-        # Get the lines and its nodes associated with the curve
-        discontinuity_segmentsID      = []
-        discontinuity_segments_curve1 = []
-        for i in range((len(discontinuityEntitiesTags)-1)):
-            _, discontinuity_segmentsID_i, discontinuity_segments_curve1_i = self.gmsh.model.mesh.getElements(1, discontinuityEntitiesTags[i])
-            discontinuity_segmentsID = discontinuity_segmentsID + discontinuity_segmentsID_i
-            discontinuity_segments_curve1 = discontinuity_segments_curve1 +  discontinuity_segments_curve1_i
-
-        # Get the lines and its nodes associated with the curve
-        _,_, discontinuity_segments_curve2 = self.gmsh.model.mesh.getElements(1, discontinuityEntitiesTags[-1])
-
-        discontinuity_segmentsID = [item for sublist in discontinuity_segmentsID for item in sublist]
-        discontinuity_segments_curve1 = [item for sublist in discontinuity_segments_curve1 for item in sublist]
-
-        # Convert into a numpy array
-        discontinuity_segmentsID = np.array(discontinuity_segmentsID)
-        discontinuity_segments_curve1 = np.array(discontinuity_segments_curve1)
-
-        # Reshape the coordinates array 
-        discontinuity_nodes1 = discontinuity_segments_curve1.reshape((-1,2))
-        discontinuity_nodes2 = discontinuity_segments_curve2[0].reshape((-1,2))
-
-        # Get the number of sub-divisions
-        nDiscontinuitySeg = len(discontinuity_segmentsID)
-
-        interfaceElem = []
-
-        for el in range(nDiscontinuitySeg):
-
-            # Get the coordinates of the nodes of the segment
-            nd = np.vstack((np.array(self.gmsh.model.mesh.getNode(discontinuity_nodes1[el][0])[0]), np.array(self.gmsh.model.mesh.getNode(discontinuity_nodes1[el][1])[0])))
-
-            # Find the elements that have each node of the segment
-            elem_nd1 = self.gmsh.model.mesh.getElementsByCoordinates(nd[0][0],nd[0][1],nd[0][2],2,True)
-            elem_nd2 = self.gmsh.model.mesh.getElementsByCoordinates(nd[1][0],nd[1][1],nd[1][2],2,True)
-
-            # The elements that are adjancent to the line are the ones sharing both nodes
-            adj_elements = list(set(elem_nd1) & set(elem_nd2))
-
-            if len(adj_elements) != 2:
-                print("Inappropriate number of adjancent elements")
-                break
-
-            # Identify the border of the adjacent elements that coincide with the discontinuity
-            borderId = []
-            edgeInterface = []
-            for adjElement in range(2):
-                #Get the nodes connectivity of the adjacent element
-                elementType,edgeNodes,_,_ = self.gmsh.model.mesh.getElement(adj_elements[adjElement])
-                edgeNodes = np.concatenate((edgeNodes, [edgeNodes[0]]))
-                # Loop through the borders of the element 
-                for border in range(elementType+1):
-                    counter1 = 0
-                    counter2 = 0
-                    edge = [edgeNodes[border], edgeNodes[border+1]]
-                    # Check if the edge has two discontinuity nodes
-                    if discontinuity_nodes1[el][0] in edge:
-                        counter1 += 1
-                    if discontinuity_nodes1[el][1] in edge:
-                        counter1 += 1
-                    if discontinuity_nodes2[el][0] in edge:
-                        counter2 += 1
-                    if discontinuity_nodes2[el][1] in edge:
-                        counter2 += 1
-                    if (counter1 == 2) or (counter2 == 2):
-                        borderId.append(border)
-                        edgeInterface.append(edge)
-                        break
-
-            # Create the interface element
-            edgeInterface = [item for sublist in edgeInterface for item in sublist][::-1]
-            interfaceElem.append(edgeInterface)
-
-        return interfaceElem
-
-    # ---------------------------------------------------------------------
-    # Print the 2D double-node interface elements
+    # ---------------------------------------------------------------------
+    # Create the mid-plane nodes of the interface elements asked for with
+    # tripleNode = True. Off by default: these get the double-node elements.
+    # The GeMA type of the triple-node elements is given with
+    # setInterfaceElementType(dim, numNodes, gemaType, True).
+    def setTripleNodeElements(self, _tripleNodeElements):
+        self.tripleNodeElements = _tripleNodeElements
+
+    # ---------------------------------------------------------------------
+    # GeMA type of the interface elements of the discontinuity set
+    def getInterfaceElementType(self):
+        numNodes = np.shape(self.discontinuitySet)[1]
+        if (self.dim, numNodes, self.tripleNode) not in self.interfaceElementTypes:
+            kind = "triple-node " if self.tripleNode else ""
+            raise Exception(f"No GeMA type for the {self.dim}D {kind}interface elements with {numNodes} nodes: set it with setInterfaceElementType")
+        return self.interfaceElementTypes[(self.dim, numNodes, self.tripleNode)]
+
+    # ---------------------------------------------------------------------
+    # Print the double-node interface elements
             
-    def printInterfaceElements(self,interfaceElements,physicalGroupTag):
+    def printInterfaceElements(self,file,interfaceElements,physicalGroupTag):
         """
         Print the zero-thickness interface elements
 
         Parameters:
-        - fileName:          name of the file to print the elements connectivity
-        - interfaceElements: list with the connectivity of each interface element
+        - file:              opened mesh file
+        - interfaceElements: (nInterface, nNodes) connectivity of the interface elements
         - physicalGroupTag : tag of the physical group used to create the interface elements
-        - gmsh             : Gmsh data structure
         """
 
         # Get the name of the physical group
-        physicalGroupName = self.gmsh.model.getPhysicalName(1, physicalGroupTag)
-
-        # Print the elements of the specified element type 
-        #TODO: generalize to other types of interface elements + XFEM
-        with open(self.fileName, 'a') as file:
-            file.write("\n")
-            file.write(f"-- Mesh elements of {physicalGroupName}\n")
-            file.write("\n")
-            file.write(f"local int2dl4_{physicalGroupName} = {{\n")
-            for i, elem in enumerate(interfaceElements, start=1):
-                file.write(f"    {{ {elem[0]}, {elem[1]}, {elem[2]}, {elem[3]} }}, -- {i}\n")
-            file.write("}\n")
+        physicalGroupName = self.snapshot.getPhysicalName(self.dim-1, physicalGroupTag)
 
-            # Add the node list to the meshData
-            file.write(f"\nmeshData['int2dl4_{physicalGroupName}'] = int2dl4_{physicalGroupName}\n")
-            
+        # Get the GeMA type of the interface elements
+        #TODO: XFEM
+        interfaceElements = self.snapshot.getNodeIds(interfaceElements)
+        gemaElement = self.getInterfaceElementType()
 
+        # Print the elements of the specified element type 
+        file.write("\n")
+        file.write(f"-- Mesh elements of {physicalGroupName}\n")
+        file.write("\n")
+        nNodes = interfaceElements.shape[1]
+        with luaTable(file, f"{gemaElement}_{physicalGroupName}", self.shardSize, self.bufferSize) as rows:
+            if self.flatTables:
+                writeRows(rows, flatRowFormat("%d", nNodes), interfaceElements, self.blockRows(nNodes))
+            else:
+                writeRows(rows, interfaceRowFormat(nNodes), interfaceElements, self.blockRows(nNodes + 1), 1)
+
+        # Add the node list to the meshData
+        file.write(f"\nmeshData['{gemaElement}_{physicalGroupName}'] = {self.tableRows(f'{gemaElement}_{physicalGroupName}', nNodes)}\n")
@@ -0,0 +1,230 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+from gemaModel.mesh.gmshExtraction import getElementCounts, getElementsByType, getElementsByEntity, selectEntities
+from gemaModel.mesh.gmsh2GeMA_ElementTypes import gmsh2GeMA_elementTypes_NumberOfNodes
+from gemaModel.mesh.nodeNumbering import NodeNumbering
+
+class MeshSnapshot:
+    """
+    Read-only picture of the gmsh model taken once before the GeMA files are
+    written. Every writer of gemaMesh and modelGeMA reads the physical names,
+    nodes, connectivities and node sets from here instead of querying gmsh.
+
+    When the estimated size of the mesh file is larger than the streaming
+    threshold, the connectivities are not kept: they are retrieved entity by
+    entity when written and handed out in chunks of bounded size (see
+    getConnectivityChunks).
+
+    The nodes created by gemaMesh (duplicates of the nodes of a
+    discontinuity, mid-plane nodes of triple-node interface elements) are
+    appended to the nodes, with the coordinates of the node they copy. When
+    the nodes of a discontinuity were duplicated (see splitNodes), the
+    duplicates replace the original nodes in the connectivity of the elements
+    on side 2 of the discontinuity.
+
+    The nodes are numbered 1..N in the order of the table of nodes, whatever
+    their gmsh tags: every writer converts the node tags it writes with
+    getNodeIds. The table of nodes can be reordered (see reorderNodes).
+
+    Parameters:
+    - gmsh:                          Gmsh data structure
+    - _dim:                          dimension of the mesh
+    - _nodesPhysicalGroup:           tag of the physical group with the nodes of the mesh
+    - _cellPhysicalGroups:           list with the tags of the physical groups of the cells
+    - _nodeSetData:                  list of (dim, tag) of the physical groups of the node sets
+    - _discontinuitySetPhysicalGroup: tag of the physical group of the interface elements
+    - _streamingThreshold:           estimated size (bytes) of the mesh file above which the
+                                     connectivities are streamed (None to always keep them)
+    - _nodeSplit:                    NodeSplit of the discontinuity (None if no nodes were duplicated)
+    - _copiedNodes:                  (n, 2) tags of the node copied and of each node created by
+                                     gemaMesh, in ascending order of the new tags
+    """
+
+    def __init__(self, gmsh, _dim, _nodesPhysicalGroup, _cellPhysicalGroups = [], _nodeSetData = [], _discontinuitySetPhysicalGroup = [], _streamingThreshold = None, _nodeSplit = None, _copiedNodes = None):
+        self.gmsh               = gmsh
+        self.dim                = _dim
+        self.streamingThreshold = _streamingThreshold
+        self.nodeSplit          = _nodeSplit
+        self.copiedNodes        = _copiedNodes
+        self.streaming          = False
+        self.nodeTags           = np.empty(0, dtype=np.uint64)
+        self.nodeCoords         = np.empty((0,3))
+        self.nodeNumbering      = None
+        self.physicalNames      = {}    # (dim, tag) -> name
+        self.cellGroupTypes     = {}    # physical group tag -> sorted gmsh element types
+        self.cellEntities       = {}    # physical group tag -> entities tags
+        self.numberOfElements   = {}    # (physical group tag, element type) -> number of elements
+        self.connectivity       = {}    # (physical group tag, element type) -> (nElem, nNodes) node tags
+        self.nodeSets           = {}    # (dim, tag) -> sorted node tags
+        self.elementTypes       = []    # element types present in all cell physical groups
+        self.takeNodes(_nodesPhysicalGroup)
+        self.takeCells(_cellPhysicalGroups)
+        self.takeNodeSets(_nodeSetData)
+        if _discontinuitySetPhysicalGroup != []:
+            self.takePhysicalName(self.dim - 1, _discontinuitySetPhysicalGroup)
+
+    # ---------------------------------------------------------------------
+    def takePhysicalName(self, dim, physicalGroupTag):
+        if (dim, physicalGroupTag) not in self.physicalNames:
+            self.physicalNames[(dim, physicalGroupTag)] = self.gmsh.model.getPhysicalName(dim, physicalGroupTag)
+        return self.physicalNames[(dim, physicalGroupTag)]
+
+    # ---------------------------------------------------------------------
+    def takeNodes(self, physicalGroupTag):
+        nodeTags, nodeCoords = self.gmsh.model.mesh.getNodesForPhysicalGroup(self.dim, physicalGroupTag)
+        self.nodeTags   = np.asarray(nodeTags)
+        self.nodeCoords = np.asarray(nodeCoords).reshape((-1,3))
+
+        # Append the nodes created by gemaMesh
+        if self.copiedNodes is not None and len(self.copiedNodes) > 0:
+            original, duplicate = self.copiedNodes.T
+            order    = np.argsort(self.nodeTags)
+            position = order[np.searchsorted(self.nodeTags, original, sorter=order)]
+            self.nodeTags   = np.concatenate((self.nodeTags, duplicate.astype(self.nodeTags.dtype)))
+            self.nodeCoords = np.vstack((self.nodeCoords, self.nodeCoords[position]))
+
+        # Contiguous ids of the nodes
+        self.nodeNumbering = NodeNumbering(self.nodeTags)
+
+    # ---------------------------------------------------------------------
+    def reorderNodes(self, order):
+        """
+        Reorder the table of nodes: order[i] is the current position of the
+        node written in position i (see computeNodeOrder)
+        """
+        self.nodeTags      = self.nodeTags[order]
+        self.nodeCoords    = self.nodeCoords[order]
+        self.nodeNumbering = NodeNumbering(self.nodeTags)
+
+    # ---------------------------------------------------------------------
+    def takeCells(self, cellPhysicalGroups):
+
+        if len(cellPhysicalGroups) == 0:
+            return
+
+        # Get the entities tags associated with each physical group
+        for physicalGroupTag in cellPhysicalGroups:
+            self.takePhysicalName(self.dim, physicalGroupTag)
+            self.cellEntities[physicalGroupTag] = self.gmsh.model.getEntitiesForPhysicalGroup(self.dim, physicalGroupTag)
+        groupEntities = np.unique(np.concatenate([np.asarray(tags, dtype=np.int64) for tags in self.cellEntities.values()]))
+
+        # Number of elements of each type in each entity of the physical groups
+        elementCounts = {}
+        for elemType in self.gmsh.model.mesh.getElementTypes(self.dim):
+            elementCounts[elemType] = getElementCounts(self.gmsh, elemType, self.dim, groupEntities)
+
+        elemTypes = set()
+        for physicalGroupTag in cellPhysicalGroups:
+            entitiesTags = self.cellEntities[physicalGroupTag]
+
+            # Get the element types present in the entities of the group
+            self.cellGroupTypes[physicalGroupTag] = []
+            for elemType, (tags, counts) in sorted(elementCounts.items()):
+                numElements = int(counts[np.isin(tags, entitiesTags)].sum())
+                if numElements == 0:
+                    continue
+                self.cellGroupTypes[physicalGroupTag].append(elemType)
+                self.numberOfElements[(physicalGroupTag, elemType)] = numElements
+                elemTypes.add(elemType)
+
+        self.elementTypes = sorted(elemTypes)
+
+        # Large meshes: the connectivities are retrieved only when written
+        if self.streamingThreshold is not None and self.estimateOutputSize() > self.streamingThreshold:
+            self.streaming = True
+            return
+
+        # Get all the elements of each type present in the mesh with one call per type
+        for elemType in self.elementTypes:
+            elemTags, elemNodes, elemEntities = getElementsByType(self.gmsh, elemType, self.dim, elementCounts[elemType])
+
+            # Split the elements by the entities of each group
+            for physicalGroupTag in cellPhysicalGroups:
+                if (physicalGroupTag, elemType) not in self.numberOfElements:
+                    continue
+                selected = selectEntities(elemEntities, self.cellEntities[physicalGroupTag])
+                self.connectivity[(physicalGroupTag, elemType)] = self.splitConnectivity(elemTags[selected], elemNodes[selected])
+
+    # ---------------------------------------------------------------------
+    def estimateOutputSize(self):
+        """
+        Estimate the size (bytes) of the nodes and elements tables of the mesh file
+        """
+        numNodes = len(self.nodeTags)
+        digits   = len(str(int(self.nodeTags.max()))) if numNodes > 0 else 1
+
+        # Node rows: { x, y[, z] }, -- i
+        size = numNodes * (16 * self.dim + len(str(numNodes)) + 12)
+
+        # Element rows: {n1, n2, ...},
+        for (_, elemType), numElements in self.numberOfElements.items():
+            size += numElements * ((digits + 2) * gmsh2GeMA_elementTypes_NumberOfNodes[elemType] + 5)
+        return size
+
+    # ---------------------------------------------------------------------
+    def takeNodeSets(self, nodeSetData):
+        for dimPhysicalGroup, physicalGroupTag in nodeSetData:
+
+            self.takePhysicalName(dimPhysicalGroup, physicalGroupTag)
+
+            # Get the nodes of the elements of the physical group, including the
+            # ones on the boundary of its entities, sorted and without repetitions
+            nodes = self.gmsh.model.mesh.getNodesForPhysicalGroup(dimPhysicalGroup, physicalGroupTag)[0]
+            self.nodeSets[(dimPhysicalGroup, physicalGroupTag)] = np.unique(np.asarray(nodes, dtype=np.uint64))
+
+    # ---------------------------------------------------------------------
+    def getPhysicalName(self, dim, physicalGroupTag):
+        return self.physicalNames[(dim, physicalGroupTag)]
+
+    # ---------------------------------------------------------------------
+    def getConnectivityChunks(self, physicalGroupTag, elemType, chunkRows = None):
+        """
+        Generator over the connectivity of the elements of a given type of a cell
+        physical group, in chunks of at most chunkRows elements. When streaming,
+        the elements are retrieved from gmsh one entity at a time and the
+        duplicated nodes are replaced chunk by chunk, so nothing but the block
+        of the current entity and one chunk are held. The gmsh API has no way
+        to return part of the block of an entity (with task/numTasks it still
+        allocates the whole block), so the largest entity sets the floor of
+        the memory used.
+
+        Parameters:
+        - physicalGroupTag: tag of the cell physical group
+        - elemType:         gmsh element type
+        - chunkRows:        largest number of elements of a chunk (None for whole blocks)
+        """
+        if not self.streaming:
+            blocks = [(None, self.connectivity[(physicalGroupTag, elemType)])]
+        else:
+            blocks = getElementsByEntity(self.gmsh, elemType, self.cellEntities[physicalGroupTag])
+        for elemTags, elemNodes in blocks:
+            step = len(elemNodes) if chunkRows is None else chunkRows
+            for start in range(0, len(elemNodes), max(step, 1)):
+                chunk = elemNodes[start:start + step]
+                yield chunk if elemTags is None else self.splitConnectivity(elemTags[start:start + step], chunk)
+
+    # ---------------------------------------------------------------------
+    def splitConnectivity(self, elemTags, elemNodes):
+        """
+        Replace the nodes of the elements on side 2 of the discontinuity by their duplicates
+        """
+        if self.nodeSplit is None:
+            return elemNodes
+        return self.nodeSplit.apply(elemTags, elemNodes)
+
+    # ---------------------------------------------------------------------
+    def getNodeIds(self, nodeTags):
+        """
+        Return the ids (1..N, the row of the table of nodes) of an array of node tags
+        """
+        return self.nodeNumbering.getIds(nodeTags)
+
+    # ---------------------------------------------------------------------
+    def getNodeSet(self, dim, physicalGroupTag):
+        return self.nodeSets[(dim, physicalGroupTag)]
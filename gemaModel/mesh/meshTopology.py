@@ -0,0 +1,323 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+
+# Family of each gmsh element type: the first nodes of the connectivity of
+# higher order elements are the corners of the first order element
+gmshElementFamily = {
+    1: 'bar',    8: 'bar',
+    2: 'tri',    9: 'tri',
+    3: 'quad',  10: 'quad',  16: 'quad',
+    4: 'tet',   11: 'tet',
+    5: 'hex',   12: 'hex',   17: 'hex',
+    6: 'prism', 13: 'prism', 18: 'prism',
+    7: 'pyr',   14: 'pyr',   19: 'pyr'
+}
+
+# Second order gmsh element types: the node of edge i is the node number
+# familyCorners + i of the connectivity
+secondOrderTypes = {8, 9, 10, 11, 12, 13, 14, 16, 17, 18, 19}
+
+# Number of corners of each element family
+familyCorners = {'bar': 2, 'tri': 3, 'quad': 4, 'tet': 4, 'hex': 8, 'prism': 6, 'pyr': 5}
+
+# Dimension of each element family
+familyDimension = {'bar': 1, 'tri': 2, 'quad': 2, 'tet': 3, 'hex': 3, 'prism': 3, 'pyr': 3}
+
+# Local corners of the edges of each element family (gmsh numbering)
+familyEdges = {
+    'bar':   [(0,1)],
+    'tri':   [(0,1), (1,2), (2,0)],
+    'quad':  [(0,1), (1,2), (2,3), (3,0)],
+    'tet':   [(0,1), (1,2), (2,0), (3,0), (3,2), (3,1)],
+    'hex':   [(0,1), (0,3), (0,4), (1,2), (1,5), (2,3), (2,6), (3,7), (4,5), (4,7), (5,6), (6,7)],
+    'prism': [(0,1), (0,2), (0,3), (1,2), (1,4), (2,5), (3,4), (3,5), (4,5)],
+    'pyr':   [(0,1), (0,3), (0,4), (1,2), (1,4), (2,3), (2,4), (3,4)]
+}
+
+# Local corners of the faces of each element family, oriented outwards (gmsh numbering)
+familyFaces = {
+    'tet':   [(0,2,1), (0,1,3), (0,3,2), (3,1,2)],
+    'hex':   [(0,3,2,1), (0,1,5,4), (0,4,7,3), (1,2,6,5), (2,3,7,6), (4,5,6,7)],
+    'prism': [(0,2,1), (3,4,5), (0,1,4,3), (0,3,5,2), (1,2,5,4)],
+    'pyr':   [(0,1,4), (0,4,3), (1,2,4), (2,3,4), (0,3,2,1)]
+}
+
+def rowKeys(rows, base):
+    """
+    Key of each row of an integer array that does not depend on the order of
+    its values: the sorted row encoded with the given base in a single int64
+    when it fits, otherwise in as few int64 columns as needed (two for the
+    faces of meshes up to about 3e9 nodes). The columns of the keys compare
+    as the sorted rows, so the keys can be sorted (see uniqueKeys) and
+    searched (see findKeys) in both cases.
+
+    Parameters:
+    - rows: (n, width) integers from -1 to base - 2
+    - base: number larger than every value plus one
+
+    Returns the (n,) keys, or (n, k) keys when they do not fit in one int64.
+    """
+    rows  = np.sort(rows, axis=1) + 1
+    width = rows.shape[1]
+    valuesPerKey = 1
+    while valuesPerKey < width and base ** (valuesPerKey + 1) < 2**63:
+        valuesPerKey += 1
+    columns = []
+    for start in range(0, width, valuesPerKey):
+        keys = np.zeros(len(rows), dtype=np.int64)
+        for j in range(start, min(start + valuesPerKey, width)):
+            keys = keys * base + rows[:,j]
+        columns.append(keys)
+    return columns[0] if len(columns) == 1 else np.stack(columns, axis=1)
+
+def uniqueKeys(keys):
+    """
+    Sorted unique keys (see rowKeys), the first position of each one and the
+    unique key of each position, as np.unique. Keys with several columns are
+    sorted with lexsort.
+    """
+    if keys.ndim == 1:
+        return np.unique(keys, return_index=True, return_inverse=True)
+    order   = np.lexsort(keys.T[::-1])
+    ordered = keys[order]
+    isFirst = np.ones(len(keys), dtype=bool)
+    isFirst[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+    inverse = np.empty(len(keys), dtype=np.int64)
+    inverse[order] = np.cumsum(isFirst) - 1
+    return ordered[isFirst], order[isFirst], inverse
+
+def findKeys(sortedKeys, keys):
+    """
+    Position of each key in an array of sorted unique keys (-1 if not found).
+    Keys with several columns are sorted together with the sorted keys, each
+    one after the sorted key it may be equal to.
+    """
+    if len(sortedKeys) == 0:
+        return np.full(len(keys), -1, dtype=np.int64)
+    if sortedKeys.ndim == 1:
+        position = np.minimum(np.searchsorted(sortedKeys, keys), len(sortedKeys) - 1)
+        return np.where(sortedKeys[position] == keys, position, -1)
+    allKeys  = np.concatenate((sortedKeys, keys))
+    order    = np.lexsort((np.arange(len(allKeys)),) + tuple(allKeys.T[::-1]))
+    isSorted = order < len(sortedKeys)
+    previous = np.maximum.accumulate(np.where(isSorted, order, 0))
+    position = np.empty(len(keys), dtype=np.int64)
+    position[order[~isSorted] - len(sortedKeys)] = previous[~isSorted]
+    return np.where(np.all(sortedKeys[position] == keys, axis=1), position, -1)
+
+def compressedRows(rows, numRows):
+    """
+    Compressed sparse row (CSR) grouping of the positions of an array by the
+    row given in it.
+
+    Parameters:
+    - rows:    row of each position
+    - numRows: number of rows
+
+    Returns the pointer (numRows + 1) and the positions grouped by row, in
+    ascending order within each row.
+    """
+    pointer = np.zeros(numRows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=numRows), out=pointer[1:])
+    return pointer, np.argsort(rows, kind='stable')
+
+class MeshTopology:
+    """
+    Topology of a mesh, built from the connectivity of its elements. Every
+    table is computed the first time it is asked for and cached.
+
+    The elements are numbered from 0, following the order of the blocks of
+    connectivity. The sides of the elements (edges, faces) are numbered from 0
+    in the order of their keys (see rowKeys).
+
+    Parameters:
+    - _blocks:      list of (gmsh element type, (nElem, nNodes) node tags)
+    - _elementTags: gmsh tags of the elements, in the order of the blocks (optional)
+
+    Usage:
+        topology = MeshTopology([(elemType, snapshot.connectivity[(physicalGroupTag, elemType)])
+                                 for elemType in snapshot.cellGroupTypes[physicalGroupTag]])
+        pointer, elements = topology.getNodeElements()
+        edges = topology.getEdges()
+    """
+
+    def __init__(self, _blocks, _elementTags = None):
+        self.blocks      = [(elemType, np.asarray(elemNodes, dtype=np.int64)) for elemType, elemNodes in _blocks]
+        self.elementTags = _elementTags
+        self.dim         = max([familyDimension[gmshElementFamily[elemType]] for elemType, _ in self.blocks], default=0)
+        self.cache       = {}
+
+        # Index of the first element of each block
+        self.blocksOffset = np.cumsum([0] + [len(elemNodes) for _, elemNodes in self.blocks])
+        self.numElements  = int(self.blocksOffset[-1])
+        self.maxNodeTag   = max([int(elemNodes.max(initial=0)) for _, elemNodes in self.blocks], default=0)
+
+    # ---------------------------------------------------------------------
+    def getNumberOfElements(self):
+        return self.numElements
+
+    # ---------------------------------------------------------------------
+    def getNodeElements(self):
+        """
+        Node-to-element CSR: the elements of node n are
+        elements[pointer[n]:pointer[n+1]], indexed by the node tag.
+        """
+        if 'nodeElements' not in self.cache:
+            nodes    = np.concatenate([elemNodes.ravel() for _, elemNodes in self.blocks] + [np.empty(0, dtype=np.int64)])
+            elements = np.concatenate([np.repeat(np.arange(self.blocksOffset[i], self.blocksOffset[i+1]), elemNodes.shape[1])
+                                       for i, (_, elemNodes) in enumerate(self.blocks)] + [np.empty(0, dtype=np.int64)])
+            pointer, order = compressedRows(nodes, self.maxNodeTag + 1)
+            self.cache['nodeElements'] = (pointer, elements[order])
+        return self.cache['nodeElements']
+
+    # ---------------------------------------------------------------------
+    def getSideTable(self, kind):
+        """
+        Build the table of the edges or faces of the elements
+
+        Parameters:
+        - kind: 'edges' or 'faces'
+        """
+        if kind in self.cache:
+            return self.cache[kind]
+
+        localSides = familyEdges if kind == 'edges' else familyFaces
+        width      = 2 if kind == 'edges' else 4
+
+        # Oriented nodes, element and local index of the side of every element,
+        # and the mid-side node of the edges of second order elements
+        nodes, elements, local = [np.empty((0,width), dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        midNodes = [np.empty(0, dtype=np.int64)]
+        for i, (elemType, elemNodes) in enumerate(self.blocks):
+            family = gmshElementFamily[elemType]
+            sides  = localSides.get(family, [])
+            for s, side in enumerate(sides):
+                sideNodes = np.full((len(elemNodes), width), -1, dtype=np.int64)
+                sideNodes[:, :len(side)] = elemNodes[:, side]
+                nodes.append(sideNodes)
+                elements.append(np.arange(self.blocksOffset[i], self.blocksOffset[i+1]))
+                local.append(np.full(len(elemNodes), s, dtype=np.int64))
+                if kind == 'edges':
+                    midNodes.append(elemNodes[:, familyCorners[family] + s] if elemType in secondOrderTypes
+                                    else np.full(len(elemNodes), -1, dtype=np.int64))
+        nodes, elements, local = np.concatenate(nodes), np.concatenate(elements), np.concatenate(local)
+        midNodes = np.concatenate(midNodes)
+
+        # Unique sides
+        keys, first, sideId = uniqueKeys(rowKeys(nodes, self.maxNodeTag + 2))
+        pointer, incidences = compressedRows(sideId, len(keys))
+
+        self.cache[kind] = {
+            'keys':       keys,         # sorted key of each side
+            'first':      first,        # first incidence of each side
+            'nodes':      nodes,        # oriented nodes of each incidence (element side)
+            'elements':   elements,     # element of each incidence
+            'local':      local,        # local index of the side in its element
+            'side':       sideId,       # side of each incidence
+            'midNodes':   midNodes,     # mid-side node of each edge incidence (-1 if none)
+            'pointer':    pointer,      # side-to-incidence CSR
+            'incidences': incidences
+        }
+        return self.cache[kind]
+
+    # ---------------------------------------------------------------------
+    def getEdges(self):
+        """
+        Return the (nEdges, 2) node tags of the unique edges, each one sorted
+        """
+        table = self.getSideTable('edges')
+        return np.sort(table['nodes'][table['first']], axis=1)
+
+    # ---------------------------------------------------------------------
+    def getFaces(self):
+        """
+        Return the (nFaces, 4) node tags of the unique faces, oriented outwards
+        from the first element that has it. Triangular faces end with -1.
+        """
+        table = self.getSideTable('faces')
+        return table['nodes'][table['first']]
+
+    # ---------------------------------------------------------------------
+    def getElementSides(self, kind):
+        """
+        Return the oriented node tags, element and side of each edge or face
+        of every element
+
+        Parameters:
+        - kind: 'edges' or 'faces'
+        """
+        table = self.getSideTable(kind)
+        return table['nodes'], table['elements'], table['side']
+
+    # ---------------------------------------------------------------------
+    def getEdgeMidNodes(self):
+        """
+        Return the mid-side node of each edge of every element, in the order
+        of getElementSides('edges'), or -1 for the edges of first order
+        elements
+        """
+        return self.getSideTable('edges')['midNodes']
+
+    # ---------------------------------------------------------------------
+    def getSideElements(self, kind):
+        """
+        Side-to-incidence CSR: the element sides equal to side s are
+        incidences[pointer[s]:pointer[s+1]], positions in the arrays given by
+        getElementSides.
+
+        Parameters:
+        - kind: 'edges' or 'faces'
+        """
+        table = self.getSideTable(kind)
+        return table['pointer'], table['incidences']
+
+    # ---------------------------------------------------------------------
+    def findSides(self, kind, nodes):
+        """
+        Return the side with the given nodes, in any order (-1 if not found)
+
+        Parameters:
+        - kind:  'edges' or 'faces'
+        - nodes: (n, 2) node tags for edges, (n, 3) or (n, 4) for faces
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if kind == 'faces' and nodes.shape[1] == 3:
+            nodes = np.hstack((nodes, np.full((len(nodes), 1), -1, dtype=np.int64)))
+        return findKeys(self.getSideTable(kind)['keys'], rowKeys(nodes, self.maxNodeTag + 2))
+
+    # ---------------------------------------------------------------------
+    def getElementAdjacency(self):
+        """
+        Element-to-element CSR: the elements sharing a side (an edge in 2D, a
+        face in 3D) with element e are neighbours[pointer[e]:pointer[e+1]].
+        """
+        if 'elementAdjacency' not in self.cache:
+            table = self.getSideTable('edges' if self.dim == 2 else 'faces')
+
+            # Sides shared by two elements
+            pointer, incidences = table['pointer'], table['incidences']
+            shared = np.flatnonzero(np.diff(pointer) == 2)
+            elem1  = table['elements'][incidences[pointer[shared]]]
+            elem2  = table['elements'][incidences[pointer[shared] + 1]]
+
+            source    = np.concatenate((elem1, elem2))
+            neighbour = np.concatenate((elem2, elem1))
+            adjacencyPointer, order = compressedRows(source, self.numElements)
+            self.cache['elementAdjacency'] = (adjacencyPointer, neighbour[order])
+        return self.cache['elementAdjacency']
+
+    # ---------------------------------------------------------------------
+    def getBoundarySides(self):
+        """
+        Return the incidences (see getElementSides) of the sides that belong to
+        a single element: the edges in 2D and the faces in 3D.
+        """
+        table = self.getSideTable('edges' if self.dim == 2 else 'faces')
+        single = np.flatnonzero(np.diff(table['pointer']) == 1)
+        return table['incidences'][table['pointer'][single]]
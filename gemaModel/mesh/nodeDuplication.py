@@ -0,0 +1,274 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from gemaModel.mesh.meshTopology import findKeys
+
+# Higher order nodes of the sides of a discontinuity and the local corners of
+# the edge or face where each one lies (gmsh numbering)
+sideHigherOrderNodes = {
+    8:  [(2, (0,1))],
+    9:  [(3, (0,1)), (4, (1,2)), (5, (2,0))],
+    16: [(4, (0,1)), (5, (1,2)), (6, (2,3)), (7, (3,0))],
+    10: [(4, (0,1)), (5, (1,2)), (6, (2,3)), (7, (3,0)), (8, (0,1,2,3))]
+}
+
+# Number of corners of the sides of a discontinuity for each gmsh element type
+sideCorners = {1: 2, 8: 2, 2: 3, 9: 3, 3: 4, 10: 4, 16: 4}
+
+class NodeSplit:
+    """
+    Result of the duplication of the nodes of a discontinuity (see splitNodes)
+
+    Parameters:
+    - _duplicatedNodes:   (nDuplicated, 2) tags of each original node and of its duplicate,
+                          in ascending order of the duplicates (a node at a junction of
+                          fractures has more than one duplicate)
+    - _elementTags:       tag of the element of each node replaced by a duplicate
+    - _originalNodes:     tag of each replaced node
+    - _newNodes:          tag of the duplicate that replaces it
+    - _interfaceElements: (nInterface, nNodes) connectivity of the interface elements
+    - _interfaceCorners:  (nInterface, nFaceNodes) original tag of the node at the position of
+                          each node of the first face of the interface elements
+    """
+
+    def __init__(self, _duplicatedNodes, _elementTags, _originalNodes, _newNodes, _interfaceElements, _interfaceCorners):
+        self.duplicatedNodes   = _duplicatedNodes
+        self.interfaceElements = _interfaceElements
+        self.interfaceCorners  = _interfaceCorners
+
+        # Replacements sorted by (element tag, original node tag)
+        self.base  = int(max(_originalNodes.max(initial=0), _newNodes.max(initial=0))) + 1
+        keys       = _elementTags * self.base + _originalNodes
+        order      = np.argsort(keys)
+        self.keys  = keys[order]
+        self.nodes = _newNodes[order]
+
+    # ---------------------------------------------------------------------
+    def apply(self, elemTags, elemNodes):
+        """
+        Return a copy of the connectivity of a block of elements with the nodes
+        of the side 2 of the discontinuity replaced by their duplicates
+
+        Parameters:
+        - elemTags:  tag of each element
+        - elemNodes: (nElem, nNodes) node tags
+        """
+        elemNodes = np.array(elemNodes)
+        if len(self.keys) == 0 or len(elemNodes) == 0:
+            return elemNodes
+        keys     = np.asarray(elemTags, dtype=np.int64)[:, None] * self.base + elemNodes.astype(np.int64)
+        position = findKeys(self.keys, keys.ravel()).reshape(keys.shape)
+        replaced = position >= 0
+        elemNodes[replaced] = self.nodes[position[replaced]]
+        return elemNodes
+
+def splitNodes(topology, sideBlocks, openBoundaryNodes = [], firstNewTag = None):
+    """
+    Duplicate the nodes of a discontinuity (a set of curves in 2D or surfaces
+    in 3D), replacing the gmsh Crack plugin.
+
+    The elements around each node of the discontinuity are grouped in
+    connected components, linking two elements when they share a side (edge
+    in 2D, face in 3D) with the node that is not a side of the discontinuity.
+    The component on side 1 of the first side where the node appears keeps
+    it and every other component receives a new node. The side 1 of a side
+    of the discontinuity is the element whose side has the same orientation
+    as it, so the normal of the discontinuity points from side 1 to side 2.
+
+    The discontinuity may be a network of intersecting fractures: the
+    components around the junctions are found in the same pass, so a node at
+    a T-junction receives two new nodes and a node at an X-junction three.
+    The orientation of the sides may change from one entity to the next, and
+    the interface elements are built from the nodes of each adjacent element
+    after the split. The cost is linear in the number of sides, up to the
+    sorts of the keys.
+
+    The nodes on the border of the discontinuity are not duplicated, unless
+    they are in openBoundaryNodes. The tips inside the domain are never
+    duplicated, since the elements around them form a single component.
+    Higher order nodes follow the side of the corners of their edge or face.
+
+    Parameters:
+    - topology:          MeshTopology of the continuum elements (with their element tags)
+    - sideBlocks:        list of (gmsh element type, (nSides, nNodes) node tags) of the
+                         elements of the discontinuity
+    - openBoundaryNodes: tags of the nodes of the border of the discontinuity to duplicate
+    - firstNewTag:       tag of the first duplicate (default: largest node tag + 1)
+
+    Returns a NodeSplit with the duplicated nodes, the nodes to replace in the
+    connectivity of the elements and the interface elements: {b1, b0, a1, a0}
+    in 2D, with {a0, a1} the edge of the element on side 1, followed by the
+    mid-side nodes {bm, am} in quadratic meshes, and the face of the element
+    on side 1 followed by the duplicates of its nodes in 3D.
+    """
+    kind = 'edges' if topology.dim == 2 else 'faces'
+    if firstNewTag is None:
+        firstNewTag = topology.maxNodeTag + 1
+    elementTags = topology.elementTags
+    if elementTags is None:
+        elementTags = np.arange(topology.numElements)
+    elementTags = np.asarray(elementTags, dtype=np.int64)
+
+    # Corners of the sides of the discontinuity
+    nCorners = set(sideCorners[sideType] for sideType, _ in sideBlocks)
+    if len(nCorners) > 1:
+        raise Exception("Discontinuities with both triangular and quadrilateral faces are not supported")
+    nCorners = nCorners.pop() if len(nCorners) > 0 else 2
+    corners  = np.concatenate([np.asarray(nodes, dtype=np.int64)[:, :nCorners] for _, nodes in sideBlocks] + [np.empty((0,nCorners), dtype=np.int64)])
+
+    # Element sides equal to each side of the discontinuity
+    sideNodes, sideElements, _ = topology.getElementSides(kind)
+    pointer, incidences        = topology.getSideElements(kind)
+    side = topology.findSides(kind, corners)
+    if np.any(side < 0) or np.any(pointer[side + 1] - pointer[side] != 2):
+        raise Exception("The discontinuity must be formed by sides shared by two elements")
+    inc1, inc2 = incidences[pointer[side]], incidences[pointer[side] + 1]
+
+    # The element side with the same orientation as the discontinuity is on side 1
+    start  = np.argmax(sideNodes[inc1, :nCorners] == corners[:, [0]], axis=1)
+    same   = sideNodes[inc1, (start + 1) % nCorners] == corners[:, 1]
+    inc1, inc2 = np.where(same, inc1, inc2), np.where(same, inc2, inc1)
+    elem1, elem2 = sideElements[inc1], sideElements[inc2]
+
+    # Corners on the border of the discontinuity: in a single side (2D) or on
+    # an edge of a single face (3D), the nodes of degree one in the graph of
+    # the sides. Junctions are in three or more sides.
+    if kind == 'edges':
+        borderEdges = corners.reshape((-1,1))
+    else:
+        borderEdges = np.sort(np.stack((corners, np.roll(corners, -1, axis=1)), axis=2).reshape((-1,2)), axis=1)
+    uniqueEdges, counts = np.unique(borderEdges, axis=0, return_counts=True)
+    border = np.zeros(topology.maxNodeTag + 1, dtype=bool)
+    border[uniqueEdges[counts == 1].ravel()] = True
+    border[np.asarray(openBoundaryNodes, dtype=np.int64)] = False
+
+    # Incidences of the nodes in the elements (node-to-element CSR), keyed by (node, element)
+    nodePointer, nodeElements = topology.getNodeElements()
+    numElements = max(topology.numElements, 1)
+    nodeOfIncidence = np.repeat(np.arange(len(nodePointer) - 1), np.diff(nodePointer))
+    incidenceKeys   = nodeOfIncidence * numElements + nodeElements
+
+    # Link the incidences of the corners of the discontinuity in two elements
+    # sharing a side that is not a side of the discontinuity
+    isCorner = np.zeros(topology.maxNodeTag + 1, dtype=bool)
+    isCorner[corners.ravel()] = True
+    isSide = np.zeros(len(pointer) - 1, dtype=bool)
+    isSide[side] = True
+    shared = np.flatnonzero((np.diff(pointer) == 2) & ~isSide)
+    sharedInc1, sharedInc2 = incidences[pointer[shared]], incidences[pointer[shared] + 1]
+    link1, link2 = [], []
+    for j in range(sideNodes.shape[1]):
+        nodes  = sideNodes[sharedInc1, j]
+        linked = np.flatnonzero(nodes >= 0)
+        linked = linked[isCorner[nodes[linked]]]
+        nodes  = nodes[linked]
+        link1.append(findKeys(incidenceKeys, nodes * numElements + sideElements[sharedInc1[linked]]))
+        link2.append(findKeys(incidenceKeys, nodes * numElements + sideElements[sharedInc2[linked]]))
+    link1, link2 = np.concatenate(link1), np.concatenate(link2)
+    graph = coo_matrix((np.ones(len(link1)), (link1, link2)), shape=(len(incidenceKeys), len(incidenceKeys)))
+    numComponents, component = connected_components(graph, directed=False)
+
+    # Component of the incidence of each corner in the element on side 1 of
+    # the first side where it appears: this incidence keeps the original node
+    cornerNodes, first = np.unique(corners.ravel(), return_index=True)
+    keptComponent = np.full(topology.maxNodeTag + 1, -1, dtype=np.int64)
+    keptComponent[cornerNodes] = component[findKeys(incidenceKeys, cornerNodes * numElements + np.repeat(elem1, nCorners)[first])]
+    keptComponent[border] = -1
+
+    # Every other component around a corner receives a new node: one at a
+    # discontinuity, two at a T-junction and three at an X-junction. The new
+    # nodes are numbered in the order of the corners.
+    replaced = np.flatnonzero(keptComponent[nodeOfIncidence] >= 0)
+    replaced = replaced[component[replaced] != keptComponent[nodeOfIncidence[replaced]]]
+    splitComponents, position = np.unique(component[replaced], return_index=True)
+    order           = np.lexsort((splitComponents, nodeOfIncidence[replaced[position]]))
+    splitComponents = splitComponents[order]
+    newTag = np.full(numComponents, -1, dtype=np.int64)
+    newTag[splitComponents] = firstNewTag + np.arange(len(splitComponents))
+    nextNewTag = firstNewTag + len(splitComponents)
+    isSplit = np.zeros(topology.maxNodeTag + 1, dtype=bool)
+    isSplit[nodeOfIncidence[replaced]] = True
+
+    replacedElements = [nodeElements[replaced]]
+    replacedNodes    = [nodeOfIncidence[replaced]]
+    replacedNewNodes = [newTag[component[replaced]]]
+    duplicatedNodes  = [np.stack((nodeOfIncidence[replaced[position[order]]], newTag[splitComponents]), axis=1)]
+
+    # Higher order nodes follow the component of the first split corner of
+    # their edge or face, with a new node for each component that is not kept
+    higherOrder, reference = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    for sideType, nodes in sideBlocks:
+        nodes = np.asarray(nodes, dtype=np.int64)
+        for local, localCorners in sideHigherOrderNodes.get(sideType, []):
+            splitCorners = nodes[:, list(localCorners)]
+            hasSplit     = isSplit[splitCorners]
+            rows         = np.flatnonzero(hasSplit.any(axis=1))
+            higherOrder.append(nodes[rows, local])
+            reference.append(splitCorners[rows, np.argmax(hasSplit[rows], axis=1)])
+    higherOrder, first = np.unique(np.concatenate(higherOrder), return_index=True)
+    reference = np.concatenate(reference)[first]
+    if len(higherOrder) > 0:
+        count     = nodePointer[higherOrder + 1] - nodePointer[higherOrder]
+        position  = np.repeat(nodePointer[higherOrder] - np.cumsum(count) + count, count) + np.arange(count.sum())
+        elements  = nodeElements[position]
+        reference = np.repeat(reference, count)
+        nodes     = np.repeat(higherOrder, count)
+        split     = newTag[component[findKeys(incidenceKeys, reference * numElements + elements)]]
+        onSplit   = np.flatnonzero(split >= 0)
+        pairs, inverse = np.unique(np.stack((nodes[onSplit], split[onSplit]), axis=1), axis=0, return_inverse=True)
+        inverse   = inverse.ravel()
+
+        # A node without elements in the kept component of its reference
+        # corner (next to a junction) is kept by its first component
+        kept = np.ones(topology.maxNodeTag + 1, dtype=bool)
+        kept[nodes[onSplit]] = False
+        kept[nodes[split < 0]] = True
+        keptPair = np.concatenate(([True], pairs[1:,0] != pairs[:-1,0])) & ~kept[pairs[:,0]]
+        pairTags = np.empty(len(pairs), dtype=np.int64)
+        pairTags[~keptPair] = nextNewTag + np.arange(np.count_nonzero(~keptPair))
+        newPair  = ~keptPair[inverse]
+        replacedElements.append(elements[onSplit[newPair]])
+        replacedNodes.append(nodes[onSplit[newPair]])
+        replacedNewNodes.append(pairTags[inverse[newPair]])
+        duplicatedNodes.append(np.stack((pairs[~keptPair,0], pairTags[~keptPair]), axis=1))
+
+    replacedElements = np.concatenate(replacedElements)
+    replacedNodes    = np.concatenate(replacedNodes)
+    replacedNewNodes = np.concatenate(replacedNewNodes)
+    duplicatedNodes  = np.concatenate(duplicatedNodes)
+
+    # Node of each corner of the side of the element on side 1 in both
+    # adjacent elements, after the new nodes replace the original nodes
+    corners = sideNodes[inc1, :nCorners]
+    def splitCorner(elements):
+        splitNodes = np.empty_like(corners)
+        for j in range(nCorners):
+            nodes   = corners[:,j]
+            newNode = newTag[component[findKeys(incidenceKeys, nodes * numElements + elements)]]
+            splitNodes[:,j] = np.where(newNode >= 0, newNode, nodes)
+        return splitNodes
+    bottom, top = splitCorner(elem1), splitCorner(elem2)
+
+    # Interface elements: {b1, b0, a1, a0} in 2D, bottom and top faces in 3D
+    nodeSplit = NodeSplit(duplicatedNodes, elementTags[replacedElements], replacedNodes, replacedNewNodes, None, corners)
+    if kind == 'edges':
+        nodeSplit.interfaceElements = np.stack((top[:,0], top[:,1], bottom[:,1], bottom[:,0]), axis=1)
+
+        # Mid-side nodes of quadratic elements, {bm, am}, after the split
+        midNodes = topology.getEdgeMidNodes()
+        if len(inc1) > 0 and np.all(midNodes[inc1] >= 0):
+            topMid    = nodeSplit.apply(elementTags[elem2], midNodes[inc2][:, None])
+            bottomMid = nodeSplit.apply(elementTags[elem1], midNodes[inc1][:, None])
+            nodeSplit.interfaceElements = np.hstack((nodeSplit.interfaceElements, topMid, bottomMid))
+            nodeSplit.interfaceCorners  = np.hstack((corners, midNodes[inc1][:, None]))
+    else:
+        nodeSplit.interfaceElements = np.hstack((bottom, top))
+
+    return nodeSplit
@@ -0,0 +1,60 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+
+# Largest ratio between the largest node tag and the number of nodes for which
+# the tags are looked up in a dense array instead of a sorted one
+DENSE_LOOKUP_RATIO = 16
+
+class NodeNumbering:
+    """
+    Contiguous numbering of the nodes written in the mesh file: the node in
+    position i of the table of nodes has id i + 1, whatever its gmsh tag. The
+    ids of the node tags of the connectivities, interface elements and node
+    sets are looked up in an array indexed by the tag when the tags are dense,
+    or by a binary search in the sorted tags otherwise.
+
+    Parameters:
+    - _nodeTags: gmsh tags of the nodes, in the order of the table of nodes
+
+    Usage:
+        numbering = NodeNumbering(snapshot.nodeTags)
+        ids = numbering.getIds(elemNodes)
+    """
+
+    def __init__(self, _nodeTags):
+        tags          = np.asarray(_nodeTags, dtype=np.int64)
+        self.numNodes = len(tags)
+        self.maxTag   = int(tags.max(initial=0))
+        self.dense    = self.maxTag <= DENSE_LOOKUP_RATIO * self.numNodes
+        if self.dense:
+            dtype      = np.int32 if self.numNodes < 2**31 else np.int64
+            self.index = np.zeros(self.maxTag + 1, dtype=dtype)
+            self.index[tags] = np.arange(1, self.numNodes + 1, dtype=dtype)
+        else:
+            self.order      = np.argsort(tags)
+            self.sortedTags = tags[self.order]
+
+    # ---------------------------------------------------------------------
+    def getIds(self, nodeTags):
+        """
+        Return the ids (1 to the number of nodes) of an array of node tags,
+        with the same shape
+        """
+        tags = np.asarray(nodeTags, dtype=np.int64)
+        if self.dense:
+            ids = self.index[np.minimum(tags, self.maxTag)]
+            ids[tags > self.maxTag] = 0
+        elif self.numNodes > 0:
+            position = np.minimum(np.searchsorted(self.sortedTags, tags), self.numNodes - 1)
+            ids = np.where(self.sortedTags[position] == tags, self.order[position] + 1, 0)
+        else:
+            ids = np.zeros(tags.shape, dtype=np.int64)
+        if np.any(ids == 0):
+            raise Exception("The mesh refers to nodes that are not in the nodes physical group")
+        return ids
@@ -0,0 +1,125 @@
+# ------------------------------------------------------------------------------
+#
+# Author: Danilo Cavalcanti
+# October 2026
+#
+# ------------------------------------------------------------------------------
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+# Node orderings available in the export (see gemaMesh.setRenumbering)
+renumberingMethods = ('none', 'RCMK', 'Hilbert', 'Morton')
+
+def nodeAdjacency(elementChunks, nodeTags):
+    """
+    Node-to-node adjacency of the nodes of the mesh, in the order of the table
+    of nodes, with the diagonal. The connectivity is consumed one chunk at a
+    time: only the pairs of nodes of each chunk are kept.
+
+    Parameters:
+    - elementChunks: iterable of (nElem, nNodes) node tags of the elements that
+                     couple nodes (continuum and interface elements)
+    - nodeTags:      gmsh tags of the nodes, in the order of the table of nodes
+    """
+    nodeTags = np.asarray(nodeTags, dtype=np.int64)
+    numNodes = len(nodeTags)
+    position = np.full(int(nodeTags.max(initial=0)) + 1, -1, dtype=np.int64)
+    position[nodeTags] = np.arange(numNodes)
+
+    # Pattern of incidence^T incidence of each chunk, ignoring the nodes that
+    # are not in the table of nodes
+    rows, columns = [np.arange(numNodes)], [np.arange(numNodes)]
+    for chunk in elementChunks:
+        chunk = np.asarray(chunk, dtype=np.int64)
+        if chunk.size == 0:
+            continue
+        chunk = chunk.reshape((len(chunk), -1))
+        ids   = np.where(chunk < len(position), position[np.minimum(chunk, len(position) - 1)], -1)
+        valid = ids >= 0
+        incidence = csr_matrix((np.ones(int(valid.sum())), ids[valid], np.concatenate(([0], np.cumsum(valid.sum(axis=1))))), shape=(len(chunk), numNodes))
+        pairs = (incidence.T @ incidence).tocoo()
+        rows.append(pairs.row)
+        columns.append(pairs.col)
+    rows, columns = np.concatenate(rows), np.concatenate(columns)
+    adjacency = csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(numNodes, numNodes))
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1.0
+    return adjacency
+
+def bandwidthAndProfile(adjacency, position):
+    """
+    Bandwidth and profile (number of entries of the lower envelope) of a
+    symmetric matrix with the given numbering of its rows
+
+    Parameters:
+    - adjacency: sparse matrix with the diagonal (see nodeAdjacency)
+    - position:  new position of each row
+    """
+    if adjacency.shape[0] == 0:
+        return 0, 0
+    lowest = np.minimum.reduceat(position[adjacency.indices], adjacency.indptr[:-1])
+    return int(np.max(position - lowest)), int(np.sum(position - lowest))
+
+def spaceFillingKeys(coords, curve):
+    """
+    Keys of the points along a Hilbert or Morton (Z-order) curve on the grid
+    of 2**bits cells per direction around their bounding box
+
+    Parameters:
+    - coords: (nPoints, dim) coordinates
+    - curve:  'Hilbert' or 'Morton'
+    """
+    numPoints, dim = coords.shape
+    bits    = 63 // dim
+    lower   = coords.min(axis=0, initial=np.inf) if numPoints > 0 else np.zeros(dim)
+    extent  = np.maximum(np.ptp(coords, axis=0) if numPoints > 0 else np.zeros(dim), np.finfo(float).tiny)
+    grid    = np.minimum((coords - lower) / extent * 2**bits, 2**bits - 1).astype(np.uint64)
+
+    # Hilbert: Skilling's transform of the coordinates to the transposed key
+    if curve == 'Hilbert':
+        one = np.uint64(1)
+        q   = one << np.uint64(bits - 1)
+        while q > one:
+            p = q - one
+            for i in range(dim):
+                upper = (grid[:,i] & q) != 0
+                grid[upper,0] ^= p
+                swap = (grid[~upper,0] ^ grid[~upper,i]) & p
+                grid[~upper,0] ^= swap
+                grid[~upper,i] ^= swap
+            q >>= one
+        for i in range(1, dim):
+            grid[:,i] ^= grid[:,i-1]
+        flip = np.zeros(numPoints, dtype=np.uint64)
+        q    = one << np.uint64(bits - 1)
+        while q > one:
+            flip[(grid[:,dim-1] & q) != 0] ^= q - one
+            q >>= one
+        grid ^= flip[:, None]
+
+    # Interleave the bits of the directions, from the most significant
+    keys = np.zeros(numPoints, dtype=np.uint64)
+    for b in range(bits - 1, -1, -1):
+        for i in range(dim):
+            keys = (keys << np.uint64(1)) | ((grid[:,i] >> np.uint64(b)) & np.uint64(1))
+    return keys
+
+def computeNodeOrder(method, adjacency, coords):
+    """
+    Order of the nodes given by a renumbering method: the position in the
+    table of nodes of the node placed in each new position
+
+    Parameters:
+    - method:    'none', 'RCMK', 'Hilbert' or 'Morton'
+    - adjacency: node-to-node adjacency (see nodeAdjacency)
+    - coords:    (nNodes, dim) node coordinates
+    """
+    if method not in renumberingMethods:
+        raise Exception(f"Unknown node renumbering method {method}: use one of {renumberingMethods}")
+    if method == 'none':
+        return np.arange(adjacency.shape[0])
+    if method == 'RCMK':
+        return np.asarray(reverse_cuthill_mckee(adjacency, symmetric_mode=True), dtype=np.int64)
+    return np.argsort(spaceFillingKeys(coords, method), kind='stable')
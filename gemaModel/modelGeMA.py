@@ -17,6 +17,7 @@ from gemaModel.boundaryConditions.boundaryConditionGeMA_NodePorePressure import
 from gemaModel.boundaryConditions.boundaryConditionGeMA_NodePoreFlow import boundaryConditionsGema_NodePoreFlow
 from gemaModel.mesh.gmsh2GeMA_ElementTypes import gmsh2GeMA_elementTypes
 from gemaModel.mesh.gema_IntegrationRules import gema_elementIntegrationRules
+from gemaModel.exportSession import exportSession, DEFAULT_BUFFER_SIZE
 
 class modelGeMA:
     def __init__(self, _problemName = 'none', _physics = []):
@@ -34,6 +35,7 @@ class modelGeMA:
         self.numBoundaryConditions     = 0
         self.matParametersDescriptions = parameter_descriptions
         self.matParametersUnits        = parameter_units
+        self.bufferSize                = DEFAULT_BUFFER_SIZE
         self.fileName                  = 'gemaFiles\\' + _problemName + '_model.lua'
 
     # ---------------------------------------------------------------------
@@ -50,6 +52,10 @@ class modelGeMA:
     def setMesh(self,_mesh):
         self.mesh = _mesh
 
+    # ---------------------------------------------------------------------
+    def setBufferSize(self, _bufferSize):
+        self.bufferSize = _bufferSize
+
     # --------------------------------------------------------------------- 
     def addMaterial(self,_materialName,_materialData):
         if _materialData['materialType'] == 'elastic':
@@ -78,221 +84,208 @@ class modelGeMA:
         self.boundaryConditions.append(bc)
 
     # ---------------------------------------------------------------------
-    def openFile(self):
-        with open(self.fileName, 'w') as file:
-            file.write('------------------ Model generated by gmsh2GeMA conversor - Tecgraf Institute ------------------\n\n')
+    def openFile(self, file):
+        file.write('------------------ Model generated by gmsh2GeMA conversor - Tecgraf Institute ------------------\n\n')
 
     # ---------------------------------------------------------------------
     def writeModelFile(self):
-        self.openFile()
-        self.writeStateVariables()
-        self.writeMaterials()
-        self.writeAdditionalPropSet()
-        self.writeMesh()
-        self.writeBoundaryConditions()
+        with exportSession(self.fileName, self.bufferSize) as file:
+            self.openFile(file)
+            self.writeStateVariables(file)
+            self.writeMaterials(file)
+            self.writeAdditionalPropSet(file)
+            self.writeMesh(file)
+            self.writeBoundaryConditions(file)
 
     # ---------------------------------------------------------------------
-    def writeStateVariables(self):
-        with open(self.fileName, 'a') as file:
-            file.write('-------------------------------------------------------------\n')
-            file.write('--  State variables\n')
-            file.write('-------------------------------------------------------------\n')
-            for var in self.stateVariables:
-                if var == 'u':
-                    file.write("StateVar{id = 'u', dim = 2, description = 'Displacements in the X and Y directions', unit = 'm',   format = '8.4f', groupName = 'mechanic'}\n")
-                elif var == 'P':
-                    file.write("StateVar{id = 'P', dim = 1, description = 'Pore pressure degree-of-freedom',         unit = 'kPa', format = '8.4f', groupName = 'hydraulic'}\n")
-                elif var == 'T':
-                    file.write("StateVar{id = 'T', dim = 1, description = 'Temperature',                             unit = 'K',   format = '8.4f', groupName = 'temperature', defVal = 0.0}\n\n")
+    def writeStateVariables(self, file):
+        file.write('-------------------------------------------------------------\n')
+        file.write('--  State variables\n')
+        file.write('-------------------------------------------------------------\n')
+        for var in self.stateVariables:
+            if var == 'u':
+                file.write("StateVar{id = 'u', dim = 2, description = 'Displacements in the X and Y directions', unit = 'm',   format = '8.4f', groupName = 'mechanic'}\n")
+            elif var == 'P':
+                file.write("StateVar{id = 'P', dim = 1, description = 'Pore pressure degree-of-freedom',         unit = 'kPa', format = '8.4f', groupName = 'hydraulic'}\n")
+            elif var == 'T':
+                file.write("StateVar{id = 'T', dim = 1, description = 'Temperature',                             unit = 'K',   format = '8.4f', groupName = 'temperature', defVal = 0.0}\n\n")
 
     # ---------------------------------------------------------------------
-    def writeMaterials(self):
-        self.writeMaterialHeader()
-        self.writeMaterialProperties()
-        self.writeMaterialValues()
+    def writeMaterials(self, file):
+        self.writeMaterialHeader(file)
+        self.writeMaterialProperties(file)
+        self.writeMaterialValues(file)
 
     # ---------------------------------------------------------------------
-    def writeAdditionalPropSet(self):
+    def writeAdditionalPropSet(self, file):
         pass
 
     # ---------------------------------------------------------------------
-    def writeMesh(self):
-        self.writeMeshHeader()
-        self.writeLoadMeshFile()
-        self.writeMeshElements()
-        self.writeMeshDefinition()
+    def writeMesh(self, file):
+        self.writeMeshHeader(file)
+        self.writeLoadMeshFile(file)
+        self.writeMeshElements(file)
+        self.writeMeshDefinition(file)
 
     # ---------------------------------------------------------------------
-    def writeBoundaryConditions(self):
-        self.writeBoundaryConditionsHeader()
+    def writeBoundaryConditions(self, file):
+        self.writeBoundaryConditionsHeader(file)
         for i in range(self.numBoundaryConditions):
-            self.boundaryConditions[i].writeBoundaryCondition(self.fileName)
+            self.boundaryConditions[i].writeBoundaryCondition(file)
 
     # ---------------------------------------------------------------------
-    def writeMeshHeader(self):
-        with open (self.fileName,'a') as file:
-            file.write("\n-------------------------------------------------------------\n")
-            file.write("--  Mesh definition\n")
-            file.write("-------------------------------------------------------------\n\n")
+    def writeMeshHeader(self, file):
+        file.write("\n-------------------------------------------------------------\n")
+        file.write("--  Mesh definition\n")
+        file.write("-------------------------------------------------------------\n\n")
 
     # ---------------------------------------------------------------------
-    def writeLoadMeshFile(self):
-        with open (self.fileName,'a') as file:
-            file.write("meshInfo = dofile('$SIMULATIONDIR/$SIMULATIONNAME_mesh.lua')\n\n")
+    # The mesh file is also the master file of a sharded mesh (see
+    # gemaMesh.setShardSize): it loads the shards next to it
+    def writeLoadMeshFile(self, file):
+        file.write("meshInfo = dofile('$SIMULATIONDIR/$SIMULATIONNAME_mesh.lua')\n\n")
 
     # ---------------------------------------------------------------------
-    def writeMeshElements(self):
-
-        with open(self.fileName, 'a') as file:
-
-            file.write('local mesh_elements = {\n')
-
-            for physicalGroupTag in self.mesh.cellPhysicalGroups:
-
-                # Get the name of the physical group
-                physicalGroupName = self.mesh.gmsh.model.getPhysicalName(self.mesh.dim, physicalGroupTag)
-
-                # Get the entities tags associated with this physical group
-                entitiesTags = self.mesh.gmsh.model.getEntitiesForPhysicalGroup(self.mesh.dim,physicalGroupTag)
-
-                # Get the element types present in the physical group with the specified dimension
-                elemTypes = []
-                for entityTag in entitiesTags:
-                    entityElemTypes = self.mesh.gmsh.model.mesh.getElementTypes(self.mesh.dim, entityTag)
-                    elemTypes.extend(entityElemTypes)
-                elemTypes = list(set(elemTypes))
-
-                # Print the elements of the specified element type 
-                for elemType in elemTypes:
-                    gemaElement = gmsh2GeMA_elementTypes[elemType]
-                    file.write('\t\t{')
-                    file.write(f' cellType  = \'{gemaElement}\', ')
-                    file.write(f' cellGroup = \'{physicalGroupName}_{gemaElement}\', ')
-                    file.write(f' cellList  = meshInfo.{gemaElement}_{physicalGroupName}, ')
-                    file.write(f' MatProp   = \'{self.materialsId[physicalGroupName]}\' ')
-                    if self.mesh.dim == 2:
-                        file.write(f', SecProp   = 1 ')
-                    file.write('},\n')
-
-            if self.mesh.hasDiscontinuitySet:    #TODO: generalize to other types of interface elements + XFEM
-                # Get the name of the physical group
-                physicalGroupName = self.mesh.gmsh.model.getPhysicalName(1, self.mesh.discontinuitySetPhysicalGroup)
-                # Print the interface element data
+    def writeMeshElements(self, file):
+
+        snapshot = self.mesh.getSnapshot()
+
+        file.write('local mesh_elements = {\n')
+
+        for physicalGroupTag in self.mesh.cellPhysicalGroups:
+
+            # Get the name of the physical group
+            physicalGroupName = snapshot.getPhysicalName(self.mesh.dim, physicalGroupTag)
+
+            # Print the elements of the specified element type 
+            for elemType in snapshot.cellGroupTypes[physicalGroupTag]:
+                gemaElement = gmsh2GeMA_elementTypes[elemType]
                 file.write('\t\t{')
-                file.write(f' cellType  = \'int2dl4\', ')                   
-                file.write(f' cellGroup = \'{physicalGroupName}_int2dl4\', ')
-                file.write(f' cellList  = meshInfo.int2dl4_{physicalGroupName}, ')
+                file.write(f' cellType  = \'{gemaElement}\', ')
+                file.write(f' cellGroup = \'{physicalGroupName}_{gemaElement}\', ')
+                file.write(f' cellList  = meshInfo.{gemaElement}_{physicalGroupName}, ')
                 file.write(f' MatProp   = \'{self.materialsId[physicalGroupName]}\' ')
                 if self.mesh.dim == 2:
                     file.write(f', SecProp   = 1 ')
                 file.write('},\n')
 
-            file.write('}\n')
+        if self.mesh.hasDiscontinuitySet:    #TODO: generalize to other types of interface elements + XFEM
+            # Get the name of the physical group
+            physicalGroupName = snapshot.getPhysicalName(self.mesh.dim-1, self.mesh.discontinuitySetPhysicalGroup)
+            # Print the interface element data
+            gemaElement = self.mesh.getInterfaceElementType()
+            file.write('\t\t{')
+            file.write(f' cellType  = \'{gemaElement}\', ')                   
+            file.write(f' cellGroup = \'{physicalGroupName}_{gemaElement}\', ')
+            file.write(f' cellList  = meshInfo.{gemaElement}_{physicalGroupName}, ')
+            file.write(f' MatProp   = \'{self.materialsId[physicalGroupName]}\' ')
+            if self.mesh.dim == 2:
+                file.write(f', SecProp   = 1 ')
+            file.write('},\n')
+
+        file.write('}\n')
 
     # ---------------------------------------------------------------------
-    def writeMeshDefinition(self):
+    def writeMeshDefinition(self, file):
 
-        with open (self.fileName,'a') as file:
-            file.write('\nMesh\n')
-            file.write('{\n')
-            
-            file.write('   -- General mesh attributes\n')
-            file.write('   id          = \'mesh\',\n')
-            file.write('   typeName    = \'GemaMesh.elem\',\n')             #TODO: generalize to XFEM
-            file.write('   description = \'Mesh discretization\',\n')
-            file.write('\n')
-
-            file.write('   -- Mesh dimensions\n')
-            file.write(f'   coordinateDim  = {self.mesh.dim},\n')
-            file.write(f'   coordinateUnit = \'{self.mesh.coordinateUnits}\',\n')
-            file.write('\n')
-
-            file.write('   -- State vars stored in this mesh (per node)\n')
-            file.write('   stateVars = {')
-            for var in self.stateVariables:
-                file.write(f' \'{var}\',')
-            file.write('},\n')
-            file.write('\n')   
+        snapshot = self.mesh.getSnapshot()
 
-            file.write('   -- Mesh node coordinates\n')
-            file.write('   nodeData = meshInfo.nodes,\n')
-            file.write('\n')  
-
-            file.write('   -- Element data\n')  
-            if self.mesh.dim == 2:
-                file.write('   cellProperties = {\'MatProp\'},\n')
-            elif self.mesh.dim == 3:
-                file.write('   cellProperties = {\'MatProp\',\'SecProp\'},\n')  
-            file.write('   cellData = mesh_elements,\n')
-            file.write('\n')
-
-            file.write('   -- Node sets\n')   
-            file.write('   nodeSetData = {\n')
-            for dimPhysicalGroup,physicalGroupTag in self.mesh.nodeSetData:
-                # Get the name of the data set
-                nodeSetName = self.mesh.gmsh.model.getPhysicalName(dimPhysicalGroup, physicalGroupTag)
-                file.write(f'      {{id = \'{nodeSetName}\', nodeList = meshInfo.nodeList_{nodeSetName}}},\n')
-            file.write('     },\n')
-            file.write('\n')
-
-            file.write('   -- IntegrationRules\n')  
-            file.write('   elementRules = {\n')
-            elemTypes = self.mesh.getElementTypes()
-            file.write('      {')
-            for gmshElemType in elemTypes:
-                gemaElementType = gmsh2GeMA_elementTypes[gmshElemType]
-                file.write(f' {gemaElementType} = {gema_elementIntegrationRules[gemaElementType]},')
-            file.write('}\n')
-            file.write('   },\n') 
-            file.write('}\n') 
+        file.write('\nMesh\n')
+        file.write('{\n')
+            
+        file.write('   -- General mesh attributes\n')
+        file.write('   id          = \'mesh\',\n')
+        file.write('   typeName    = \'GemaMesh.elem\',\n')             #TODO: generalize to XFEM
+        file.write('   description = \'Mesh discretization\',\n')
+        file.write('\n')
+
+        file.write('   -- Mesh dimensions\n')
+        file.write(f'   coordinateDim  = {self.mesh.dim},\n')
+        file.write(f'   coordinateUnit = \'{self.mesh.coordinateUnits}\',\n')
+        file.write('\n')
+
+        file.write('   -- State vars stored in this mesh (per node)\n')
+        file.write('   stateVars = {')
+        for var in self.stateVariables:
+            file.write(f' \'{var}\',')
+        file.write('},\n')
+        file.write('\n')   
+
+        file.write('   -- Mesh node coordinates\n')
+        file.write('   nodeData = meshInfo.nodes,\n')
+        file.write('\n')  
+
+        file.write('   -- Element data\n')  
+        if self.mesh.dim == 2:
+            file.write('   cellProperties = {\'MatProp\'},\n')
+        elif self.mesh.dim == 3:
+            file.write('   cellProperties = {\'MatProp\',\'SecProp\'},\n')  
+        file.write('   cellData = mesh_elements,\n')
+        file.write('\n')
+
+        file.write('   -- Node sets\n')   
+        file.write('   nodeSetData = {\n')
+        for dimPhysicalGroup,physicalGroupTag in self.mesh.nodeSetData:
+            # Get the name of the data set
+            nodeSetName = snapshot.getPhysicalName(dimPhysicalGroup, physicalGroupTag)
+            file.write(f'      {{id = \'{nodeSetName}\', nodeList = meshInfo.nodeList_{nodeSetName}}},\n')
+        file.write('     },\n')
+        file.write('\n')
+
+        file.write('   -- IntegrationRules\n')  
+        file.write('   elementRules = {\n')
+        elemTypes = snapshot.elementTypes
+        file.write('      {')
+        for gmshElemType in elemTypes:
+            gemaElementType = gmsh2GeMA_elementTypes[gmshElemType]
+            file.write(f' {gemaElementType} = {gema_elementIntegrationRules[gemaElementType]},')
+        file.write('}\n')
+        file.write('   },\n') 
+        file.write('}\n') 
 
 
     # ---------------------------------------------------------------------
-    def writeMaterialProperties(self):
+    def writeMaterialProperties(self, file):
 
         # Get the material parameters of all materials present in the model
         parameters = self.getMaterialParameters()
 
         # Open the file to write the material properties
-        with open (self.fileName,'a') as file:
-            file.write('  properties  = {\n')
-            for param in parameters:
-                matprop = '    {id= ' + param + ', description = \'' + self.matParametersDescriptions[param] + '\',  unit = \'' + self.matParametersUnits[param] + '\'},\n'
-                file.write(matprop)
-            file.write("  },\n")
+        file.write('  properties  = {\n')
+        for param in parameters:
+            matprop = '    {id= ' + param + ', description = \'' + self.matParametersDescriptions[param] + '\',  unit = \'' + self.matParametersUnits[param] + '\'},\n'
+            file.write(matprop)
+        file.write("  },\n")
 
     # --------------------------------------------------------------------- 
-    def writeMaterialValues(self):
+    def writeMaterialValues(self, file):
 
         # Open the file to write the material properties
-        with open (self.fileName,'a') as file:
-            file.write('  values  = {\n')
-            for mat in self.materials:
-                file.write("     {")
-                for param in mat.parametersId:
-                    file.write(f"    {param} = {mat.data[param]:.8e},")
-                file.write("  },\n")
-            file.write("  }\n")
-            file.write("}\n")
+        file.write('  values  = {\n')
+        for mat in self.materials:
+            file.write("     {")
+            for param in mat.parametersId:
+                file.write(f"    {param} = {mat.data[param]:.8e},")
+            file.write("  },\n")
+        file.write("  }\n")
+        file.write("}\n")
 
     # ---------------------------------------------------------------------
-    def writeMaterialHeader(self):
-
-        with open (self.fileName,'a') as file:
-            file.write('\n-------------------------------------------------------------\n')
-            file.write('--  Cell properties\n')
-            file.write('-------------------------------------------------------------\n')
-            file.write('PropertySet\n')
-            file.write('{\n')
-            file.write('  id= \'MatProp\',\n')
-            file.write('  typeName  = \'GemaPropertySet\',\n')
-            file.write('  description = \'Material properties\',\n')
+    def writeMaterialHeader(self, file):
+
+        file.write('\n-------------------------------------------------------------\n')
+        file.write('--  Cell properties\n')
+        file.write('-------------------------------------------------------------\n')
+        file.write('PropertySet\n')
+        file.write('{\n')
+        file.write('  id= \'MatProp\',\n')
+        file.write('  typeName  = \'GemaPropertySet\',\n')
+        file.write('  description = \'Material properties\',\n')
 
     # ---------------------------------------------------------------------
-    def writeBoundaryConditionsHeader(self):
-        with open (self.fileName,'a') as file:
-            file.write('-------------------------------------------------------------\n')
-            file.write('--  Boundary conditions\n')
-            file.write('-------------------------------------------------------------\n')
+    def writeBoundaryConditionsHeader(self, file):
+        file.write('-------------------------------------------------------------\n')
+        file.write('--  Boundary conditions\n')
+        file.write('-------------------------------------------------------------\n')
 
     
\ No newline at end of file
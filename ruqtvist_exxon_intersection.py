@@ -67,7 +67,11 @@ gmsh.option.setNumber("Geometry.ToleranceBoolean", 1)
 
 gmsh.model.add(problemName)
 
-# Create the nodes and the surface in the Gmsh model
+# Create the nodes and the surface in the Gmsh model, one OCC plane surface
+# per triangle. The faster addDiscreteSurfacesToGmshModel cannot be used here:
+# discrete surfaces are not in the OCC kernel, so they cannot be extruded nor
+# fragmented below. addBSplineSurfacesToGmshModel gives one OCC surface per
+# patch that goes through the same steps (see benchmarkDiscreteSurfaces)
 problemGeometry.addNodesToGmshModel(gmsh)
 problemGeometry.addSurfaceToGmshModel(gmsh)
 
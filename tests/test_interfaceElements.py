@@ -0,0 +1,61 @@
+import numpy as np
+from gemaModel.mesh.meshTopology import MeshTopology
+from gemaModel.mesh.interfaceElements import buildInterfaceElements, buildInterfaceElements3D, createMidPlaneNodes
+
+# Two unit quads split along x = 1 (as by the Crack plugin): the left one has
+# the nodes 2 (1,0) and 3 (1,1), the right one their duplicates 5 and 8
+LEFT_QUAD  = [1, 2, 3, 4]
+RIGHT_QUAD = [5, 6, 7, 8]
+
+# ---------------------------------------------------------------------
+def test_buildInterfaceElements_linear():
+    topology  = MeshTopology([(3, np.array([LEFT_QUAD, RIGHT_QUAD]))])
+    interface = buildInterfaceElements(topology, np.array([[2, 3]]), np.array([[5, 8]]))
+
+    # {b1, b0, a1, a0}, with {a0, a1} and {b0, b1} oriented as in their elements
+    assert interface.tolist() == [[5, 8, 3, 2]]
+
+    # The order of the nodes of the segments does not change the element
+    interface = buildInterfaceElements(topology, np.array([[3, 2]]), np.array([[8, 5]]))
+    assert interface.tolist() == [[5, 8, 3, 2]]
+
+# ---------------------------------------------------------------------
+def test_buildInterfaceElements_quadratic():
+    # 8-node quads: the mid-side nodes follow the corners, edge by edge
+    left  = LEFT_QUAD + [11, 12, 13, 14]
+    right = RIGHT_QUAD + [15, 16, 17, 18]
+    topology  = MeshTopology([(16, np.array([left, right]))])
+    interface = buildInterfaceElements(topology, np.array([[2, 3, 12]]), np.array([[5, 8, 18]]))
+
+    # int2dl6: {b1, b0, a1, a0, bm, am}
+    assert interface.tolist() == [[5, 8, 3, 2, 18, 12]]
+
+# ---------------------------------------------------------------------
+def test_buildInterfaceElements3D():
+    # Two unit hexes split along x = 1: the face {2, 3, 7, 6} of the left one
+    # has the duplicates {9, 10, 11, 12} in the right one
+    left  = [1, 2, 3, 4, 5, 6, 7, 8]
+    right = [9, 13, 14, 10, 12, 15, 16, 11]
+    coords = {1: (0,0,0), 2: (1,0,0), 3: (1,1,0), 4: (0,1,0), 5: (0,0,1), 6: (1,0,1), 7: (1,1,1), 8: (0,1,1),
+              9: (1,0,0), 10: (1,1,0), 11: (1,1,1), 12: (1,0,1), 13: (2,0,0), 14: (2,1,0), 15: (2,0,1), 16: (2,1,1)}
+    topology  = MeshTopology([(5, np.array([left, right]))])
+    interface = buildInterfaceElements3D(topology, np.array([[2, 3, 7, 6]]), np.array([[9, 10, 11, 12]]))
+    assert interface.shape == (1, 8)
+
+    # Bottom face oriented outwards from the left element, top face over it
+    bottom = np.array([coords[n] for n in interface[0, :4]])
+    top    = np.array([coords[n] for n in interface[0, 4:]])
+    assert set(interface[0, :4].tolist()) == {2, 3, 7, 6}
+    assert np.array_equal(bottom, top)
+    assert np.cross(bottom[1] - bottom[0], bottom[2] - bottom[0])[0] > 0
+
+# ---------------------------------------------------------------------
+def test_createMidPlaneNodes_shared_positions():
+    # Two interface elements meeting at the position of node 3
+    interface = np.array([[5, 8, 3, 2], [8, 9, 4, 3]])
+    positions = np.array([[3, 2], [4, 3]])
+    tripleNode, midPlaneNodes = createMidPlaneNodes(interface, positions, 100)
+    assert tripleNode.shape == (2, 6)
+    assert np.array_equal(tripleNode[:, :4], interface)
+    assert midPlaneNodes.tolist() == [[2, 100], [3, 101], [4, 102]]
+    assert tripleNode[:, 4:].tolist() == [[101, 100], [102, 101]]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from gemaModel.mesh.luaTableWriter import luaTable, writeNodeRows, writeRows, writeRangeRows, connectivityRowFormat, nodeListRowFormat, \
+    flatRowFormat, EXPAND_RANGES_FUNCTION, UNFLATTEN_FUNCTION, LOAD_SHARDS_FUNCTION
+
+lupa = pytest.importorskip('lupa')
+
+NODE_COORDS  = np.random.default_rng(0).random((50, 3))
+CONNECTIVITY = np.random.default_rng(1).integers(1, 51, (40, 4))
+NODE_LIST    = np.array([1, 2, 3, 4, 7, 9, 10, 11, 20, 21, 22, 23, 24, 50])
+
+# ---------------------------------------------------------------------
+def writeMeshTables(folder, compactLists = False, flatTables = False, shardSize = None, blockRows = 8):
+    """
+    Write the nodes, a connectivity and a node list as the mesh file does
+    and return the path of the file
+    """
+    file_path = folder / f"mesh_{int(compactLists)}{int(flatTables)}{shardSize or 0}.lua"
+    with open(file_path, 'w') as file:
+        file.write("local meshData = {}\n")
+        file.write(EXPAND_RANGES_FUNCTION + UNFLATTEN_FUNCTION + LOAD_SHARDS_FUNCTION)
+        with luaTable(file, 'nodes', shardSize) as rows:
+            if flatTables:
+                writeRows(rows, flatRowFormat("%.8e", 3), NODE_COORDS, blockRows)
+            else:
+                writeNodeRows(rows, NODE_COORDS, 3, blockRows)
+        file.write("meshData['nodes'] = " + ("unflatten(nodes, 3)" if flatTables else "nodes") + "\n")
+        with luaTable(file, 'quad4_rock', shardSize) as rows:
+            writeRows(rows, flatRowFormat("%d", 4) if flatTables else connectivityRowFormat(4), CONNECTIVITY, blockRows)
+        file.write("meshData['quad4_rock'] = " + ("unflatten(quad4_rock, 4)" if flatTables else "quad4_rock") + "\n")
+        with luaTable(file, 'nodeList_top', shardSize) as rows:
+            if compactLists:
+                writeRangeRows(rows, NODE_LIST, blockRows)
+            else:
+                writeRows(rows, nodeListRowFormat(), NODE_LIST.reshape((-1,1)), blockRows)
+        file.write("meshData['nodeList_top'] = " + ("expandRanges(nodeList_top)" if compactLists else "nodeList_top") + "\n")
+        file.write("return meshData\n")
+    return file_path
+
+# ---------------------------------------------------------------------
+def loadMeshTables(file_path):
+    """
+    Run the mesh file with Lua and return its tables as nested lists
+    """
+    lua = lupa.LuaRuntime()
+    def toList(value):
+        if lupa.lua_type(value) != 'table':
+            return value
+        return [toList(value[i]) for i in range(1, len(value) + 1)]
+    meshData = lua.eval(f"dofile('{file_path.as_posix()}')")
+    return {name: toList(meshData[name]) for name in ('nodes', 'quad4_rock', 'nodeList_top')}
+
+# ---------------------------------------------------------------------
+def test_plain_tables(tmp_path):
+    tables = loadMeshTables(writeMeshTables(tmp_path))
+    assert np.allclose(tables['nodes'], NODE_COORDS, rtol=1e-8)
+    assert tables['quad4_rock'] == CONNECTIVITY.tolist()
+    assert tables['nodeList_top'] == NODE_LIST.tolist()
+
+# ---------------------------------------------------------------------
+@pytest.mark.parametrize('compactLists, flatTables, shardSize', [(True, False, None), (False, True, None), (False, False, 1000), (True, True, 1000)])
+def test_encoded_tables(tmp_path, compactLists, flatTables, shardSize):
+    file_path = writeMeshTables(tmp_path, compactLists, flatTables, shardSize)
+    assert loadMeshTables(file_path) == loadMeshTables(writeMeshTables(tmp_path))
+
+    # The shards are next to the mesh file, each one under the size limit
+    # (a block of rows is never split)
+    shards = sorted(tmp_path.glob(file_path.stem + '_*.lua'))
+    assert (len(shards) > 3) == (shardSize is not None)
+    assert all(shard.stat().st_size <= shardSize for shard in shards)
+
+# ---------------------------------------------------------------------
+def test_compact_list_ranges(tmp_path):
+    text = open(writeMeshTables(tmp_path, compactLists=True)).read()
+    assert "{ 1, 4 }," in text and "{ 20, 24 }," in text and "{ 7, " not in text
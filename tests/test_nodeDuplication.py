@@ -0,0 +1,140 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from gemaModel.mesh.meshTopology import MeshTopology
+from gemaModel.mesh.nodeDuplication import splitNodes
+
+# ---------------------------------------------------------------------
+def gridTag(i, j, n = 4):
+    return j * (n + 1) + i + 1
+
+# ---------------------------------------------------------------------
+def quadGrid(n):
+    """
+    n x n grid of unit quads (gmsh type 3, counterclockwise): node tags
+    gridTag(i, j) at (i, j), element tags from 1 row by row
+    """
+    i, j   = np.meshgrid(np.arange(n + 1), np.arange(n + 1))
+    coords = np.stack((i.ravel(), j.ravel()), axis=1).astype(float)
+    quads  = np.array([[gridTag(i, j, n), gridTag(i + 1, j, n), gridTag(i + 1, j + 1, n), gridTag(i, j + 1, n)]
+                       for j in range(n) for i in range(n)])
+    return coords, quads
+
+# Segments of the discontinuities of the 4 x 4 grid: the vertical line x = 2
+# and the horizontal line y = 2, from their first node
+VERTICAL   = [[gridTag(2, j), gridTag(2, j + 1)] for j in range(4)]
+HORIZONTAL = [[gridTag(i, 2), gridTag(i + 1, 2)] for i in range(4)]
+
+# ---------------------------------------------------------------------
+def hexGrid(nx):
+    """
+    nx x 1 x 1 row of unit hexes (gmsh type 5): node tags 4*i + 1..4 at
+    x = i, element tags from 1
+    """
+    coords = np.array([[i, y, z] for i in range(nx + 1) for y, z in [(0,0), (1,0), (1,1), (0,1)]], dtype=float)
+    tag    = lambda i, k: 4 * i + k + 1
+    hexes  = np.array([[tag(i,0), tag(i+1,0), tag(i+1,1), tag(i,1), tag(i,3), tag(i+1,3), tag(i+1,2), tag(i,2)] for i in range(nx)])
+    return coords, hexes, tag
+
+# ---------------------------------------------------------------------
+def nodeCoordinates(coords, split, tags):
+    """
+    Coordinates of node tags, the duplicates at the position of their original node
+    """
+    original = np.arange(max(int(split.duplicatedNodes[:,1].max(initial=0)), len(coords)) + 1)
+    original[split.duplicatedNodes[:,1]] = split.duplicatedNodes[:,0]
+    return coords[original[np.asarray(tags)] - 1]
+
+# ---------------------------------------------------------------------
+def numberOfParts(elemNodes):
+    """
+    Number of groups of elements connected through shared nodes
+    """
+    numElements = len(elemNodes)
+    elements    = np.repeat(np.arange(numElements), elemNodes.shape[1])
+    incidence   = coo_matrix((np.ones(elemNodes.size), (elements, elemNodes.ravel())))
+    return connected_components(incidence @ incidence.T, directed=False)[0]
+
+# ---------------------------------------------------------------------
+def splitGrid(segments, openBoundaryNodes = []):
+    coords, quads = quadGrid(4)
+    elementTags = np.arange(1, len(quads) + 1)
+    split = splitNodes(MeshTopology([(3, quads)], elementTags), [(1, np.array(segments))], openBoundaryNodes)
+    return coords, quads, split, split.apply(elementTags, quads)
+
+# ---------------------------------------------------------------------
+def test_splitNodes_straight_fault():
+    _, quads, split, splitQuads = splitGrid(VERTICAL)
+
+    # The tips on the border of the domain are not duplicated
+    assert sorted(split.duplicatedNodes[:,0].tolist()) == [gridTag(2, 1), gridTag(2, 2), gridTag(2, 3)]
+    assert np.all(split.duplicatedNodes[:,1] > quads.max())
+
+    # The elements on the right of the fault receive the duplicates
+    isLeft = np.tile(np.arange(4) < 2, 4)
+    assert np.array_equal(splitQuads[isLeft], quads[isLeft])
+    assert np.intersect1d(splitQuads[isLeft], splitQuads[~isLeft]).tolist() == [gridTag(2, 0), gridTag(2, 4)]
+
+# ---------------------------------------------------------------------
+def test_splitNodes_open_boundary():
+    _, _, split, splitQuads = splitGrid(VERTICAL, [gridTag(2, 0), gridTag(2, 4)])
+    assert sorted(split.duplicatedNodes[:,0].tolist()) == [gridTag(2, j) for j in range(5)]
+    assert numberOfParts(splitQuads) == 2
+
+# ---------------------------------------------------------------------
+def test_splitNodes_x_junction():
+    _, quads, split, splitQuads = splitGrid(VERTICAL + HORIZONTAL, [gridTag(2, 0), gridTag(2, 4), gridTag(0, 2), gridTag(4, 2)])
+
+    # The node at the crossing gets one duplicate for each of the other three quadrants
+    assert np.count_nonzero(split.duplicatedNodes[:,0] == gridTag(2, 2)) == 3
+    assert numberOfParts(splitQuads) == 4
+    assert len(np.unique(splitQuads)) == len(np.unique(quads)) + len(split.duplicatedNodes)
+
+# ---------------------------------------------------------------------
+def test_splitNodes_t_junction():
+    _, _, split, splitQuads = splitGrid(VERTICAL + HORIZONTAL[:2], [gridTag(2, 0), gridTag(2, 4), gridTag(0, 2)])
+    assert np.count_nonzero(split.duplicatedNodes[:,0] == gridTag(2, 2)) == 2
+    assert numberOfParts(splitQuads) == 3
+
+# ---------------------------------------------------------------------
+def test_splitNodes_interface_elements_2D():
+    coords, _, split, splitQuads = splitGrid(VERTICAL)
+    interface = split.interfaceElements
+    assert interface.shape == (4, 4)
+
+    # {b1, b0, a1, a0}: node 0 over node 3 and node 1 over node 2
+    positions = nodeCoordinates(coords, split, interface)
+    assert np.array_equal(positions[:,0], positions[:,3])
+    assert np.array_equal(positions[:,1], positions[:,2])
+
+    # Each edge {a0, a1} and {b0, b1} is oriented counterclockwise in its
+    # element, which is on its left: side 1 on the left of the fault
+    for nodes, side in [(interface[:, [3, 2]], -1), (interface[:, [1, 0]], 1)]:
+        for n0, n1 in nodes:
+            element = [e for e in range(len(splitQuads)) if n0 in splitQuads[e] and n1 in splitQuads[e]]
+            assert len(element) == 1
+            center  = nodeCoordinates(coords, split, splitQuads[element[0]]).mean(axis=0)
+            edge    = nodeCoordinates(coords, split, [n1])[0] - nodeCoordinates(coords, split, [n0])[0]
+            toward  = center - nodeCoordinates(coords, split, [n0])[0]
+            assert edge[0] * toward[1] - edge[1] * toward[0] > 0
+            assert np.sign(center[0] - 2) == side
+
+# ---------------------------------------------------------------------
+def test_splitNodes_interface_elements_3D():
+    coords, hexes, tag = hexGrid(2)
+    elementTags = np.arange(1, len(hexes) + 1)
+    face  = np.array([[tag(1,0), tag(1,1), tag(1,2), tag(1,3)]])
+    split = splitNodes(MeshTopology([(5, hexes)], elementTags), [(3, face)], face.ravel())
+    interface = split.interfaceElements
+    assert interface.shape == (1, 8)
+
+    # Bottom face: the face of the element on side 1, with a normal towards
+    # side 2; top face: the duplicates in the same order
+    bottom, top = nodeCoordinates(coords, split, interface[0, :4]), nodeCoordinates(coords, split, interface[0, 4:])
+    assert np.array_equal(bottom, top)
+    assert np.array_equal(np.sort(interface[0, :4]), np.sort(face[0]))
+    normal = np.cross(bottom[1] - bottom[0], bottom[3] - bottom[0])
+    assert normal[0] > 0
+    splitHexes = split.apply(elementTags, hexes)
+    assert np.array_equal(np.sort(np.intersect1d(splitHexes[1], interface[0, 4:])), np.sort(interface[0, 4:]))
+    assert len(np.intersect1d(splitHexes[0], splitHexes[1])) == 0
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from gemaModel.mesh.nodeNumbering import NodeNumbering
+from gemaModel.mesh.nodeRenumbering import nodeAdjacency, bandwidthAndProfile, computeNodeOrder, renumberingMethods
+
+# ---------------------------------------------------------------------
+def shuffledGrid(n, seed = 0):
+    """
+    n x n grid of unit quads with the node tags shuffled over the grid: the
+    table of nodes (tags 1..N), their coordinates and the connectivity
+    """
+    rng    = np.random.default_rng(seed)
+    grid   = rng.permutation(np.arange(1, (n + 1)**2 + 1)).reshape((n + 1, n + 1))
+    j, i   = np.divmod(np.argsort(grid.ravel()), n + 1)
+    coords = np.stack((i, j), axis=1).astype(float)
+    quads  = np.stack((grid[:-1, :-1].ravel(), grid[:-1, 1:].ravel(), grid[1:, 1:].ravel(), grid[1:, :-1].ravel()), axis=1)
+    return np.arange(1, (n + 1)**2 + 1), coords, quads
+
+# ---------------------------------------------------------------------
+@pytest.mark.parametrize('spacing', [1, 1000])
+def test_NodeNumbering_ids(spacing):
+    # Dense and sparse tags give the position in the table of nodes plus one
+    nodeTags  = np.array([7, 3, 10, 1]) * spacing
+    numbering = NodeNumbering(nodeTags)
+    assert numbering.dense == (spacing == 1)
+    assert numbering.getIds(np.array([[10, 1], [3, 7]]) * spacing).tolist() == [[3, 4], [2, 1]]
+    with pytest.raises(Exception):
+        numbering.getIds([2 * spacing])
+
+# ---------------------------------------------------------------------
+def test_nodeAdjacency_chunks():
+    tags, _, quads = shuffledGrid(6)
+    whole   = nodeAdjacency([quads], tags)
+    chunked = nodeAdjacency([quads[:5], quads[5:17], quads[17:]], tags)
+    assert (whole != chunked).nnz == 0
+    assert np.all(whole.diagonal() == 1)
+
+# ---------------------------------------------------------------------
+@pytest.mark.parametrize('method', renumberingMethods)
+def test_computeNodeOrder_permutation(method):
+    tags, coords, quads = shuffledGrid(6)
+    adjacency = nodeAdjacency([quads], tags)
+    order = computeNodeOrder(method, adjacency, coords)
+    assert np.array_equal(np.sort(order), np.arange(len(tags)))
+
+    # The renumbered table of nodes gives the same coordinates to every
+    # node of the connectivity
+    before = NodeNumbering(tags).getIds(quads)
+    after  = NodeNumbering(tags[order]).getIds(quads)
+    assert np.array_equal(coords[order][after - 1], coords[before - 1])
+
+# ---------------------------------------------------------------------
+def test_bandwidthAndProfile():
+    tags, coords, quads = shuffledGrid(8)
+    adjacency = nodeAdjacency([quads], tags)
+    identity  = np.arange(len(tags))
+
+    # Largest and summed distance from each row to its first column
+    dense  = adjacency.toarray() > 0
+    lowest = np.argmax(dense, axis=1)
+    assert bandwidthAndProfile(adjacency, identity) == (int(np.max(identity - lowest)), int(np.sum(identity - lowest)))
+
+    # Reverse Cuthill-McKee reduces the bandwidth of the shuffled grid
+    order    = computeNodeOrder('RCMK', adjacency, coords)
+    position = np.empty_like(order)
+    position[order] = identity
+    assert bandwidthAndProfile(adjacency, position)[0] < bandwidthAndProfile(adjacency, identity)[0]
+
+# ---------------------------------------------------------------------
+def test_computeNodeOrder_unknown_method():
+    with pytest.raises(Exception):
+        computeNodeOrder('AMD', nodeAdjacency([], [1, 2]), np.zeros((2, 2)))
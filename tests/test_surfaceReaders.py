@@ -0,0 +1,111 @@
+import os
+import numpy as np
+import pytest
+from auxiliar.surfaceReaders import readOBJ, readOFF, readSTL, readTSurf, readSurfacePatches, STL_TRIANGLE, CACHE_SUFFIX
+
+# ---------------------------------------------------------------------
+def writeOBJ(tmp_path, text):
+    file_path = tmp_path / 'surface.obj'
+    file_path.write_text(text)
+    return str(file_path)
+
+# ---------------------------------------------------------------------
+def test_readOBJ_mixed_polygons(tmp_path):
+    file_path = writeOBJ(tmp_path, "v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nv 2 0 0\n"
+                                   "f 1 2 3 4\nf 2 5 3\n")
+    surface = readOBJ(file_path)
+    assert surface['nodes'].shape == (5, 3)
+    assert surface['triangles'].tolist() == [[0, 1, 2], [0, 2, 3], [1, 4, 2]]
+
+# ---------------------------------------------------------------------
+def test_readOBJ_relative_indices(tmp_path):
+    file_path = writeOBJ(tmp_path, "v 0 0 0\nv 1 0 0\nv 1 1 0\nf -3/1 -2/2 -1/3\n"
+                                   "v 0 1 0\nf 1//1 3//1 -1//1 2//1\n")
+    surface = readOBJ(file_path)
+    assert surface['triangles'].tolist() == [[0, 1, 2], [0, 2, 3], [0, 3, 1]]
+
+# ---------------------------------------------------------------------
+def test_readOBJ_invalid_index(tmp_path):
+    file_path = writeOBJ(tmp_path, "v 0 0 0\nv 1 0 0\nv 1 1 0\nf 1 2 4\n")
+    with pytest.raises(ValueError):
+        readOBJ(file_path)
+
+# ---------------------------------------------------------------------
+def test_readTSurf_mixed_vertex_lines(tmp_path):
+    file_path = tmp_path / 'surface.ts'
+    file_path.write_text("GOCAD TSurf 1\nHEADER {\nname: top\n}\nTFACE\n"
+                         "VRTX 1 0 0 0\nPVRTX 2 1 0 0 7\nVRTX 3 0 1 0\nPVRTX 4 1 1 0 5 6 7\n"
+                         "TRGL 1 2 3\nTRGL 2 4 3\nEND\n")
+    surface = readTSurf(str(file_path))
+    assert surface['nodes'].tolist() == [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]]
+    assert surface['triangles'].tolist() == [[0, 1, 2], [1, 3, 2]]
+    assert surface['names'].tolist() == ['top']
+
+# ---------------------------------------------------------------------
+def test_readOFF_comments_colors_and_polygons(tmp_path):
+    file_path = tmp_path / 'surface.off'
+    file_path.write_text("OFF 5 2 0\n# vertices\n0 0 0\n1 0 0 255 0 0\n1 1 0\n0 1 0\n2 0 0 0 0 255 1\n\n"
+                         "4 0 1 2 3\n3 1 4 2 7 7 7\n")
+    surface = readOFF(str(file_path))
+    assert surface['nodes'].tolist() == [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0]]
+    assert surface['triangles'].tolist() == [[0, 1, 2], [0, 2, 3], [1, 4, 2]]
+
+# ---------------------------------------------------------------------
+def test_readOFF_invalid_faces(tmp_path):
+    file_path = tmp_path / 'surface.off'
+    file_path.write_text("OFF\n3 1 0\n0 0 0\n1 0 0\n1 1 0\n4 0 1 2\n")
+    with pytest.raises(ValueError):
+        readOFF(str(file_path))
+
+# ---------------------------------------------------------------------
+def test_readSTL_binary_and_ascii(tmp_path):
+    vertices = np.array([[[0, 0, 0], [1, 0, 0], [1, 1, 0]], [[0, 0, 0], [1, 1, 0], [0, 1, 0]]], dtype=np.float32)
+    records  = np.zeros(len(vertices), dtype=STL_TRIANGLE)
+    records['vertices'] = vertices
+    binary_path = tmp_path / 'binary.stl'
+    binary_path.write_bytes(b'\0' * 80 + np.array([len(records)], dtype='<u4').tobytes() + records.tobytes())
+    ascii_path = tmp_path / 'ascii.stl'
+    ascii_path.write_text("solid test\n" + "".join(
+        "facet normal 0 0 1\n outer loop\n" + "".join(f"  vertex {x} {y} {z}\n" for x, y, z in triangle) + " endloop\nendfacet\n"
+        for triangle in vertices.tolist()) + "endsolid test\n")
+
+    # The shared vertices are merged
+    for file_path in (binary_path, ascii_path):
+        surface = readSTL(str(file_path))
+        assert len(surface['nodes']) == 4
+        assert np.array_equal(surface['nodes'][surface['triangles']], vertices)
+
+# ---------------------------------------------------------------------
+def test_readTSurf_atoms_patches_and_depth(tmp_path):
+    file_path = tmp_path / 'surface.ts'
+    file_path.write_text("GOCAD TSurf 1\nHEADER {\nname: fault\n}\nZPOSITIVE Depth\n"
+                         "TFACE\nVRTX 1 0 0 10\nVRTX 2 1 0 10\nVRTX 3 0 1 10\nTRGL 1 2 3\n"
+                         "TFACE\nATOM 4 2\nVRTX 5 1 1 20\nATOM 6 3\nTRGL 4 5 6\nEND\n")
+    surface = readTSurf(str(file_path))
+    assert surface['names'].tolist() == ['fault_1', 'fault_2']
+    assert surface['nodePointer'].tolist() == [0, 3, 6]
+    assert surface['trianglePointer'].tolist() == [0, 1, 2]
+    second = surface['nodes'][3:]
+    assert second[surface['triangles'][1]].tolist() == [[1, 0, -10], [1, 1, -20], [0, 1, -10]]
+
+# ---------------------------------------------------------------------
+def test_readSurfacePatches_cache(tmp_path):
+    file_path = tmp_path / 'surface.off'
+    file_path.write_text("OFF\n3 1 0\n0 0 0\n1 0 0\n1 1 0\n3 0 1 2\n")
+    (_, nodes, _), = readSurfacePatches(str(file_path))
+    assert os.path.exists(str(file_path) + CACHE_SUFFIX)
+    assert nodes.tolist() == [[0, 0, 0], [1, 0, 0], [1, 1, 0]]
+
+    # A file touched but not changed is still read from the cache
+    status = os.stat(file_path)
+    os.utime(file_path, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+    (_, nodes, _), = readSurfacePatches(str(file_path))
+    assert isinstance(nodes, np.memmap)
+
+    # A changed file is read again and the cache replaced
+    file_path.write_text("OFF\n3 1 0\n0 0 0\n2 0 0\n2 2 0\n3 0 1 2\n")
+    os.utime(file_path, ns=(status.st_atime_ns, status.st_mtime_ns + 2 * 10**9))
+    (_, nodes, _), = readSurfacePatches(str(file_path))
+    assert nodes.tolist() == [[0, 0, 0], [2, 0, 0], [2, 2, 0]]
+    (_, nodes, _), = readSurfacePatches(str(file_path))
+    assert isinstance(nodes, np.memmap) and nodes.tolist() == [[0, 0, 0], [2, 0, 0], [2, 2, 0]]